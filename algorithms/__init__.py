@@ -1,13 +1,24 @@
 from .common import Node
 from .base import Base
+from .transposition import TranspositionTable
+from .solver import EndgameSolver
+from .opening_book import OpeningBook
+from .arena import NodeArena
+from .shared_tree import SharedTree
+from .playout import BatchPlayout
+from .rollout_policy import RolloutPolicy
+from .search_stats import SearchStats, SearchStatsTally
+from .worker_pool import RolloutPool
 from .uniform_random import UniformRandom
 from .mcts import MCTS
+from .root_parallel import RootParallel
+from .tree_parallel import TreeParallel
 from .pmcgs import PMCGS
 from .pmcgs_parallel import PMCGSParallel
 from .uct import UCT
 from .uct_parallel import UCTParallel
 from .factory import AlgorithmFactory 
 from .uct_improvement import UCTImprovement
+from .uct_depth import UCTDepth
 from .uct_imp_parallel import UCTImpParallel
 from .uct_dep_parallel import UCTDepParallel
-from .uct_depth import UCTDepth
\ No newline at end of file
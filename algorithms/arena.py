@@ -0,0 +1,84 @@
+from array import array
+
+class NodeArena():
+    """
+    Compact, array-backed store for the MCTS tree.
+
+    Nodes are indexes into preallocated parallel arrays (visits, wins, parent, move, depth, proven) plus
+    a fixed-width child table holding, for every node, one slot per column with the index of the
+    child reached by that move (-1 when there is none). Node 0 is the root. A node takes about
+    90 bytes here against several hundred for a Node object and its children dict, and the
+    arrays are invisible to the garbage collector.
+    """
+    NO_CHILD = -1
+    ROOT = 0
+
+    def __init__(self, width: int, capacity: int = 1024):
+        """
+        Initializes the arena.
+
+        Args:
+            width (int): Number of child slots per node (the number of columns of the game).
+            capacity (int, optional): Number of nodes preallocated. The arrays double when full.
+        """
+        self.width = width
+        self.capacity = max(1, capacity)
+        self.visits = array('q', bytes(8 * self.capacity))
+        self.wins = array('d', bytes(8 * self.capacity))
+        self.parent = array('l', [self.NO_CHILD]) * self.capacity
+        self.move = array('b', [self.NO_CHILD]) * self.capacity
+        self.depth = array('h', bytes(2 * self.capacity))
+        self.child_count = array('b', bytes(self.capacity))
+        self.proven = array('b', bytes(self.capacity))
+        self.children = array('l', [self.NO_CHILD]) * (self.capacity * width)
+        self.size = 0
+        self.add_node(self.NO_CHILD, self.NO_CHILD)  # Root
+
+    def reset(self) -> None:
+        """Removes every node except a fresh root, keeping the allocated arrays."""
+        used = self.size
+        self.visits[:used] = array('q', bytes(8 * used))
+        self.wins[:used] = array('d', bytes(8 * used))
+        self.child_count[:used] = array('b', bytes(used))
+        self.proven[:used] = array('b', bytes(used))
+        self.children[:used * self.width] = array('l', [self.NO_CHILD]) * (used * self.width)
+        self.size = 0
+        self.add_node(self.NO_CHILD, self.NO_CHILD)
+
+    def grow(self) -> None:
+        """Doubles the capacity of every array."""
+        extra = self.capacity
+        self.visits.extend(array('q', bytes(8 * extra)))
+        self.wins.extend(array('d', bytes(8 * extra)))
+        self.parent.extend(array('l', [self.NO_CHILD]) * extra)
+        self.move.extend(array('b', [self.NO_CHILD]) * extra)
+        self.depth.extend(array('h', bytes(2 * extra)))
+        self.child_count.extend(array('b', bytes(extra)))
+        self.proven.extend(array('b', bytes(extra)))
+        self.children.extend(array('l', [self.NO_CHILD]) * (extra * self.width))
+        self.capacity += extra
+
+    def add_node(self, move: int, parent: int) -> int:
+        """Allocates a node reached by move from parent and returns its index."""
+        if self.size == self.capacity:
+            self.grow()
+        index = self.size
+        self.size += 1
+        self.move[index] = move
+        self.parent[index] = parent
+        if parent != self.NO_CHILD:
+            self.depth[index] = self.depth[parent] + 1
+            self.children[parent * self.width + move] = index
+            self.child_count[parent] += 1
+        return index
+
+    def get_children(self, index: int) -> list:
+        """Returns the (move, child index) pairs of a node."""
+        base = index * self.width
+        children = self.children
+        return [(move, children[base + move]) for move in range(self.width) if children[base + move] != self.NO_CHILD]
+
+    def get_bytes_per_node(self) -> int:
+        """Returns the number of bytes the arrays take per node."""
+        arrays = (self.visits, self.wins, self.parent, self.move, self.depth, self.child_count, self.proven)
+        return sum(values.itemsize for values in arrays) + self.children.itemsize * self.width
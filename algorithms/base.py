@@ -12,6 +12,7 @@ class Base(ABC):
         self.simulations = simulations
         self.logger_source = logger_source
         self.run_time = 0
+        self.stats = None  # SearchStats of the last choose_move, None for algorithms that do not search
 
     """Abstract base class for all game-playing algorithms."""
     @abstractmethod
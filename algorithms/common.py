@@ -1,5 +1,6 @@
 class Node:
     """Represents a node in the game tree."""
+    __slots__ = ("move", "children", "wins", "visits", "parent", "depth", "mirrored", "proven", "untried", "amaf_wins", "amaf_visits")
 
     def __init__(self, move=None, parent=None):
         self.move = move
@@ -7,4 +8,9 @@ class Node:
         self.wins = 0
         self.visits = 0
         self.parent = parent
-        self.depth = 0 if parent is None else parent.depth + 1 #Used for depth aware algorithm
\ No newline at end of file
+        self.depth = 0 if parent is None else parent.depth + 1 #Used for depth aware algorithm
+        self.mirrored = None  # Moves whose child is stored mirrored relative to this node (transposition table only)
+        self.proven = 0  # Game-theoretic value for the player who moved into this node, once proven (see MCTS.PROVEN_WIN)
+        self.untried = None  # Moves without a child yet, once the node is expanded lazily (see MCTS lazy_expansion)
+        self.amaf_wins = 0  # All-moves-as-first statistics of the node's move from its parent (see MCTS rave)
+        self.amaf_visits = 0
\ No newline at end of file
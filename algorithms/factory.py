@@ -6,13 +6,19 @@ class AlgorithmFactory():
     """
 
     @staticmethod
-    def create_algorithm(name: str, simulations:int=0, parallel:int=0):
+    def create_algorithm(name: str, simulations:int=0, parallel:int=0, rave:float=0, **options):
         """
         Creates an algorithm instance based on the provided name.
 
         Args:
             name: The name of the algorithm to create.
             simulations (int, optional): The number of simulations to run. Defaults to 0.
+            parallel (int, optional): The parallel mode (see Globals.ParallelModes): 0 for the serial algorithm, 1 to run
+                its rollouts in a worker pool, 2 to search independent trees in a worker pool and merge them at the root,
+                3 to search one tree in shared memory with every worker of a pool. Defaults to 0.
+            rave (float, optional): Equivalence parameter of Rapid Action Value Estimation in the selection of the UCT
+                algorithms (see MCTS). Defaults to 0 (disabled).
+            **options: Search options passed to MCTS algorithms (e.g. transposition_size, mirror).
 
         Returns:
             An instance of the specified algorithm class.
@@ -20,39 +26,52 @@ class AlgorithmFactory():
         Raises:
             ValueError: If the algorithm name is invalid.
         """
+        if rave:
+            options["rave"] = rave
         try:
             # Use lowercase names and import classes with correct names.
-            if name == Globals.Algorithms.UR:
+            if parallel == Globals.ParallelModes.ROOT and name != Globals.Algorithms.UR:
+                from algorithms import RootParallel
+                root_options = {key: options.pop(key) for key in ("workers", "seed") if key in options}
+                # Build the serial algorithm once so invalid options are reported here rather than in the workers
+                algorithm = AlgorithmFactory.create_algorithm(name, simulations, Globals.ParallelModes.SERIAL, **options)
+                return RootParallel(type(algorithm), simulations, **root_options, **options)
+            elif parallel == Globals.ParallelModes.TREE and name != Globals.Algorithms.UR:
+                from algorithms import TreeParallel
+                tree_options = {key: options.pop(key) for key in ("workers", "seed", "virtual_loss") if key in options}
+                algorithm = AlgorithmFactory.create_algorithm(name, simulations, Globals.ParallelModes.SERIAL, **options)
+                return TreeParallel(type(algorithm), simulations, **tree_options, **options)
+            elif name == Globals.Algorithms.UR:
                 from algorithms import UniformRandom
                 return UniformRandom()
             elif name == Globals.Algorithms.PMCGS:
-                if parallel == 1:
+                if parallel == Globals.ParallelModes.ROLLOUT:
                     from algorithms import PMCGSParallel
-                    return PMCGSParallel(simulations)
+                    return PMCGSParallel(simulations, **options)
                 else:
                     from algorithms import PMCGS
-                    return PMCGS(simulations)
+                    return PMCGS(simulations, **options)
             elif name == Globals.Algorithms.UCT:
-                if parallel == 1:
+                if parallel == Globals.ParallelModes.ROLLOUT:
                     from algorithms import UCTParallel
-                    return UCTParallel(simulations)
+                    return UCTParallel(simulations, **options)
                 else:
                     from algorithms import UCT
-                    return UCT(simulations)
+                    return UCT(simulations, **options)
             elif name == Globals.Algorithms.UCTIMP:
-                if parallel == 1:
+                if parallel == Globals.ParallelModes.ROLLOUT:
                     from algorithms import UCTImpParallel
-                    return UCTImpParallel(simulations)
+                    return UCTImpParallel(simulations, **options)
                 else:
                     from algorithms import UCTImprovement
-                    return UCTImprovement(simulations)
+                    return UCTImprovement(simulations, **options)
             elif name == Globals.Algorithms.UCTDEP:
-                if parallel == 1:
+                if parallel == Globals.ParallelModes.ROLLOUT:
                     from algorithms import UCTDepParallel
-                    return UCTDepParallel(simulations)
+                    return UCTDepParallel(simulations, **options)
                 else:
                     from algorithms import UCTDepth
-                    return UCTDepth(simulations)
+                    return UCTDepth(simulations, **options)
             else:
                 raise ValueError(f"Invalid algorithm name: {name}")
         except ImportError as e:
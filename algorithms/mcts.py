@@ -1,16 +1,144 @@
 from abc import abstractmethod
-from algorithms import Base, Node
+from algorithms import Base, Node, TranspositionTable, EndgameSolver, NodeArena, BatchPlayout, RolloutPool, OpeningBook, RolloutPolicy, SearchStats
 from common import GameInterface, Utils, Globals
-import time, random
+import time, random, math, gc
 
 class MCTS(Base):
     """Abstract base class for Monte Carlo Tree Search algorithms."""
-    def __init__(self, simulations:int=0, logger_source:str=None):
+    TREE_STORES = ("node", "arena")
+    BUDGET_POLICIES = ("stop", "evict")
+    NODE_BYTES = 216  # Memory taken by a Node and its share of its parent's children dict (tracemalloc, CPython 3.11)
+    DEADLINE_CHECK_INTERVAL = 8  # Iterations between two reads of the clock when searching with a time limit
+    UNPROVEN, PROVEN_WIN, PROVEN_LOSS, PROVEN_DRAW = 0, 1, -1, 2  # Proven values, for the player who moved into a node
+
+    def __init__(self, simulations:int=0, logger_source:str=None, transposition_size:int=0, mirror:bool=False, reuse_tree:bool=False,
+                 tree_store:str="node", pause_gc:bool=False, leaf_playouts:int=1, time_limit:float=0, max_nodes:int=0,
+                 solver_threshold:int=EndgameSolver.EMPTY_CELLS, solver_nodes:int=EndgameSolver.MAX_NODES, opening_book=0,
+                 rollout_policy:str=RolloutPolicy.UNIFORM, node_budget:int=0, memory_budget:float=0, budget_policy:str="stop",
+                 lazy_expansion:bool=False, expand_threshold:int=0, rave:float=0):
+        """
+        Initialize Algorithm
+        Args:
+            simulations (int, optional): The number of simulations to run. Defaults to 0, which leaves the search bounded
+                by time_limit or max_nodes alone when one of them is set.
+            logger_source (str, optional): Name to set to the logger
+            transposition_size (int, optional): Maximum number of positions kept in the transposition table. When greater
+                than 0, move orders reaching the same position share one node. Defaults to 0 (disabled).
+            mirror (bool, optional): Merge left-right mirror positions in the transposition table. Defaults to False.
+            reuse_tree (bool, optional): Keep the search tree between calls to choose_move on the same game, promoting the
+                subtree of the moves played since the last search to root. Visits carried over count towards the simulations
+                budget. Defaults to False.
+            tree_store (str, optional): "node" keeps the tree as Node objects, "arena" in a NodeArena of preallocated
+                arrays, which uses a fraction of the memory. The arena does not support the transposition table or tree
+                reuse. Defaults to "node".
+            pause_gc (bool, optional): Disable the generational garbage collector while searching. Defaults to False.
+            leaf_playouts (int, optional): Number of random playouts run from each selected leaf (leaf parallelism). When
+                greater than 1, the playouts run as one batch in a BatchPlayout (vectorized when NumPy is available) and their
+                summed outcome is backpropagated once. Each playout counts as one simulation. Defaults to 1 (the rollout of
+                the algorithm).
+            time_limit (float, optional): Wall-clock budget of a search in milliseconds. The search returns the best move
+                found when it runs out, even if simulations remain. Defaults to 0 (no limit).
+            max_nodes (int, optional): Maximum number of nodes allocated by a search. Defaults to 0 (no limit).
+            solver_threshold (int, optional): Number of empty cells at or below which choose_move plays the move of the
+                EndgameSolver instead of searching. Defaults to 12, 0 disables the solver.
+            solver_nodes (int, optional): Positions the solver may search before choose_move falls back to the MCTS
+                search. Defaults to 200000.
+            opening_book (optional): Play the move of an OpeningBook without searching when the position is in it. 1 uses
+                _resources/opening_book.bin, a string the book at that path. Defaults to 0 (disabled).
+            rollout_policy (str, optional): RolloutPolicy of the rollouts: "uniform", "win", "block", "center" or
+                "tactical". Defaults to "uniform" (the rollout of the algorithm).
+            node_budget (int, optional): Maximum number of nodes in the tree. Unlike max_nodes, the search goes on when
+                the tree is full, as budget_policy says. Defaults to 0 (no limit).
+            memory_budget (float, optional): Maximum memory of the tree in MB, converted to a node budget with the
+                bytes per node of the tree store. The lower of the two budgets applies. Defaults to 0 (no limit).
+            budget_policy (str, optional): What a search does when expanding a leaf would exceed the budget. "stop"
+                rolls out from the leaf without expanding it, so the tree only updates its statistics from then on.
+                "evict" first collapses the least visited subtrees whose children are all leaves, freeing a tenth of
+                the budget, and stops expanding only when that is not enough. "evict" needs the node tree store
+                without the transposition table. Defaults to "stop".
+            lazy_expansion (bool, optional): Add one child at a time, drawn from the node's untried moves, instead of a
+                child for every legal move at once. Selection descends into a node only once it has no untried moves
+                left. Needs the node tree store without the transposition table. Defaults to False.
+            expand_threshold (int, optional): Visits a leaf needs before it is expanded; until then the rollouts start
+                from the leaf itself. The root is always expanded. Defaults to 0 (expand every leaf the first time it is
+                reached, before its first rollout).
+            rave (float, optional): Equivalence parameter k of Rapid Action Value Estimation. When greater than 0, every
+                simulation also updates the all-moves-as-first (AMAF) statistics of the children of each node on its
+                path whose cell the player to move there filled later in the simulation (see update_amaf), and
+                selection blends them into the mean reward of a child with weight sqrt(k / (3 * visits + k)), which
+                fades as the child gets visits. Needs the node tree store without the transposition table, and the
+                rollout moves, so it does not support leaf_playouts. Defaults to 0 (disabled).
+
+        Raises:
+            ValueError: If the tree store is invalid or does not support the requested options, or the opening book
+                cannot be read, or the rollout policy, the budget policy, the expansion threshold or the RAVE
+                parameter is invalid.
+        """
         super().__init__(simulations, logger_source if logger_source is not None else __name__ + "." + self.__class__.__name__)
         self.game:GameInterface = None
         self.root:Node = None
         self.node_count = 0
         self.current_player = None
+        self.transposition_table = TranspositionTable(transposition_size, bool(mirror)) if transposition_size > 0 else None
+        self.node_path = []  # Nodes visited by the last select_child, root first
+        self.reuse_tree = bool(reuse_tree)
+        self.root_flipped = False  # True when the root is stored as the mirror of the actual position
+        self.last_moves = None  # Moves of the game when the last search finished
+        self.reused_visits = 0  # Visits carried over to the root by the last choose_move
+        self.search_simulations = 0  # Simulations budget of the current search
+        self.completed_simulations = 0  # Simulations run by the last search
+        if time_limit < 0 or max_nodes < 0:
+            raise ValueError(f"Invalid search budget: time_limit={time_limit}, max_nodes={max_nodes}")
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.deadline = None  # perf_counter() value at which the current search stops
+        self.solver_threshold = solver_threshold
+        self.solver = EndgameSolver(solver_nodes) if solver_threshold > 0 else None
+        self.solved = None  # (move, value) played by the solver in the last choose_move, None when it searched
+        self.book = OpeningBook.open(OpeningBook.get_path(opening_book)) if opening_book else None
+        self.book_move = None  # Move played from the opening book in the last choose_move, None when it searched
+        tree_store = str(tree_store).lower()
+        if tree_store not in self.TREE_STORES:
+            raise ValueError(f"Invalid tree store: {tree_store}")
+        if tree_store == "arena" and (self.transposition_table is not None or self.reuse_tree):
+            raise ValueError("The arena tree store does not support transposition_size or reuse_tree")
+        self.tree_store = tree_store
+        self.arena:NodeArena = None
+        self.pause_gc = bool(pause_gc)
+        if leaf_playouts < 1:
+            raise ValueError(f"Invalid number of leaf playouts: {leaf_playouts}")
+        self.leaf_playouts = leaf_playouts
+        self.batch_playout = BatchPlayout() if leaf_playouts > 1 else None
+        self.policy = RolloutPolicy(rollout_policy)
+        if self.policy.name != RolloutPolicy.UNIFORM and leaf_playouts > 1:
+            raise ValueError("Leaf playouts are uniform, so leaf_playouts does not support rollout_policy")
+        self.rollout_policy = self.policy.name
+        if self.rollout_policy == RolloutPolicy.UNIFORM:
+            self.policy = None  # The algorithm's own rollout
+        budget_policy = str(budget_policy).lower()
+        if node_budget < 0 or memory_budget < 0 or budget_policy not in self.BUDGET_POLICIES:
+            raise ValueError(f"Invalid tree budget: node_budget={node_budget}, memory_budget={memory_budget}, budget_policy={budget_policy}")
+        if budget_policy == "evict" and (tree_store == "arena" or self.transposition_table is not None):
+            raise ValueError("The evict budget policy does not support the arena tree store or transposition_size")
+        self.node_budget = node_budget
+        self.memory_budget = memory_budget
+        self.budget_policy = budget_policy
+        self.tree_budget = 0  # Node budget of the current search, 0 for no limit
+        self.tree_size = 0  # Nodes in the current tree, kept up to date while tree_budget is set
+        if lazy_expansion and (tree_store == "arena" or self.transposition_table is not None):
+            raise ValueError("Lazy expansion does not support the arena tree store or transposition_size")
+        if expand_threshold < 0:
+            raise ValueError(f"Invalid expansion threshold: {expand_threshold}")
+        self.lazy_expansion = bool(lazy_expansion)
+        self.expand_threshold = expand_threshold
+        if rave < 0:
+            raise ValueError(f"Invalid RAVE parameter: {rave}")
+        if rave and (tree_store == "arena" or self.transposition_table is not None or leaf_playouts > 1):
+            raise ValueError("RAVE does not support the arena tree store, transposition_size or leaf_playouts")
+        self.rave = rave
+        self.root_heights = None  # Discs per column at the root, set by choose_move when rave is on
+        self.trace = False  # True when VERBOSE tracing is on, refreshed by choose_move; the hot loops skip logging otherwise
+        self.stats = SearchStats()  # Statistics of the last choose_move
 
     def choose_move(self, game: GameInterface, player):
         """
@@ -23,80 +151,622 @@ class MCTS(Base):
         Returns:
             int: The chosen move (column index), or None if no move is possible.
         """
+        start_time = time.perf_counter()
+        self.stats = SearchStats()
+        self.trace = Utils.is_enabled(Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        self.solved = None
+        self.book_move = self.book.lookup(game, player) if self.book is not None else None
+        if self.book_move is not None and game.is_valid_move(self.book_move):
+            self.completed_simulations = 0
+            self.last_moves = None
+            self.stats.source = SearchStats.BOOK
+            self.stats.time = time.perf_counter() - start_time
+            Utils.log_message(f"Opening book: column {self.book_move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+            return self.book_move
+        self.book_move = None
+        if self.solver is not None and EndgameSolver.count_empty_cells(game) <= self.solver_threshold:
+            self.solved = self.solver.solve(game, player)
+            if self.solved is not None:
+                self.completed_simulations = 0
+                self.last_moves = None  # The tree was not searched for this position, so it is not reused
+                self.stats.source = SearchStats.SOLVER
+                self.stats.time = time.perf_counter() - start_time
+                Utils.log_message(f"Endgame solver: column {self.solved[0] + 1} with value {self.solved[1]} in {self.solver.nodes} positions", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                return self.solved[0]
+        reused = self.reuse_tree and self.reuse_subtree(game, player)
         self.game = game
-        self.root = Node()
         self.node_count = 0
         self.current_player = player
+        self.tree_budget = self.get_node_budget(game.get_num_cols())
+        self.tree_size = 1
+        if self.rave:
+            board = game.get_board()
+            self.root_heights = [sum(row[column] != Globals.Players.O for row in board) for column in range(game.get_num_cols())]
+        if self.tree_store == "arena":
+            if self.arena is None or self.arena.width != game.get_num_cols():
+                capacity = self.simulations * game.get_num_cols() + 1
+                self.arena = NodeArena(game.get_num_cols(), min(capacity, self.tree_budget) if self.tree_budget else capacity)
+            else:
+                self.arena.reset()
+            self.root = NodeArena.ROOT
+            self.reused_visits = 0
+        elif not reused:
+            self.root = Node()
+            self.root_flipped = False
+            self.reused_visits = 0
+            if self.transposition_table is not None:
+                self.transposition_table.clear()
+                self.transposition_table.store(game, self.root)
+        elif self.tree_budget:
+            self.tree_size = len(self.relink_subtree(self.root))
+        if self.simulations <= 0 and (self.time_limit or self.max_nodes):
+            self.search_simulations = float('inf')
+        else:
+            self.search_simulations = max(0, self.simulations - self.reused_visits)
+        self.deadline = time.perf_counter() + self.time_limit / 1000 if self.time_limit else None
+
+        gc_enabled = gc.isenabled()
+        if self.pause_gc:
+            gc.disable()
+        try:
+            self.search()
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        if self.reuse_tree:
+            self.last_moves = game.get_moves()
+        move = self.best_move()
+        self.stats.simulations = self.completed_simulations
+        self.stats.nodes = self.node_count
+        self.stats.set_root(self.get_root_statistics(), game.get_num_cols())
+        self.stats.time = time.perf_counter() - start_time
+        return move
+
+    def get_node_budget(self, num_cols: int) -> int:
+        """Gets the number of nodes the tree may hold (the lower of node_budget and memory_budget), 0 for no limit."""
+        budgets = [self.node_budget] if self.node_budget else []
+        if self.memory_budget:
+            node_bytes = NodeArena(num_cols, 1).get_bytes_per_node() if self.tree_store == "arena" else self.NODE_BYTES
+            budgets.append(max(num_cols + 1, int(self.memory_budget * 2 ** 20) // node_bytes))
+        return min(budgets) if budgets else 0
+
+    def evict_subtrees(self, needed: int) -> bool:
+        """
+        Collapses the least visited nodes whose children are all leaves back into leaves, until needed nodes plus a
+        tenth of the budget are free. The nodes keep their statistics and are expanded again when selected. Nodes on
+        the current selection path are kept.
+
+        Args:
+            needed (int): Nodes about to be allocated.
+
+        Returns:
+            bool: True when the needed nodes fit in the budget.
+        """
+        kept = {id(node) for node in self.node_path}
+        candidates = []
+        pending = [self.root]
+        while pending:
+            node = pending.pop()
+            inner = [child for child in node.children.values() if child.children]
+            pending.extend(inner)
+            if not inner and node.children and id(node) not in kept:
+                candidates.append(node)
+        candidates.sort(key=lambda node: node.visits)
+
+        target = self.tree_size + needed - self.tree_budget + self.tree_budget // 10
+        evicted = 0
+        for node in candidates:
+            if evicted >= target:
+                break
+            evicted += len(node.children)
+            node.children = {}
+            node.mirrored = None
+            node.untried = None
+        self.tree_size -= evicted
+        self.stats.evictions += 1
+        self.stats.evicted_nodes += evicted
+        Utils.log_message(f"Tree budget: evicted {evicted} nodes", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        return self.tree_size + needed <= self.tree_budget
+
+    def reuse_subtree(self, game: GameInterface, player) -> bool:
+        """
+        Promotes the subtree reached by the moves played since the last search to root, freeing the rest of the tree.
+
+        Args:
+            game (GameInterface): The game passed to choose_move.
+            player (str): The current player.
+
+        Returns:
+            bool: True when a subtree with visits was found and promoted.
+        """
+        if self.root is None or game is not self.game or self.last_moves is None:
+            return False
+        moves = game.get_moves()
+        new_moves = moves[len(self.last_moves):]
+        if moves[:len(self.last_moves)] != self.last_moves:
+            return False
+        if player != (self.current_player if len(new_moves) % 2 == 0 else game.get_opponent(self.current_player)):
+            return False  # The subtree belongs to the other player
 
-        self.search()
+        node = self.root
+        flipped = self.root_flipped
+        num_cols = game.get_num_cols()
+        for column in new_moves:
+            move = num_cols - 1 - column if flipped else column
+            child = node.children.get(move)
+            if child is None:
+                return False
+            if node.mirrored is not None and move in node.mirrored:
+                flipped = not flipped
+            node = child
+        if node.visits == 0:
+            return False
+
+        node.parent = None  # Drops the references to the rest of the tree
+        self.root = node
+        self.root_flipped = flipped
+        self.reused_visits = node.visits
+        if self.transposition_table is not None:
+            self.transposition_table.retain(self.relink_subtree(node))
+        Utils.log_message(f"Tree reuse: carried over {self.reused_visits} visits", Globals.VerbosityLevels.BRIEF, self.logger_source)
+        return True
+
+    def relink_subtree(self, root: Node) -> set:
+        """
+        Walks the DAG below root so every node's parent is a node of the subtree.
 
-        return self.best_move()
+        Returns:
+            set: The ids of the nodes in the subtree.
+        """
+        retained = {id(root)}
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            for child in node.children.values():
+                if id(child) not in retained:
+                    retained.add(id(child))
+                    child.parent = node
+                    pending.append(child)
+        return retained
     
     def search(self):
         """Performs the MCTS search for the given number of iterations."""
         start_time = time.process_time()
-        for _ in range(self.simulations):
+        stats = self.stats
+        simulations = 0
+        iterations = 0
+        while not self.budget_exhausted(simulations, iterations):
             path = []  # Track moves made
+            selection_start = time.perf_counter()
             node, state = self.select_child(self.current_player, path)
-            outcome = self.rollout(state, self.current_player, path)
-            self.backpropagation(node, outcome)
+            rollout_start = time.perf_counter()
+            depth = len(self.node_path) - 1
+            if depth > stats.max_depth:
+                stats.max_depth = depth
+            proven = self.get_proven(node)
+            if proven != self.UNPROVEN:
+                playouts = 1
+                outcome = self.get_proven_outcome(proven, path)
+            elif self.batch_playout is None:
+                playouts = 1
+                selected = len(path)
+                outcome = self.rollout(state, self.get_leaf_player(path), path)
+                stats.rollouts += 1
+                stats.rollout_moves += len(path) - selected
+            else:
+                playouts = min(self.leaf_playouts, self.search_simulations - simulations)
+                outcome = int(sum(self.batch_playout.run_repeated(state, self.get_leaf_player(path), playouts)))
+            backpropagation_start = time.perf_counter()
+            self.backpropagation(node, outcome, self.node_path, playouts)
+            if self.rave:
+                self.update_amaf(self.node_path, path, outcome)
+            simulations += playouts
+            stats.selection += rollout_start - selection_start
+            stats.rollout += backpropagation_start - rollout_start
+            stats.backpropagation += time.perf_counter() - backpropagation_start
 
             # Undo all moves made in this iteration
             for move, _ in reversed(path):
                 state.undo_move()
 
-            self.node_count += 1  # Increment node_count
-            Utils.log_message("-----------------------------------------",Globals.VerbosityLevels.VERBOSE, self.logger_source)
+            iterations += 1
+            if self.trace:
+                Utils.log_message("-----------------------------------------",Globals.VerbosityLevels.VERBOSE, self.logger_source)
 
         self.run_time = time.process_time() - start_time
+        self.completed_simulations = simulations
+        Utils.log_message(f"Search: {simulations} simulations, {self.node_count} nodes", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        if self.transposition_table is not None:
+            table = self.transposition_table
+            Utils.log_message(f"Transposition table: {len(table)} positions, {table.hits} hits, {table.evictions} evictions", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+
+    def parallel_search(self, pool: RolloutPool, batch_size: int, rollout_class, virtual_loss: int = 1) -> None:
+        """
+        Performs the MCTS search running the rollouts in a worker pool.
+
+        Leaves are selected in batches in this process. Every selection applies a virtual loss along its node path, so
+        the next selections of the batch spread over other branches instead of following the same path. Each batch is
+        sent to the pool as the moves played from the root to every leaf, and as the outcomes return the virtual losses
+        are reverted and the real outcomes backpropagated along the recorded node paths.
+
+        Args:
+            pool (RolloutPool): The pool running the rollouts.
+            batch_size (int): Number of leaves selected before the pool runs their rollouts.
+            rollout_class: Serial algorithm class whose rollout the workers run.
+            virtual_loss (int, optional): Number of lost visits added to every node of a pending path. Defaults to 1,
+                0 disables it.
+        """
+        start_time = time.perf_counter()
+        start_bytes = pool.ipc_bytes
+        stats = self.stats
+        simulations = 0
+        while not self.budget_exhausted(simulations):
+            leaves = []
+            node_paths = []
+            for _ in range(min(batch_size, self.search_simulations - simulations)):
+                path = []
+                selection_start = time.perf_counter()
+                node, state = self.select_child(self.current_player, path)
+                stats.selection += time.perf_counter() - selection_start
+                stats.max_depth = max(stats.max_depth, len(self.node_path) - 1)
+                proven = self.get_proven(node)
+                if proven != self.UNPROVEN:
+                    # The outcome is known, so the leaf is backpropagated here rather than sent to the pool
+                    backpropagation_start = time.perf_counter()
+                    self.backpropagation(node, self.get_proven_outcome(proven, path), self.node_path)
+                    stats.backpropagation += time.perf_counter() - backpropagation_start
+                    simulations += 1
+                else:
+                    leaves.append((len(leaves), [column for column, _ in path]))
+                    node_paths.append(self.node_path)
+                    if virtual_loss:
+                        self.apply_virtual_loss(self.node_path, virtual_loss)
+                for _ in path:
+                    state.undo_move()
+                if self.get_proven(self.root) != self.UNPROVEN:
+                    break
 
-    def backpropagation(self, node: Node, outcome: int) -> None:
-        """Backpropagates the result of the rollout."""
+            rollout_start = time.perf_counter()
+            backpropagation_time = 0.0
+            for leaf_id, outcome in pool.run(rollout_class, self.game, self.current_player, leaves, self.rollout_policy):
+                backpropagation_start = time.perf_counter()
+                node_path = node_paths[leaf_id]
+                if virtual_loss:
+                    self.apply_virtual_loss(node_path, -virtual_loss)
+                self.backpropagation(node_path[-1], outcome, node_path)
+                backpropagation_time += time.perf_counter() - backpropagation_start
+            stats.rollout += time.perf_counter() - rollout_start - backpropagation_time
+            stats.backpropagation += backpropagation_time
+            simulations += len(leaves)
+
+        self.run_time = time.perf_counter() - start_time
+        self.completed_simulations = simulations
+        self.ipc_bytes = pool.ipc_bytes - start_bytes
+        Utils.log_message(f"Parallel search: {simulations} rollouts in {self.run_time:.3f}s, {self.ipc_bytes} IPC bytes", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+
+    def budget_exhausted(self, simulations: int, iterations: int = 0) -> bool:
+        """
+        Checks whether the current search has used up its simulations, node or time budget.
+
+        Args:
+            simulations (int): Simulations run so far.
+            iterations (int, optional): Iterations run so far. The clock is only read every DEADLINE_CHECK_INTERVAL
+                iterations. Defaults to 0 (always read it).
+        """
+        if simulations >= self.search_simulations:
+            return True
+        if self.get_proven(self.root) != self.UNPROVEN:
+            return True  # The root is solved, so further simulations cannot change the move
+        if self.max_nodes and self.node_count >= self.max_nodes:
+            return True
+        return (self.deadline is not None and iterations % self.DEADLINE_CHECK_INTERVAL == 0
+                and time.perf_counter() >= self.deadline)
+
+    def apply_virtual_loss(self, node_path: list, weight: int) -> None:
+        """
+        Counts weight lost visits on every node of a path (or removes them when weight is negative).
+
+        Args:
+            node_path (list): Nodes (or arena node indexes) from the root down to a pending leaf.
+            weight (int): Number of virtual losses.
+        """
+        if self.arena is not None:
+            visits = self.arena.visits
+            wins = self.arena.wins
+            for node in node_path:
+                visits[node] += weight
+                wins[node] -= weight
+            return
+
+        for node in node_path:
+            node.visits += weight
+            node.wins -= weight
+
+    def backpropagation(self, node: Node, outcome: int, node_path: list = None, playouts: int = 1) -> None:
+        """
+        Backpropagates the result of the rollout.
+
+        Args:
+            node (Node): The node the rollout started from.
+            outcome (int): The result of the rollout (see GameInterface.evaluate_board), or the sum of the
+                results when several playouts ran from node.
+            node_path (list, optional): Nodes from the root down to node. Required when nodes are shared
+                through the transposition table, since a node's parent is then not necessarily on the path.
+                Defaults to following the parent links.
+            playouts (int, optional): Number of playouts summed in outcome. Defaults to 1.
+        """
 
         reward = 0
-        if outcome == 1:
+        if playouts > 1:
+            reward = outcome
+        elif outcome == 1:
             reward = 1
         elif outcome == -1:
             reward = -1
 
-        while node is not None:
-            node.visits += 1
+        # Outcomes are 1 when Y wins, and each node keeps the rewards of the player who moved into it: the opponent of
+        # the player to move for the root and its grandchildren, the player to move for its children and so on
+        if self.current_player == Globals.Players.Y:
+            reward = -reward
+
+        if self.arena is not None:
+            self.backpropagate_arena(node_path, reward, playouts)
+            self.prove_path(node_path)
+            return
+
+        if node_path is None:
+            node_path = []
+            while node is not None:
+                node_path.append(node)
+                node = node.parent
+            node_path.reverse()
+
+        for index in range(len(node_path) - 1, -1, -1):
+            node = node_path[index]
+            node.visits += playouts
+            node.wins += reward if index % 2 == 0 else -reward
+
+            if self.trace:
+                Utils.log_message("Updated values:", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                Utils.log_message(f"wi: {node.wins}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                Utils.log_message(f"ni: {node.visits}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+
+        self.prove_path(node_path)
+
+    def backpropagate_arena(self, node_path: list, reward: int, playouts: int = 1) -> None:
+        """
+        Backpropagates a reward (summed over playouts) along a path of arena node indexes, root first. The reward is
+        for the player who moved into the root, and alternates sign down the path.
+        """
+        visits = self.arena.visits
+        wins = self.arena.wins
+        for index in range(len(node_path) - 1, -1, -1):
+            node = node_path[index]
+            visits[node] += playouts
+            wins[node] += reward if index % 2 == 0 else -reward
+
+            if self.trace:
+                Utils.log_message("Updated values:", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                Utils.log_message(f"wi: {wins[node]}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                Utils.log_message(f"ni: {visits[node]}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+
+    def update_amaf(self, node_path: list, path: list, outcome: int) -> None:
+        """
+        Adds the outcome of a simulation to the AMAF statistics along its path.
+
+        Every child of a node on the path counts the simulation as if its move had been played first when the player to
+        move at the node filled the cell of that move later on, in the tree or in the rollout. Moves are compared by
+        cell rather than column, since a later disc in the same column lands higher and is a different move.
+
+        Args:
+            node_path (list): Nodes from the root down to the node the rollout started from.
+            path (list): The (move, player) pairs played from the root, through the tree and then the rollout.
+            outcome (int): The result of the simulation (see GameInterface.evaluate_board).
+        """
+        reward = -1 if outcome == -1 else 1 if outcome == 1 else 0  # For Y, who wins when the outcome is 1
+        num_cols = len(self.root_heights)
+        heights = list(self.root_heights)
+        for column, _ in path:
+            heights[column] += 1
+        played = {Globals.Players.R: set(), Globals.Players.Y: set()}  # Cells filled by each player from index on
+        for index in range(len(path) - 1, -1, -1):
+            column, player = path[index]
+            heights[column] -= 1  # The heights before the move, at node_path[index]
+            played[player].add(heights[column] * num_cols + column)
+            if index < len(node_path):
+                cells = played[player]
+                for move, child in node_path[index].children.items():
+                    if heights[move] * num_cols + move in cells:
+                        child.amaf_visits += 1
+                        child.amaf_wins += reward if player == Globals.Players.Y else -reward
+
+    def get_proven(self, node) -> int:
+        """Gets the proven value of a node (or arena node index), UNPROVEN when it is not known."""
+        return self.arena.proven[node] if self.arena is not None else node.proven
+
+    def set_proven(self, node, value: int) -> None:
+        """Sets the proven value of a node (or arena node index)."""
+        if self.arena is not None:
+            self.arena.proven[node] = value
+        else:
+            node.proven = value
+
+    def prove_leaf(self, node, state: GameInterface) -> None:
+        """Proves a selected node when the game is decided at it: the move that reached it won or drew the game."""
+        if self.get_proven(node) == self.UNPROVEN:
+            outcome = state.evaluate_board(False)
+            if outcome is not None:
+                self.set_proven(node, self.PROVEN_DRAW if outcome == 0 else self.PROVEN_WIN)
+
+    def prove_path(self, node_path: list) -> None:
+        """
+        Propagates proven values up a path with minimax rules, stopping at the first node that cannot be proven.
+
+        A node is a loss for the player who moved into it when one of its children is a win for the player to move,
+        and once every child is proven it is a draw when one of them is a draw and a win otherwise.
+        """
+        for index in range(len(node_path) - 1, 0, -1):
+            parent = node_path[index - 1]
+            if self.get_proven(node_path[index]) == self.UNPROVEN or self.get_proven(parent) != self.UNPROVEN:
+                return
+            if self.arena is not None:
+                children = [child for _, child in self.arena.get_children(parent)]
+            else:
+                children = parent.children.values()
+            values = [self.get_proven(child) for child in children]
+            if self.PROVEN_WIN in values:
+                self.set_proven(parent, self.PROVEN_LOSS)
+            elif not values or self.UNPROVEN in values or (self.arena is None and parent.untried):
+                return  # Some child is unproven, or not even added yet
+            else:
+                self.set_proven(parent, self.PROVEN_DRAW if self.PROVEN_DRAW in values else self.PROVEN_WIN)
+            if index == 1 and self.trace:
+                Utils.log_message(f"Root proven: {self.get_proven(parent)}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+
+    def get_proven_outcome(self, proven: int, path: list) -> int:
+        """
+        Converts the proven value of a selected node into the outcome its rollout would return.
+
+        Args:
+            proven (int): The proven value of the node.
+            path (list): The (move, player) pairs played from the root to the node.
+        """
+        if proven == self.PROVEN_DRAW:
+            return 0
+        mover = path[-1][1] if path else self.game.get_opponent(self.current_player)
+        winner = mover if proven == self.PROVEN_WIN else self.game.get_opponent(mover)
+        return 1 if winner == Globals.Players.Y else -1
 
-            # Apply reward based on the perspective of the player who made the move to reach this node
-            if node.parent is not None: # For non-root nodes, the outcome is from the opponent's perspective in the parent
-                node.parent.wins += -reward
-            elif reward == 1: # For the root node, a win is a positive outcome
-                node.wins += 1
-            elif reward == -1: # For the root node, a loss is a negative outcome
-                node.wins += -1
+    def get_leaf_player(self, path: list) -> str:
+        """Gets the player to move at a selected node, who starts its rollout, from the (move, player) pairs played to it."""
+        return self.game.get_opponent(path[-1][1]) if path else self.current_player
 
-            Utils.log_message("Updated values:", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            Utils.log_message(f"wi: {node.wins}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            Utils.log_message(f"ni: {node.visits}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+    def expansion(self, parent: Node, state: GameInterface, player: str = None, flipped: bool = False) -> bool:
+        """
+        Expands the tree from the given node.
 
-            node = node.parent
+        Args:
+            parent (Node): The leaf to expand.
+            state (GameInterface): The game positioned at parent.
+            player (str, optional): The player to move. Needed to link children through the transposition table.
+            flipped (bool, optional): True when parent is stored as the mirror of the actual position.
 
-    def expansion(self, parent: Node, state: GameInterface) -> bool:
-        """Expands the tree from the given node."""
+        Returns:
+            bool: False when the position is terminal or the tree is at its node budget, True otherwise.
+        """
         
+        if self.lazy_expansion:
+            return self.expand_lazily(parent, state)
         if state.evaluate_board(False) is not None:
             return False
-        Utils.log_message("NODE ADDED", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        legal_moves = state.legal_moves()
+        if self.tree_budget and self.tree_size + len(legal_moves) > self.tree_budget:
+            if self.budget_policy != "evict" or not self.evict_subtrees(len(legal_moves)):
+                self.stats.skipped_expansions += 1
+                return False
+        if self.trace:
+            Utils.log_message("NODE ADDED", Globals.VerbosityLevels.VERBOSE, self.logger_source)
         
-        legal_moves = [move for move in range(state.get_num_cols()) if state.is_valid_move(move)]
-        children = [Node(move, parent) for move in legal_moves]
-        parent.children = {child.move: child for child in children}
-        self.node_count += len(children)  # Increment node_count
+        if self.transposition_table is None or player is None:
+            children = [Node(move, parent) for move in legal_moves]
+            parent.children = {child.move: child for child in children}
+            self.node_count += len(children)  # Increment node_count
+            self.tree_size += len(children)
+            return True
+
+        num_cols = state.get_num_cols()
+        for column in legal_moves:
+            move = num_cols - 1 - column if flipped else column  # Children are keyed in the parent's orientation
+            state.do_move(column, player)
+            child, mirrored = self.transposition_table.lookup(state)
+            if child is None:
+                child = Node(move, parent)
+                self.transposition_table.store(state, child)
+                self.node_count += 1  # Increment node_count
+                self.tree_size += 1
+            state.undo_move()
+
+            if mirrored != flipped:
+                if parent.mirrored is None:
+                    parent.mirrored = set()
+                parent.mirrored.add(move)
+            parent.children[move] = child
 
         return True
     
-    def best_move(self, root=None):
-        """Selects the best move after all simulations are completed."""
+    def expand_lazily(self, parent: Node, state: GameInterface) -> bool:
+        """
+        Adds one child to a node, for a move drawn at random from its untried moves (listed on its first expansion).
+
+        Returns:
+            bool: False when the position is terminal or the tree is at its node budget, True otherwise.
+        """
+        if parent.untried is None:
+            if state.evaluate_board(False) is not None:
+                return False
+            parent.untried = list(state.legal_moves())
+            random.shuffle(parent.untried)
+        if self.tree_budget and self.tree_size + 1 > self.tree_budget:
+            if self.budget_policy != "evict" or not self.evict_subtrees(1):
+                self.stats.skipped_expansions += 1
+                return False
+        move = parent.untried.pop()
+        parent.children[move] = Node(move, parent)
+        self.node_count += 1  # Increment node_count
+        self.tree_size += 1
+        return True
+
+    def get_root_statistics(self, root=None) -> dict:
+        """
+        Gets the statistics of the root's children.
+
+        Args:
+            root (optional): The root node. Defaults to the root of the current search.
+
+        Returns:
+            dict: {column: (wins, visits)} for every child of the root.
+        """
         if root is None:
             root = self.root
+        if self.arena is not None:
+            arena = self.arena
+            return {move: (arena.wins[child], arena.visits[child]) for move, child in arena.get_children(root)}
+
+        num_cols = self.game.get_num_cols()
+        flipped = root is self.root and self.root_flipped
+        return {(num_cols - 1 - move if flipped else move): (child.wins, child.visits) for move, child in root.children.items()}
 
-        if not root.children:
-            legal_moves = [i for i in range(self.game.get_num_cols()) if self.game.is_valid_move(i)]
+    def get_root_proven(self, root=None) -> dict:
+        """
+        Gets the proven values of the root's children.
+
+        Args:
+            root (optional): The root node. Defaults to the root of the current search.
+
+        Returns:
+            dict: {column: proven value} for every proven child of the root.
+        """
+        if root is None:
+            root = self.root
+        if self.arena is not None:
+            proven = self.arena.proven
+            return {move: proven[child] for move, child in self.arena.get_children(root) if proven[child] != self.UNPROVEN}
+
+        num_cols = self.game.get_num_cols()
+        flipped = root is self.root and self.root_flipped
+        return {(num_cols - 1 - move if flipped else move): child.proven for move, child in root.children.items() if child.proven != self.UNPROVEN}
+
+    def best_move(self, root=None):
+        """Selects the best move after all simulations are completed, playing a proven win immediately."""
+        statistics = self.get_root_statistics(root)
+        proven = self.get_root_proven(root)
+        for column, value in sorted(proven.items()):
+            if value == self.PROVEN_WIN:
+                return column
+
+        if not statistics:
+            legal_moves = self.game.legal_moves()
             if legal_moves:
                 fallback = random.choice(legal_moves)
                 return fallback
@@ -105,20 +775,23 @@ class MCTS(Base):
 
         best_move = -1
         best_value = float('-inf')
-        move_values = [None] * self.game.get_num_cols()
+        num_cols = self.game.get_num_cols()
+        move_values = [None] * num_cols
 
-        for move, child in root.children.items():
-            if child.visits > 0:
-                move_values[move] = child.wins / child.visits
+        for column, (wins, visits) in statistics.items():
+            if proven.get(column) == self.PROVEN_LOSS:
+                move_values[column] = -2.0  # Below any win rate, so a proven loss is only played when nothing else is left
+            elif visits > 0:
+                move_values[column] = wins / visits
             else:
-                move_values[move] = None
+                move_values[column] = None
 
         for move, value in enumerate(move_values):
             if value is not None and value > best_value:
                 best_value = value
                 best_move = move
 
-        if Utils.get_verbosity_level() == Globals.VerbosityLevels.VERBOSE:
+        if self.trace:
             for i in range(self.game.get_num_cols()):
                 if self.game.is_valid_move(i):
                     if move_values[i] is not None:
@@ -130,7 +803,7 @@ class MCTS(Base):
 
         # Final fallback if no best move found from visits
         if best_move == -1:
-            legal_moves = [i for i in range(self.game.get_num_cols()) if self.game.is_valid_move(i)]
+            legal_moves = self.game.legal_moves()
             if legal_moves:
                 fallback = random.choice(legal_moves)
                 return fallback
@@ -139,10 +812,219 @@ class MCTS(Base):
 
         return best_move
     
-    @abstractmethod
     def select_child(self, current_player: str, path: list) -> tuple:
-        """Selects a node to expand."""
-        pass
+        """
+        Selects a node to expand, descending with pick_child and expanding the first leaf reached once it has
+        expand_threshold visits. When expanding lazily, the descent stops at the first node with untried moves instead,
+        and one child is added to it. The descent stops at proven nodes, and a node where the game is decided is marked
+        proven.
+
+        Args:
+            current_player (str): The player to move at the root.
+            path (list): Receives the (move, player) pairs played on the game.
+
+        Returns:
+            tuple: The selected node and the game positioned at it.
+        """
+        if self.arena is not None:
+            return self.select_arena_child(current_player, path)
+
+        node: Node = self.root
+        state: GameInterface = self.game
+        num_cols = state.get_num_cols()
+        flipped = self.root_flipped  # True while node is stored as the mirror of the actual position
+        self.node_path = [node]
+
+        while node.children and node.proven == self.UNPROVEN and not node.untried:
+            move, child = self.pick_child(node)
+            column = num_cols - 1 - move if flipped else move
+            if node.mirrored is not None and move in node.mirrored:
+                flipped = not flipped
+            node = child
+            self.node_path.append(node)
+            if self.trace:
+                Utils.log_message(f"wi: {node.wins}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                Utils.log_message(f"ni: {node.visits}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                Utils.log_message(f"Move selected: {column + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+            try:
+                state.do_move(column, current_player)
+                path.append((column, current_player))
+            except ValueError:
+                return node, state
+
+            current_player = state.get_opponent(current_player)  # Update player
+
+        expansion_start = time.perf_counter()
+        expanded = (node.proven == self.UNPROVEN and (node.children or node.visits >= self.expand_threshold or node is self.root)
+                    and self.expansion(node, state, current_player, flipped))
+        expansion_time = time.perf_counter() - expansion_start
+        self.stats.expansion += expansion_time
+        self.stats.selection -= expansion_time  # Counted by the caller as part of the selection
+        if expanded:
+            # The child just added when expanding lazily, otherwise any of the new children
+            move, node = next(reversed(node.children.items())) if self.lazy_expansion else random.choice(list(node.children.items()))
+            column = num_cols - 1 - move if flipped else move
+            self.node_path.append(node)
+
+            try:
+                state.do_move(column, current_player)
+                path.append((column, current_player))
+            except ValueError:
+                return node, state
+
+        self.prove_leaf(node, state)
+        return node, state
+
+    def pick_child(self, node: Node) -> tuple:
+        """
+        Picks the child of an expanded node to descend into, by default the one with the highest uct_value. Proven
+        losses are skipped unless every child is one.
+
+        Returns:
+            tuple: The move (in the node's orientation) and the child node.
+        """
+        best_value = float('-inf')
+        best_move = None
+        best_child = None
+        child_counter = 1
+
+        root_depth = self.root.depth
+        for move, child in node.children.items():
+            if child.proven == self.PROVEN_LOSS:
+                continue
+            if child.visits == 0:
+                uct_value = float('inf')
+            else:
+                wins = child.wins
+                if self.rave and child.amaf_visits:
+                    # The AMAF mean reward, weighted by a factor fading as the child's own visits grow
+                    beta = math.sqrt(self.rave / (3 * child.visits + self.rave))
+                    wins = (1 - beta) * wins + beta * child.visits * child.amaf_wins / child.amaf_visits
+                uct_value = self.uct_value(wins, child.visits, node.visits, move, child.depth - root_depth)
+
+            if self.trace:
+                Utils.log_message(f"V{child_counter}: {uct_value:.2f} (wins={child.wins}, visits={child.visits})", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+            child_counter += 1  # Increment the counter
+
+            if uct_value > best_value:
+                best_value = uct_value
+                best_move = move
+                best_child = child
+
+        if best_child is None:
+            return next(iter(node.children.items()))
+        if self.trace:
+            Utils.log_message(f"Best V#: {best_value:.2f}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        return best_move, best_child
+
+    def uct_value(self, wins: float, visits: int, parent_visits: int, move: int, depth: int) -> float:
+        """
+        Computes the selection value of a visited child: UCB1 with c = sqrt(2) by default, which the UCT variants
+        override to add their own terms.
+
+        Args:
+            wins (float): Wins of the child.
+            visits (int): Visits of the child (greater than 0).
+            parent_visits (int): Visits of the parent.
+            move (int): Move leading to the child.
+            depth (int): Depth of the child below the root of the search.
+        """
+        return wins / visits + math.sqrt(2) * math.sqrt(math.log(parent_visits) / visits)
+
+    def select_arena_child(self, current_player: str, path: list) -> tuple:
+        """
+        Selects a node to expand in the arena tree store, descending with pick_arena_child.
+
+        Returns:
+            tuple: The selected node index and the game positioned at it.
+        """
+        arena = self.arena
+        state: GameInterface = self.game
+        node = NodeArena.ROOT
+        self.node_path = [node]
+
+        while arena.child_count[node] and arena.proven[node] == self.UNPROVEN:
+            move, node = self.pick_arena_child(node)
+            self.node_path.append(node)
+            if self.trace:
+                Utils.log_message(f"wi: {arena.wins[node]}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                Utils.log_message(f"ni: {arena.visits[node]}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                Utils.log_message(f"Move selected: {move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+            try:
+                state.do_move(move, current_player)
+                path.append((move, current_player))
+            except ValueError:
+                return node, state
+
+            current_player = state.get_opponent(current_player)  # Update player
+
+        if (arena.proven[node] == self.UNPROVEN and (node == NodeArena.ROOT or arena.visits[node] >= self.expand_threshold)
+                and state.evaluate_board(False) is None and not self.is_tree_full(state)):
+            if self.trace:
+                Utils.log_message("NODE ADDED", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+            expansion_start = time.perf_counter()
+            legal_moves = state.legal_moves()
+            for move in legal_moves:
+                arena.add_node(move, node)
+            self.node_count += len(legal_moves)  # Increment node_count
+            self.tree_size += len(legal_moves)
+            expansion_time = time.perf_counter() - expansion_start
+            self.stats.expansion += expansion_time
+            self.stats.selection -= expansion_time  # Counted by the caller as part of the selection
+
+            move = random.choice(legal_moves)
+            node = arena.children[node * arena.width + move]
+            self.node_path.append(node)
+            try:
+                state.do_move(move, current_player)
+                path.append((move, current_player))
+            except ValueError:
+                return node, state
+
+        self.prove_leaf(node, state)
+        return node, state
+
+    def is_tree_full(self, state: GameInterface) -> bool:
+        """Checks whether expanding the arena leaf at state would exceed the node budget, counting the skipped expansion."""
+        if self.tree_budget and self.tree_size + len(state.legal_moves()) > self.tree_budget:
+            self.stats.skipped_expansions += 1
+            return True
+        return False
+
+    def pick_arena_child(self, node: int) -> tuple:
+        """
+        Picks the child of an expanded arena node to descend into, by default the one with the highest uct_value.
+
+        The values of all child slots are computed and reduced in a single max() pass over the arrays. Proven losses are
+        skipped unless every child is one.
+
+        Returns:
+            tuple: The move and the child node index.
+        """
+        arena = self.arena
+        children = arena.children
+        visits = arena.visits
+        wins = arena.wins
+        proven = arena.proven
+        depth = arena.depth[node] + 1
+        # In a SharedTree, the statistics read can be midway through another process's update, so the parent can
+        # briefly have fewer visits than its children
+        parent_visits = max(visits[node], 1)
+        base = node * arena.width
+        infinity = float('inf')
+        uct_value = self.uct_value
+
+        best = max(
+            ((infinity if visits[child] <= 0 else uct_value(wins[child], visits[child], parent_visits, move, depth), move)
+             for move, child in ((move, children[base + move]) for move in range(arena.width))
+             if child != NodeArena.NO_CHILD and proven[child] != self.PROVEN_LOSS),
+            key=lambda item: item[0], default=None)
+        if best is None:
+            return arena.get_children(node)[0]
+        best_value, best_move = best
+        if self.trace:
+            Utils.log_message(f"Best V#: {best_value:.2f}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        return best_move, children[base + best_move]
 
     @abstractmethod
     def rollout(self, state: GameInterface, current_player: str, path: list) -> int:
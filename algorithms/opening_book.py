@@ -0,0 +1,134 @@
+import mmap, os, struct
+from common import GameInterface, Globals, Utils
+
+class OpeningBook():
+    """
+    Read-only opening book stored in a memory-mapped file.
+
+    The file is a header followed by fixed-size records sorted by key. A key is the smaller of the Zobrist hashes of a
+    position and of its left-right mirror, XORed with a constant when Yellow is to move, so mirror positions share one
+    record whose move is stored in the orientation of the smaller hash. Lookups are binary searches on the mapped file,
+    so every process opening the same book shares its pages through the operating system.
+    """
+    MAGIC = b"C4OB"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHBBI")  # Magic, version, rows, columns, number of records
+    RECORD = struct.Struct("<QBb")  # Key, move, score (percentage of the root visits spent on the move)
+    YELLOW_TO_MOVE = 0x9E3779B97F4A7C15  # XORed into the key of positions with Yellow to move
+    DEFAULT_FILE = os.path.join("_resources", "opening_book.bin")  # Book used by opening_book=1, relative to the base directory
+    _books = {}  # {absolute path: OpeningBook} opened by this process
+
+    def __init__(self, path: str):
+        """
+        Maps a book file.
+
+        Args:
+            path (str): The book file.
+
+        Raises:
+            ValueError: If the file is not an opening book.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < self.HEADER.size:
+            raise ValueError(f"Invalid opening book: {path}")
+        magic, version, self.num_rows, self.num_cols, self.count = self.HEADER.unpack_from(self.data, 0)
+        if magic != self.MAGIC or version != self.VERSION or len(self.data) != self.HEADER.size + self.count * self.RECORD.size:
+            raise ValueError(f"Invalid opening book: {path}")
+        self.hits = 0
+
+    @staticmethod
+    def open(path: str) -> "OpeningBook":
+        """Gets the book of a file, mapping it on first use in this process."""
+        path = os.path.abspath(path)
+        book = OpeningBook._books.get(path)
+        if book is None:
+            book = OpeningBook._books[path] = OpeningBook(path)
+        return book
+
+    @staticmethod
+    def get_path(option) -> str:
+        """
+        Gets the book file selected by an opening_book option.
+
+        Args:
+            option: 1 (or True) for DEFAULT_FILE, otherwise the path of the book, relative paths being resolved against
+                the base directory.
+
+        Raises:
+            ValueError: If the file does not exist.
+        """
+        path = OpeningBook.DEFAULT_FILE if option is True or option == 1 else str(option)
+        if not os.path.isabs(path):
+            path = os.path.join(Utils.get_base_dir(), path)
+        if not os.path.isfile(path):
+            raise ValueError(f"Opening book not found: {path}. Build it with build_opening_book.py")
+        return path
+
+    @staticmethod
+    def get_key(game: GameInterface, player: str) -> tuple:
+        """
+        Gets the book key of a position.
+
+        Returns:
+            tuple: The key and True when it was taken from the mirror position.
+        """
+        position_hash = game.get_hash()
+        mirror_hash = game.get_hash(True)
+        flipped = mirror_hash < position_hash
+        key = mirror_hash if flipped else position_hash
+        if player == Globals.Players.Y:
+            key ^= OpeningBook.YELLOW_TO_MOVE
+        return key, flipped
+
+    def lookup(self, game: GameInterface, player: str):
+        """
+        Looks up the book move of a position.
+
+        Args:
+            game (GameInterface): The game.
+            player (str): The player to move.
+
+        Returns:
+            int: The book move (column index), or None when the position is not in the book.
+        """
+        num_cols = game.get_num_cols()
+        if num_cols != self.num_cols:
+            return None
+        key, flipped = self.get_key(game, player)
+        low, high = 0, self.count
+        header_size = self.HEADER.size
+        record_size = self.RECORD.size
+        while low < high:
+            middle = (low + high) // 2
+            record_key, move, _ = self.RECORD.unpack_from(self.data, header_size + middle * record_size)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                self.hits += 1
+                return num_cols - 1 - move if flipped else move
+        return None
+
+    @staticmethod
+    def write(path: str, num_rows: int, num_cols: int, records: dict) -> None:
+        """
+        Writes a book file.
+
+        Args:
+            path (str): The book file.
+            num_rows (int): Number of rows of the board.
+            num_cols (int): Number of columns of the board.
+            records (dict): {key: (move, score)} with the moves in the orientation of the key.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(OpeningBook.HEADER.pack(OpeningBook.MAGIC, OpeningBook.VERSION, num_rows, num_cols, len(records)))
+            for key in sorted(records):
+                move, score = records[key]
+                file.write(OpeningBook.RECORD.pack(key, move, score))
+        OpeningBook._books.pop(os.path.abspath(path), None)
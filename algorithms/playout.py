@@ -0,0 +1,178 @@
+import random
+from common import GameInterface, Globals
+
+try:
+    import numpy as np  # Optional, vectorizes the playouts
+except ImportError:
+    np = None
+
+ROWS = 6
+COLS = 7
+HEIGHT = ROWS + 1  # Bits per column, including the sentinel (same layout as Connect4Bitboard)
+UNDECIDED = 2
+
+class BatchPlayout():
+    """
+    Runs batches of uniformly random playouts to completion.
+
+    With NumPy available, every game of the batch is a pair of 64-bit bitboards and all of them
+    advance one ply per step with array operations: a random legal column is drawn for every
+    game, the discs are placed with shifts and wins are detected with shift-and-mask checks.
+    Without NumPy (or for boards other than 6x7) the playouts run one after the other on copies
+    of the game.
+
+    Outcomes follow GameInterface.evaluate_board: 1 when Y wins, -1 when R wins and 0 for a draw.
+    """
+    def __init__(self, seed: int = None):
+        """
+        Initializes the playout engine.
+
+        Args:
+            seed (int, optional): Seed of the random generator. Defaults to a random seed.
+        """
+        self.rng = np.random.default_rng(seed) if np is not None else None
+        self.random = random.Random(seed)
+
+    @staticmethod
+    def is_vectorized() -> bool:
+        """Returns True when NumPy is available to vectorize the playouts."""
+        return np is not None
+
+    def run(self, states: list, players: list):
+        """
+        Plays every position to completion.
+
+        Args:
+            states (list[GameInterface]): The positions to play out. They are not modified.
+            players (list[str]): The player to move in each position.
+
+        Returns:
+            The outcome of each playout (a NumPy int8 array when vectorized, a list otherwise).
+        """
+        if np is None or any(not self.is_supported(state) for state in states):
+            return [self.play_sequential(state, player) for state, player in zip(states, players)]
+
+        count = len(states)
+        red = np.zeros(count, dtype=np.uint64)
+        yellow = np.zeros(count, dtype=np.uint64)
+        heights = np.empty((count, COLS), dtype=np.int64)
+        outcomes = np.full(count, UNDECIDED, dtype=np.int8)
+        for index, state in enumerate(states):
+            red_bits, yellow_bits, column_heights = self.encode(state)
+            red[index] = red_bits
+            yellow[index] = yellow_bits
+            heights[index] = column_heights
+            status = state.evaluate_board(False)
+            if status is not None:
+                outcomes[index] = status
+        red_to_move = np.array([player == Globals.Players.R for player in players], dtype=bool)
+        return self.simulate(red, yellow, heights, red_to_move, outcomes)
+
+    def run_repeated(self, state: GameInterface, player: str, count: int):
+        """
+        Plays the same position to completion count times.
+
+        Args:
+            state (GameInterface): The position to play out. It is not modified.
+            player (str): The player to move.
+            count (int): Number of playouts.
+
+        Returns:
+            The outcome of each playout (a NumPy int8 array when vectorized, a list otherwise).
+        """
+        if np is None or not self.is_supported(state):
+            return [self.play_sequential(state, player) for _ in range(count)]
+
+        red_bits, yellow_bits, column_heights = self.encode(state)
+        status = state.evaluate_board(False)
+        red = np.full(count, red_bits, dtype=np.uint64)
+        yellow = np.full(count, yellow_bits, dtype=np.uint64)
+        heights = np.tile(np.array(column_heights, dtype=np.int64), (count, 1))
+        outcomes = np.full(count, UNDECIDED if status is None else status, dtype=np.int8)
+        red_to_move = np.full(count, player == Globals.Players.R, dtype=bool)
+        return self.simulate(red, yellow, heights, red_to_move, outcomes)
+
+    def simulate(self, red, yellow, heights, red_to_move, outcomes):
+        """Advances every undecided game one ply per step until all of them are decided."""
+        top = np.arange(COLS, dtype=np.int64) * HEIGHT + ROWS  # First bit above each column
+        one = np.uint64(1)
+        active = np.flatnonzero(outcomes == UNDECIDED)
+
+        while active.size:
+            legal = heights[active] < top
+            stuck = ~legal.any(axis=1)
+            if stuck.any():
+                outcomes[active[stuck]] = 0
+                active = active[~stuck]
+                legal = legal[~stuck]
+                if not active.size:
+                    break
+
+            scores = self.rng.random(legal.shape)
+            scores[~legal] = -1.0
+            cols = scores.argmax(axis=1)
+            bit_index = heights[active, cols]
+            heights[active, cols] = bit_index + 1
+            bits = np.left_shift(one, bit_index.astype(np.uint64))
+
+            movers_red = red_to_move[active]
+            red_rows = active[movers_red]
+            yellow_rows = active[~movers_red]
+            red[red_rows] |= bits[movers_red]
+            yellow[yellow_rows] |= bits[~movers_red]
+            won = self.has_four(np.where(movers_red, red[active], yellow[active]))
+            full = (heights[active] >= top).all(axis=1) & ~won
+
+            outcomes[active[won]] = np.where(movers_red[won], -1, 1)
+            outcomes[active[full]] = 0
+            red_to_move[active] = ~movers_red
+            active = active[~(won | full)]
+
+        return outcomes
+
+    @staticmethod
+    def has_four(bitboards):
+        """Returns which bitboards hold four in a row (vertical, horizontal or diagonal)."""
+        won = np.zeros(bitboards.shape, dtype=bool)
+        for shift in (1, HEIGHT, HEIGHT - 1, HEIGHT + 1):
+            step = np.uint64(shift)
+            pairs = bitboards & (bitboards >> step)
+            won |= (pairs & (pairs >> np.uint64(2 * shift))) != 0
+        return won
+
+    @staticmethod
+    def is_supported(state: GameInterface) -> bool:
+        """Returns True when the vectorized kernel handles the board size of the state."""
+        return state.get_num_cols() == COLS and len(state.get_board()) == ROWS
+
+    @staticmethod
+    def encode(state: GameInterface) -> tuple:
+        """Encodes a position as red and yellow bitboards plus the next free bit of each column."""
+        red = 0
+        yellow = 0
+        heights = [col * HEIGHT for col in range(COLS)]
+        for row_index, row in enumerate(state.get_board()):
+            row_from_bottom = ROWS - 1 - row_index
+            for col, cell in enumerate(row):
+                if cell == Globals.Players.O:
+                    continue
+                bit = col * HEIGHT + row_from_bottom
+                if cell == Globals.Players.R:
+                    red |= 1 << bit
+                else:
+                    yellow |= 1 << bit
+                heights[col] = max(heights[col], bit + 1)
+        return red, yellow, heights
+
+    def play_sequential(self, state: GameInterface, player: str) -> int:
+        """Plays one uniformly random playout on a copy of the state."""
+        game = state.copy_game()
+        result = game.evaluate_board(False)
+        while result is None:
+            legal_moves = game.legal_moves()
+            if not legal_moves:
+                return 0  # Draw
+            game.do_move(self.random.choice(legal_moves), player)
+            player = game.get_opponent(player)
+            result = game.evaluate_board(False)
+        return result
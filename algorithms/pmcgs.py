@@ -4,8 +4,10 @@ import random
 
 class PMCGS(MCTS):
     """Implements the Pure Monte Carlo Game Search (PMCGS) algorithm."""
-    def __init__(self, simulations:int=0):
-        super().__init__(simulations, __name__ + "." + self.__class__.__name__)
+    def __init__(self, simulations:int=0, **kwargs):
+        if kwargs.get("rave"):
+            raise ValueError("PMCGS selects children at random, so it does not support rave")
+        super().__init__(simulations, __name__ + "." + self.__class__.__name__, **kwargs)
 
     def choose_move(self, game: GameInterface, player):
         return super().choose_move(game, player)
@@ -13,54 +15,39 @@ class PMCGS(MCTS):
     def search(self):
         super().search()
 
-    def backpropagation(self, node: Node, outcome: int) -> None:
-        super().backpropagation(node, outcome)
+    def backpropagation(self, node: Node, outcome: int, node_path: list = None, playouts: int = 1) -> None:
+        super().backpropagation(node, outcome, node_path, playouts)
 
-    def expansion(self, parent: Node, state: GameInterface) -> bool:
-        return super().expansion(parent, state)
+    def expansion(self, parent: Node, state: GameInterface, player: str = None, flipped: bool = False) -> bool:
+        return super().expansion(parent, state, player, flipped)
 
     def best_move(self, root=None):
         return super().best_move(root)
     
-    def select_child(self, current_player:str, path: list) -> tuple:
-        """Selects a node to expand (randomly)."""
-        node:Node = self.root
-        state:GameInterface = self.game
-        
-        while node.children:
-            children = list(node.children.values())
-            node = random.choice(children)  # Random selection
-            Utils.log_message(f"wi: {node.wins}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            Utils.log_message(f"ni: {node.visits}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            Utils.log_message(f"Move selected: {node.move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            try:
-                state.do_move(node.move, current_player)
-                path.append((node.move, current_player))
-            except ValueError:
-                return node, state
+    def pick_child(self, node: Node) -> tuple:
+        """Picks a child to descend into (randomly), skipping proven losses unless every child is one."""
+        children = [(move, child) for move, child in node.children.items() if child.proven != self.PROVEN_LOSS]
+        return random.choice(children or list(node.children.items()))  # Random selection
 
-            current_player = self.game.get_opponent(current_player)  # Update player
-            
-        if self.expansion(node, state):
-            node = random.choice(list(node.children.values()))
-            
-            try:
-                state.do_move(node.move, current_player)
-                path.append((node.move, current_player))
-            except ValueError:
-                return node, state
-        return node, state
+    def pick_arena_child(self, node: int) -> tuple:
+        """Picks a child of an arena node to descend into (randomly), skipping proven losses unless every child is one."""
+        children = self.arena.get_children(node)
+        proven = self.arena.proven
+        return random.choice([(move, child) for move, child in children if proven[child] != self.PROVEN_LOSS] or children)  # Random selection
 
     def rollout(self, state: GameInterface, current_player:str, path: list) -> int:
         """Performs a rollout from the given state (randomly)."""
+        if self.policy is not None:
+            return self.policy.play(state, current_player, path)
         
         while state.evaluate_board(False) is None:
-            legal_moves = [move for move in range(state.get_num_cols()) if state.is_valid_move(move)]
+            legal_moves = state.legal_moves()
             if not legal_moves:
                 return 0  # Draw
             move = random.choice(legal_moves)
 
-            Utils.log_message(f"Move selected: {move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+            if self.trace:
+                Utils.log_message(f"Move selected: {move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
 
             try:
                 state.do_move(move, current_player)
@@ -70,5 +57,6 @@ class PMCGS(MCTS):
             current_player = state.get_opponent(current_player)  # Update player
 
         result = state.evaluate_board(False)
-        Utils.log_message(f"TERMINAL NODE VALUE: {result}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        if self.trace:
+            Utils.log_message(f"TERMINAL NODE VALUE: {result}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
         return result
\ No newline at end of file
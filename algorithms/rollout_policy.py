@@ -0,0 +1,176 @@
+import random
+from common import GameInterface, Globals
+
+class RolloutPolicy():
+    """
+    Move policies for the rollouts of the MCTS algorithms.
+
+    * uniform: a legal move drawn uniformly at random (the rollout of the algorithms themselves).
+    * win: plays a winning move whenever there is one, otherwise a uniform move.
+    * block: like win, then blocks the opponent's winning move when there is one.
+    * center: a legal move drawn with weights decreasing from the center column out.
+    * tactical: like block, with center-weighted moves otherwise.
+
+    The tactical policies look the threats up rather than trying every move. A line table lists, for every cell, the
+    four-cell windows through it. During a playout the policy counts the discs of each player in every window and
+    keeps, per player, the set of empty cells completing one of their windows. A move wins exactly when its cell is in
+    the set of the player, so the playout also knows when the game ends without evaluating the board.
+    """
+    UNIFORM, WIN, BLOCK, CENTER, TACTICAL = "uniform", "win", "block", "center", "tactical"
+    POLICIES = (UNIFORM, WIN, BLOCK, CENTER, TACTICAL)
+    _tables = {}  # {(rows, columns): (windows, windows per cell)}
+    _weights = {}  # {legal columns: cumulative center weights}
+
+    def __init__(self, name: str = UNIFORM):
+        """
+        Initializes the policy.
+
+        Args:
+            name (str, optional): One of POLICIES. Defaults to "uniform".
+
+        Raises:
+            ValueError: If the policy name is invalid.
+        """
+        name = str(name).lower()
+        if name not in self.POLICIES:
+            raise ValueError(f"Invalid rollout policy: {name}")
+        self.name = name
+        self.win = name in (self.WIN, self.BLOCK, self.TACTICAL)
+        self.block = name in (self.BLOCK, self.TACTICAL)
+        self.center = name in (self.CENTER, self.TACTICAL)
+
+    @staticmethod
+    def get_line_tables(num_rows: int, num_cols: int) -> tuple:
+        """
+        Gets the line tables of a board, building them on first use. Cell (height, column) is index column * num_rows + height.
+
+        Returns:
+            tuple: The windows (tuples of four cells) and, for every cell, the indexes of the windows through it.
+        """
+        tables = RolloutPolicy._tables.get((num_rows, num_cols))
+        if tables is None:
+            windows = []
+            for col in range(num_cols):
+                for height in range(num_rows):
+                    for col_step, height_step in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                        end_col, end_height = col + 3 * col_step, height + 3 * height_step
+                        if end_col < num_cols and 0 <= end_height < num_rows:
+                            windows.append(tuple((col + i * col_step) * num_rows + height + i * height_step for i in range(4)))
+            by_cell = [[] for _ in range(num_rows * num_cols)]
+            for index, window in enumerate(windows):
+                for cell in window:
+                    by_cell[cell].append(index)
+            tables = RolloutPolicy._tables[(num_rows, num_cols)] = (windows, [tuple(indexes) for indexes in by_cell])
+        return tables
+
+    @staticmethod
+    def choose_center(legal_moves, num_cols: int) -> int:
+        """Draws a legal move with weight num_cols // 2 + 1 for the center column, decreasing by one per column out."""
+        key = tuple(legal_moves)
+        cum_weights = RolloutPolicy._weights.get(key)
+        if cum_weights is None:
+            total = 0
+            cum_weights = []
+            for col in key:
+                total += num_cols // 2 + 1 - abs(col - (num_cols - 1) / 2)
+                cum_weights.append(total)
+            RolloutPolicy._weights[key] = cum_weights
+        return random.choices(key, cum_weights=cum_weights)[0]
+
+    def play(self, state: GameInterface, current_player: str, path: list) -> int:
+        """
+        Plays the position to the end with the policy, appending every (move, player) to path.
+
+        Args:
+            state (GameInterface): The position, left with the moves of path played.
+            current_player (str): The player making the first move.
+            path (list): Moves made, extended with the moves of the playout.
+
+        Returns:
+            int: The outcome (see GameInterface.evaluate_board).
+        """
+        if not self.win:
+            num_cols = state.get_num_cols()
+            while state.evaluate_board(False) is None:
+                legal_moves = state.legal_moves()
+                if not legal_moves:
+                    return 0  # Draw
+                move = self.choose_center(legal_moves, num_cols)
+                state.do_move(move, current_player)
+                path.append((move, current_player))
+                current_player = state.get_opponent(current_player)
+            return state.evaluate_board(False)
+
+        outcome = state.evaluate_board(False)
+        if outcome is not None:
+            return outcome
+        board = state.get_board()
+        num_rows, num_cols = len(board), state.get_num_cols()
+        windows, windows_by_cell = self.get_line_tables(num_rows, num_cols)
+
+        # Cell contents and column heights, then the disc counts and threats of every window
+        cells = [Globals.Players.O] * (num_rows * num_cols)
+        heights = [0] * num_cols
+        counts = {Globals.Players.R: [0] * len(windows), Globals.Players.Y: [0] * len(windows)}
+        for row_index, row in enumerate(board):
+            height = num_rows - 1 - row_index
+            for col, player in enumerate(row):
+                if player != Globals.Players.O:
+                    cell = col * num_rows + height
+                    cells[cell] = player
+                    if heights[col] <= height:
+                        heights[col] = height + 1
+                    player_counts = counts[player]
+                    for index in windows_by_cell[cell]:
+                        player_counts[index] += 1
+        threats = {Globals.Players.R: set(), Globals.Players.Y: set()}
+        for player, opponent in ((Globals.Players.R, Globals.Players.Y), (Globals.Players.Y, Globals.Players.R)):
+            player_counts, opponent_counts, player_threats = counts[player], counts[opponent], threats[player]
+            for index, window in enumerate(windows):
+                if player_counts[index] == 3 and opponent_counts[index] == 0:
+                    for empty in window:
+                        if cells[empty] == Globals.Players.O:
+                            player_threats.add(empty)
+                            break
+
+        block = self.block
+        center = self.center
+        opponent = state.get_opponent(current_player)
+        while True:
+            legal_moves = state.legal_moves()
+            if not legal_moves:
+                return 0  # Draw
+            own_threats = threats[current_player]
+            move = None
+            for col in legal_moves:
+                if col * num_rows + heights[col] in own_threats:
+                    move = col
+                    break
+            if move is not None:
+                state.do_move(move, current_player)
+                path.append((move, current_player))
+                return 1 if current_player == Globals.Players.Y else -1
+            if block:
+                opponent_threats = threats[opponent]
+                for col in legal_moves:
+                    if col * num_rows + heights[col] in opponent_threats:
+                        move = col
+                        break
+            if move is None:
+                move = self.choose_center(legal_moves, num_cols) if center else random.choice(legal_moves)
+
+            state.do_move(move, current_player)
+            path.append((move, current_player))
+            cell = move * num_rows + heights[move]
+            heights[move] += 1
+            cells[cell] = current_player
+            own_counts = counts[current_player]
+            opponent_counts = counts[opponent]
+            for index in windows_by_cell[cell]:
+                own_counts[index] += 1
+                if own_counts[index] == 3 and opponent_counts[index] == 0:
+                    for empty in windows[index]:
+                        if cells[empty] == Globals.Players.O:
+                            own_threats.add(empty)
+                            break
+            current_player, opponent = opponent, current_player
@@ -0,0 +1,155 @@
+from array import array
+from algorithms import Base, EndgameSolver, OpeningBook, RolloutPool, SearchStats
+from common import GameInterface, Globals, Utils
+import random, time
+
+_worker_searches = {}  # {(algorithm class, simulations, options): instance} kept by each worker process
+
+def run_root_search(task: tuple) -> tuple:
+    """
+    Runs an independent search from the root position in a worker process.
+
+    Args:
+        task (tuple): (algorithm class, simulations, options, seed, game class, board bytes, number of columns, player).
+
+    Returns:
+        tuple: array('d') wins, array('q') visits and array('b') proven values of the root's children, indexed by
+            column, and the SearchStats of the tree.
+    """
+    algorithm_class, simulations, options, seed, game_class, board, num_cols, player = task
+    key = (algorithm_class, simulations, options)
+    algorithm = _worker_searches.get(key)
+    if algorithm is None:
+        algorithm = _worker_searches[key] = algorithm_class(simulations, **dict(options))
+    random.seed(seed)
+
+    algorithm.choose_move(game_class(RolloutPool.decode_board(board, num_cols)), player)
+    wins = array('d', bytes(8 * num_cols))
+    visits = array('q', bytes(8 * num_cols))
+    proven = array('b', bytes(num_cols))  # UNPROVEN is 0
+    for column, (child_wins, child_visits) in algorithm.get_root_statistics().items():
+        wins[column] = child_wins
+        visits[column] = child_visits
+    for column, value in algorithm.get_root_proven().items():
+        proven[column] = value
+    return wins, visits, proven, algorithm.stats
+
+class RootParallel(Base):
+    """
+    Root parallelization of an MCTS algorithm.
+
+    Every worker of a shared RolloutPool builds an independent tree from the position with its own random seed and
+    its share of the simulations. The wins and visits of the root's children are summed per column, and a child proven
+    won, lost or drawn in any tree keeps its proven value. The move is chosen from the merged statistics as the
+    algorithm's best_move would, so the only communication is the position sent and three arrays received per worker.
+    """
+    def __init__(self, algorithm_class, simulations:int=0, workers:int=0, seed:int=None, **options):
+        """
+        Initialize Algorithm
+        Args:
+            algorithm_class: The MCTS class each worker runs.
+            simulations (int, optional): The total number of simulations, split between the workers. Defaults to 0.
+            workers (int, optional): Number of independent trees (worker processes). Defaults to 0 (one per CPU).
+            seed (int, optional): Seed of the generator drawing each tree's seed. Defaults to a random seed.
+            **options: Search options passed to algorithm_class.
+        """
+        super().__init__(simulations, __name__ + "." + self.__class__.__name__ + "." + algorithm_class.__name__)
+        self.algorithm_class = algorithm_class
+        self.solver_threshold = options.get("solver_threshold", EndgameSolver.EMPTY_CELLS)
+        self.solver = EndgameSolver(options.get("solver_nodes", EndgameSolver.MAX_NODES)) if self.solver_threshold > 0 else None
+        options["solver_threshold"] = 0  # The endgame is solved here, once, rather than in every tree
+        book = options.get("opening_book", 0)
+        self.book = OpeningBook.open(OpeningBook.get_path(book)) if book else None
+        options["opening_book"] = 0  # Likewise for the opening book
+        self.options = tuple(sorted(options.items()))
+        self.pool = RolloutPool.get(workers)
+        self.random = random.Random(seed)
+        self.game: GameInterface = None
+        self.statistics = {}  # {column: (wins, visits)} merged from every tree
+        self.proven = {}  # {column: proven value} of the root's children proven in any tree
+        self.completed_simulations = 0  # Simulations run by the last search, summed over the trees
+
+    def choose_move(self, game: GameInterface, player):
+        """
+        Chooses a move for the given game state.
+
+        Args:
+            game (GameInterface): The game interface.
+            player (str): The current player.
+
+        Returns:
+            int: The chosen move (column index), or None if no move is possible.
+        """
+        start_time = time.perf_counter()
+        self.game = game
+        self.stats = SearchStats()
+        move = self.book.lookup(game, player) if self.book is not None else None
+        if move is not None and game.is_valid_move(move):
+            self.statistics = {}
+            self.proven = {}
+            self.completed_simulations = 0
+            self.run_time = self.stats.time = time.perf_counter() - start_time
+            self.stats.source = SearchStats.BOOK
+            return move
+        if self.solver is not None and EndgameSolver.count_empty_cells(game) <= self.solver_threshold:
+            solved = self.solver.solve(game, player)
+            if solved is not None:
+                self.statistics = {}
+                self.proven = {}
+                self.completed_simulations = 0
+                self.run_time = self.stats.time = time.perf_counter() - start_time
+                self.stats.source = SearchStats.SOLVER
+                return solved[0]
+        board = RolloutPool.encode_board(game.get_board())
+        num_cols = game.get_num_cols()
+        workers = self.pool.workers
+        tasks = [(self.algorithm_class, self.simulations // workers + (1 if index < self.simulations % workers else 0),
+                  self.options, self.random.getrandbits(32), type(game), board, num_cols, player) for index in range(workers)]
+
+        wins = [0.0] * num_cols
+        visits = [0] * num_cols
+        self.proven = {}
+        for tree_wins, tree_visits, tree_proven, tree_stats in self.pool.map(run_root_search, tasks):
+            for column in range(num_cols):
+                wins[column] += tree_wins[column]
+                visits[column] += tree_visits[column]
+                if tree_proven[column] != self.algorithm_class.UNPROVEN:
+                    self.proven[column] = tree_proven[column]  # Proofs are exact, so every tree proving it agrees
+            self.stats.add(tree_stats)
+        self.statistics = {column: (wins[column], visits[column]) for column in range(num_cols) if visits[column] > 0}
+        self.completed_simulations = sum(visits)
+        move = self.best_move()
+        self.stats.set_root(self.statistics, num_cols)
+        self.run_time = self.stats.time = time.perf_counter() - start_time
+        Utils.log_message(f"Root parallel search: {workers} trees in {self.run_time:.3f}s", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        return move
+
+    def get_root_statistics(self) -> dict:
+        """Gets the merged statistics of the root's children as {column: (wins, visits)}."""
+        return self.statistics
+
+    def get_root_proven(self) -> dict:
+        """Gets the proven values of the root's children proven in any tree as {column: proven value}."""
+        return self.proven
+
+    def best_move(self):
+        """Selects the column with the highest merged win rate, playing a proven win immediately and a proven loss last."""
+        algorithm_class = self.algorithm_class
+        for column, value in sorted(self.proven.items()):
+            if value == algorithm_class.PROVEN_WIN:
+                return column
+
+        best_move = None
+        best_value = float('-inf')
+        for column, (wins, visits) in sorted(self.statistics.items()):
+            # Below any win rate, so a proven loss is only played when nothing else is left
+            value = -2.0 if self.proven.get(column) == algorithm_class.PROVEN_LOSS else wins / visits
+            Utils.log_message(f"Column {column + 1}: {value:.2f}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+            if value > best_value:
+                best_value = value
+                best_move = column
+
+        if best_move is None:
+            legal_moves = self.game.legal_moves()
+            return random.choice(legal_moves) if legal_moves else None
+        return best_move
@@ -0,0 +1,145 @@
+from collections import defaultdict
+
+class SearchStats():
+    """
+    Statistics of one choose_move, filled in by the algorithm as it searches.
+
+    The phase times are read with perf_counter around each phase of every iteration, which costs well under 1% of an
+    iteration, so they are always collected. Selection excludes the expansion of the leaf it reaches. The parallel
+    searches count the time waiting for the rollout pool as rollout time and do not know the rollout lengths; root
+    and tree parallel searches sum the phases of all their trees or workers.
+    """
+    SEARCH, BOOK, SOLVER = "search", "book", "solver"  # How the move was chosen
+    PHASES = ("selection", "expansion", "rollout", "backpropagation")
+
+    def __init__(self):
+        self.source = self.SEARCH
+        self.time = 0.0  # Wall-clock time of choose_move in seconds
+        self.selection = 0.0
+        self.expansion = 0.0
+        self.rollout = 0.0
+        self.backpropagation = 0.0
+        self.simulations = 0
+        self.nodes = 0  # Nodes allocated by the search
+        self.max_depth = 0  # Deepest node selected, the root being depth 0
+        self.rollouts = 0  # Rollouts whose length is counted in rollout_moves
+        self.rollout_moves = 0
+        self.evictions = 0  # Times the tree evicted subtrees to stay within its node budget
+        self.evicted_nodes = 0
+        self.skipped_expansions = 0  # Leaves rolled out without expansion because the tree was at its node budget
+        self.visits = []  # Visits of the root's child per column (0 for full columns)
+        self.values = []  # Mean reward of the root's child per column (0 for full columns)
+
+    def set_root(self, statistics: dict, num_cols: int) -> None:
+        """Records the root distribution from {column: (wins, visits)}."""
+        self.visits = [0] * num_cols
+        self.values = [0.0] * num_cols
+        for column, (wins, visits) in statistics.items():
+            self.visits[column] = visits
+            self.values[column] = wins / visits if visits else 0.0
+
+    def add(self, other: "SearchStats") -> None:
+        """Adds the phase times, counts and root visits of another search of the same position (a root parallel tree)."""
+        for phase in self.PHASES:
+            setattr(self, phase, getattr(self, phase) + getattr(other, phase))
+        self.simulations += other.simulations
+        self.nodes += other.nodes
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.rollouts += other.rollouts
+        self.rollout_moves += other.rollout_moves
+        self.evictions += other.evictions
+        self.evicted_nodes += other.evicted_nodes
+        self.skipped_expansions += other.skipped_expansions
+
+    def get_simulations_per_second(self) -> float:
+        return self.simulations / self.time if self.time > 0 else 0.0
+
+    def get_average_rollout_length(self) -> float:
+        return self.rollout_moves / self.rollouts if self.rollouts else 0.0
+
+    def to_dict(self) -> dict:
+        """The statistics as a JSON serializable dict."""
+        record = {name: getattr(self, name) for name in ("source", "time") + self.PHASES}
+        record.update(simulations=self.simulations, nodes=self.nodes, max_depth=self.max_depth, rollouts=self.rollouts,
+                      rollout_moves=self.rollout_moves, evictions=self.evictions, evicted_nodes=self.evicted_nodes,
+                      skipped_expansions=self.skipped_expansions, visits=self.visits, values=self.values)
+        return record
+
+class SearchStatsTally():
+    """
+    Sums the SearchStats of many moves per algorithm label and reports where the time of each algorithm goes.
+
+    Totals are plain dicts of sums, so they can be stored with game records and merged back when results are loaded.
+    """
+    SUMS = ("time",) + SearchStats.PHASES + ("simulations", "nodes", "depth", "rollouts", "rollout_moves", "evictions",
+                                            "evicted_nodes", "skipped_expansions")
+
+    def __init__(self):
+        self.totals = defaultdict(self.new_totals)  # {label: totals}
+
+    @staticmethod
+    def new_totals() -> dict:
+        totals = {"moves": 0, SearchStats.SEARCH: 0, SearchStats.BOOK: 0, SearchStats.SOLVER: 0, "max_depth": 0}
+        totals.update((name, 0) for name in SearchStatsTally.SUMS)
+        return totals
+
+    @staticmethod
+    def accumulate(totals: dict, stats: dict) -> None:
+        """
+        Adds the statistics of one move to totals.
+
+        Args:
+            totals (dict): Totals from new_totals.
+            stats (dict): SearchStats.to_dict() of the move, or None for an algorithm without statistics (UR), which
+                only counts the move.
+        """
+        totals["moves"] += 1
+        if stats is None:
+            return
+        totals[stats["source"]] += 1
+        totals["max_depth"] = max(totals["max_depth"], stats["max_depth"])
+        totals["depth"] += stats["max_depth"]
+        for name in SearchStatsTally.SUMS:
+            if name != "depth":
+                totals[name] += stats.get(name, 0)
+
+    def add(self, label: str, stats: dict) -> None:
+        """Adds the statistics of one move (SearchStats.to_dict(), or None) of an algorithm."""
+        self.accumulate(self.totals[label], stats)
+
+    def merge(self, label: str, totals: dict) -> None:
+        """Adds totals (from new_totals and accumulate) of an algorithm."""
+        target = self.totals[label]
+        for name, value in totals.items():
+            target[name] = max(target[name], value) if name == "max_depth" else target[name] + value
+
+    def print_report(self, labels: list, keys: list = None) -> None:
+        """
+        Prints the search statistics of the algorithms that made at least one move.
+
+        Args:
+            labels (list): Names of the algorithms, in the order printed.
+            keys (list, optional): Keys the totals of each algorithm were added under. Defaults to the labels.
+        """
+        print("\nSearch Statistics per Algorithm (moves chosen by a search):")
+        print("-" * 152)
+        print(f"{'Algorithm':<20} {'Moves':>7} {'Search':>7} {'Book':>5} {'Solver':>6} {'Sims/s':>9} {'Select':>7} {'Expand':>7} "
+              f"{'Rollout':>8} {'Backprop':>8} {'Other':>6} {'Nodes/move':>11} {'Avg depth':>9} {'Max depth':>9} {'Rollout len':>11} "
+              f"{'Evictions':>9} {'Capped':>8}")
+        print("-" * 152)
+        for label, key in zip(labels, keys if keys is not None else labels):
+            totals = self.totals.get(key)
+            if not totals or not totals["moves"]:
+                continue
+            searches = totals[SearchStats.SEARCH]
+            phases = [totals[phase] for phase in SearchStats.PHASES]
+            # Root parallel trees sum more phase time than the wall clock, so shares are of the larger of the two
+            total = max(totals["time"], sum(phases))
+            shares = [f"{phase / total:>7.1%}" if total else f"{'-':>7}" for phase in phases + [total - sum(phases)]]
+            print(f"{label:<20} {totals['moves']:>7} {searches:>7} {totals[SearchStats.BOOK]:>5} {totals[SearchStats.SOLVER]:>6} "
+                  f"{totals['simulations'] / totals['time'] if totals['time'] else 0:>9.0f} {shares[0]} {shares[1]} {shares[2]:>8} "
+                  f"{shares[3]:>8} {shares[4]:>6} {totals['nodes'] / searches if searches else 0:>11.0f} "
+                  f"{totals['depth'] / searches if searches else 0:>9.1f} {totals['max_depth']:>9} "
+                  f"{totals['rollout_moves'] / totals['rollouts'] if totals['rollouts'] else 0:>11.1f} "
+                  f"{totals['evictions']:>9} {totals['skipped_expansions']:>8}")
+        print("-" * 152)
@@ -0,0 +1,126 @@
+from multiprocessing import shared_memory
+
+class SharedTree():
+    """
+    MCTS tree stored in a multiprocessing.shared_memory block, so several processes can search the same tree.
+
+    The block holds the arrays of a NodeArena (visits, wins, parent, move, depth, child_count, proven and the
+    fixed-width child table) with a fixed capacity, preceded by one node-allocation counter per region. Node 0 is the
+    root and the other indexes are split into equal regions, one per worker, so every process allocates nodes from
+    its own region by bumping its own counter and no lock is needed. A node is written completely before its index is
+    published in the child slot of its parent.
+
+    Updates of the statistics are read-modify-writes of the shared arrays, so the processes make them while holding a
+    shared lock (see run_tree_search), or concurrent updates of the same node would be lost. Reads are not locked and
+    can see a path midway through an update. When two processes expand the same leaf at once, the later child slots
+    win and the other children are left unreachable, which is rare and only costs a few nodes.
+    """
+    NO_CHILD = -1
+    ROOT = 0
+    TYPECODES = (("counters", 'q'), ("visits", 'q'), ("wins", 'd'), ("parent", 'i'), ("children", 'i'), ("depth", 'h'),
+                 ("move", 'b'), ("child_count", 'b'), ("proven", 'b'))  # Largest items first, so every array is aligned
+
+    def __init__(self, width: int, region_size: int, regions: int, name: str = None):
+        """
+        Creates the shared block, or attaches to an existing one.
+
+        Args:
+            width (int): Number of child slots per node (the number of columns of the game).
+            region_size (int): Number of nodes each region can allocate.
+            regions (int): Number of regions (worker processes allocating nodes).
+            name (str, optional): Name of the block to attach to, created by a SharedTree with the same width, region
+                size and regions. Defaults to creating a new block owned by this instance.
+        """
+        self.width = width
+        self.region_size = max(1, region_size)
+        self.regions = max(1, regions)
+        self.capacity = 1 + self.region_size * self.regions
+        self.region = 0  # Region add_node allocates from
+        lengths = {"counters": self.regions, "children": self.capacity * width}
+        sizes = [(field, typecode, lengths.get(field, self.capacity)) for field, typecode in self.TYPECODES]
+        total = sum(length * self.get_itemsize(typecode) for _, typecode, length in sizes)
+        self.owner = name is None
+        # The workers of a RolloutPool share the resource tracker of the process that started them, so a worker
+        # attaching to the block neither keeps it past the owner nor removes it when the worker exits
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=total if self.owner else 0)
+        self.name = self.memory.name
+        self.views = []
+        offset = 0
+        for field, typecode, length in sizes:
+            size = length * self.get_itemsize(typecode)
+            view = self.memory.buf[offset:offset + size].cast(typecode)
+            self.views.append(view)
+            setattr(self, field, view)
+            offset += size
+        if self.owner:
+            self.reset()
+
+    @staticmethod
+    def get_itemsize(typecode: str) -> int:
+        return {'q': 8, 'd': 8, 'i': 4, 'h': 2, 'b': 1}[typecode]
+
+    @staticmethod
+    def get_bytes_per_node(width: int) -> int:
+        """Returns the number of bytes the arrays take per node."""
+        return 8 + 8 + 4 + 2 + 1 + 1 + 1 + 4 * width
+
+    @property
+    def size(self) -> int:
+        """Number of nodes allocated, the root included."""
+        return 1 + sum(self.counters)
+
+    def reset(self) -> None:
+        """Empties every region and clears the root. Only call it while no other process is searching the tree."""
+        for region in range(self.regions):
+            self.counters[region] = 0
+        self.init_node(self.ROOT, self.NO_CHILD, self.NO_CHILD, 0)
+
+    def init_node(self, index: int, move: int, parent: int, depth: int) -> None:
+        self.visits[index] = 0
+        self.wins[index] = 0.0
+        self.parent[index] = parent
+        self.move[index] = move
+        self.depth[index] = depth
+        self.child_count[index] = 0
+        self.proven[index] = 0
+        base = index * self.width
+        self.children[base:base + self.width] = memoryview(bytes([0xFF]) * (4 * self.width)).cast('i')  # NO_CHILD
+
+    def get_free(self) -> int:
+        """Returns the number of nodes the region of this process can still allocate."""
+        return self.region_size - self.counters[self.region]
+
+    def add_node(self, move: int, parent: int) -> int:
+        """
+        Allocates a node reached by move from parent in the region of this process and returns its index.
+
+        Raises:
+            MemoryError: If the region is full.
+        """
+        used = self.counters[self.region]
+        if used >= self.region_size:
+            raise MemoryError(f"Shared tree region {self.region} is full ({self.region_size} nodes)")
+        index = 1 + self.region * self.region_size + used
+        self.counters[self.region] = used + 1
+        self.init_node(index, move, parent, self.depth[parent] + 1)
+        self.children[parent * self.width + move] = index  # Published once the node is complete
+        self.child_count[parent] += 1
+        return index
+
+    def get_children(self, index: int) -> list:
+        """Returns the (move, child index) pairs of a node."""
+        base = index * self.width
+        children = self.children
+        return [(move, children[base + move]) for move in range(self.width) if children[base + move] != self.NO_CHILD]
+
+    def close(self) -> None:
+        """Detaches from the block, and removes it when this instance created it."""
+        if self.memory is None:
+            return
+        for view in self.views:
+            view.release()
+        self.views = []
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+        self.memory = None
@@ -0,0 +1,142 @@
+from common import GameInterface, Globals
+
+class SolverAborted(Exception):
+    """Raised inside EndgameSolver when a search exceeds its node budget."""
+
+class EndgameSolver():
+    """
+    Exact negamax solver with alpha-beta pruning for positions close to the end of the game.
+
+    Positions are valued from the side to move as 1 (win), 0 (draw) or -1 (loss). The search deepens one ply at a time
+    with moves ordered from the center out, so the shortest forced win is found first, and positions already searched
+    are kept in a transposition table keyed by Zobrist hash. Positions beyond the depth of an iteration count as draws;
+    the result is only exact when the iteration reached every terminal position or proved a win or a loss.
+    """
+    EXACT, LOWER, UPPER = 0, 1, 2  # Kinds of bound stored in the transposition table
+    COMPLETE = 1 << 30  # Depth stored for values that do not depend on the iteration depth
+    EMPTY_CELLS = 12  # Default number of empty cells at or below which the MCTS algorithms switch to the solver
+    MAX_NODES = 200000  # Default node budget of a solve
+
+    def __init__(self, max_nodes: int = MAX_NODES, table_size: int = 1000000):
+        """
+        Initializes the solver.
+
+        Args:
+            max_nodes (int, optional): Positions searched by solve before giving up. Defaults to 200000.
+            table_size (int, optional): Positions kept in the transposition table before it is cleared. Defaults to 1000000.
+        """
+        self.max_nodes = max_nodes
+        self.table_size = table_size
+        self.table = {}  # {(hash, player): (depth, value, bound, move)}
+        self.nodes = 0  # Positions searched by the last solve
+        self.order = None  # Columns from the center out
+
+    @staticmethod
+    def count_empty_cells(game: GameInterface) -> int:
+        """Counts the empty cells of a game board."""
+        return sum(row.count(Globals.Players.O) for row in game.get_board())
+
+    def solve(self, game: GameInterface, player: str) -> tuple:
+        """
+        Solves the position of game with player to move.
+
+        Args:
+            game (GameInterface): The game, left unchanged.
+            player (str): The player to move.
+
+        Returns:
+            tuple: The best move and its value for player (1 win, 0 draw, -1 loss), or None when the node budget ran
+                out first or no move is possible.
+        """
+        self.nodes = 0
+        if len(self.table) > self.table_size:
+            self.table.clear()
+        num_cols = game.get_num_cols()
+        center = (num_cols - 1) / 2
+        self.order = sorted(range(num_cols), key=lambda column: abs(column - center))
+        if game.evaluate_board(False) is not None or not game.legal_moves():
+            return None
+
+        try:
+            for depth in range(1, self.count_empty_cells(game) + 1):
+                move, value, complete = self.search_root(game, player, depth)
+                if value != 0 or complete:
+                    return move, value
+        except SolverAborted:
+            pass  # Every move was undone on the way out
+        return None
+
+    def search_root(self, game: GameInterface, player: str, depth: int) -> tuple:
+        """Searches every move of the root to the given depth, returning the best move, its value and completeness."""
+        best_move = None
+        best_value = -2
+        complete = True
+        opponent = game.get_opponent(player)
+        for column in self.order:
+            if not game.is_valid_move(column):
+                continue
+            game.do_move(column, player)
+            try:
+                value, child_complete = self.negamax(game, opponent, depth - 1, -1, -best_value if best_value > -1 else 1)
+            finally:
+                game.undo_move()
+            value = -value
+            complete = complete and child_complete
+            if value > best_value:
+                best_value = value
+                best_move = column
+                if value == 1:
+                    return best_move, best_value, True
+        return best_move, best_value, complete
+
+    def negamax(self, game: GameInterface, player: str, depth: int, alpha: int, beta: int) -> tuple:
+        """
+        Values the position of game for player, the player to move.
+
+        Returns:
+            tuple: The value, bounded by the (alpha, beta) window, and whether it holds at any depth.
+        """
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise SolverAborted()
+
+        outcome = game.evaluate_board(False)
+        if outcome is not None:
+            # The last move was the opponent's, so a decided game is a loss for player
+            return (0 if outcome == 0 else -1), True
+        if depth == 0:
+            return 0, False
+
+        key = (game.get_hash(), player)
+        entry = self.table.get(key)
+        if entry is not None and entry[0] >= depth:
+            _, value, bound, _ = entry
+            if bound == self.EXACT or (bound == self.LOWER and value >= beta) or (bound == self.UPPER and value <= alpha):
+                return value, entry[0] == self.COMPLETE
+
+        original_alpha = alpha
+        best_value = -2
+        best_move = None
+        complete = True
+        opponent = game.get_opponent(player)
+        for column in self.order:
+            if not game.is_valid_move(column):
+                continue
+            game.do_move(column, player)
+            try:
+                value, child_complete = self.negamax(game, opponent, depth - 1, -beta, -alpha)
+            finally:
+                game.undo_move()
+            value = -value
+            complete = complete and child_complete
+            if value > best_value:
+                best_value = value
+                best_move = column
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        bound = self.UPPER if best_value <= original_alpha else self.LOWER if best_value >= beta else self.EXACT
+        self.table[key] = (self.COMPLETE if complete else depth, best_value, bound, best_move)
+        return best_value, complete
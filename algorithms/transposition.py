@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from algorithms import Node
+from common import GameInterface
+
+class TranspositionTable():
+    """
+    Bounded map from a position hash to the search Node holding that position's statistics.
+
+    Sharing nodes through the table turns the MCTS tree into a DAG: every move order that
+    reaches the same position updates the same visits and wins. When the table is full, the
+    least recently used entry is replaced. An evicted node stays in the tree, it just stops
+    being shared with positions found afterwards.
+
+    When mirror is enabled, a position and its left-right mirror share one entry. Each entry
+    remembers the hash the node was stored with, so lookups can tell whether the node's
+    children are keyed by mirrored columns relative to the position being looked up.
+    """
+    def __init__(self, capacity: int, mirror: bool = False):
+        """
+        Initializes the table.
+
+        Args:
+            capacity (int): Maximum number of positions kept.
+            mirror (bool, optional): Merge left-right mirror positions. Defaults to False.
+        """
+        self.capacity = capacity
+        self.mirror = mirror
+        self.entries = OrderedDict()  # {key: (node, stored_hash)}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_key(self, state: GameInterface):
+        """Returns the table key and the actual hash of the state."""
+        position_hash = state.get_hash()
+        if self.mirror:
+            return min(position_hash, state.get_hash(mirror=True)), position_hash
+        return position_hash, position_hash
+
+    def lookup(self, state: GameInterface):
+        """
+        Looks up the node stored for the position of the state.
+
+        Returns:
+            tuple: (node, mirrored) where mirrored is True when the node was stored for the
+                   mirror of the position, or (None, False) when the position is not stored.
+        """
+        key, position_hash = self.get_key(state)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+        self.entries.move_to_end(key)
+        self.hits += 1
+        node, stored_hash = entry
+        return node, stored_hash != position_hash
+
+    def store(self, state: GameInterface, node: Node) -> None:
+        """Stores the node for the position of the state, replacing the least recently used entry when full."""
+        key, position_hash = self.get_key(state)
+        if key not in self.entries and len(self.entries) >= self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.entries[key] = (node, position_hash)
+        self.entries.move_to_end(key)
+
+    def retain(self, node_ids: set) -> None:
+        """Removes the entries whose node is not in node_ids."""
+        for key in [key for key, (node, _) in self.entries.items() if id(node) not in node_ids]:
+            del self.entries[key]
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,232 @@
+from multiprocessing import util
+from algorithms import Base, EndgameSolver, OpeningBook, RolloutPool, SearchStats, SharedTree
+from common import GameInterface, Globals, Utils
+import random, time
+
+_worker_searches = {}  # {(algorithm class, options): instance} kept by each worker process
+_worker_tree = None  # SharedTree the worker process is attached to
+
+def run_tree_search(task: tuple) -> tuple:
+    """
+    Runs select, expand, rollout and backpropagation iterations on a shared tree in a worker process.
+
+    Every iteration adds virtual_loss lost visits along its path while its rollout runs, so the other workers spread
+    over different branches, and replaces them with the real outcome when it backpropagates. The statistics are only
+    updated while holding the lock of the pool, so no update of another worker is lost.
+
+    Args:
+        task (tuple): (algorithm class, options, seed, game class, board bytes, number of columns, player, tree name,
+            region size, regions, region, simulations, virtual loss).
+
+    Returns:
+        tuple: The simulations run and the SearchStats of the worker.
+    """
+    global _worker_tree
+    (algorithm_class, options, seed, game_class, board, num_cols, player, name, region_size, regions, region,
+     simulations, virtual_loss) = task
+    algorithm = _worker_searches.get((algorithm_class, options))
+    if algorithm is None:
+        algorithm = _worker_searches[(algorithm_class, options)] = algorithm_class(simulations, **dict(options))
+    if _worker_tree is None or _worker_tree.name != name:
+        if _worker_tree is not None:
+            _worker_tree.close()
+        _worker_tree = SharedTree(num_cols, region_size, regions, name)
+    tree = _worker_tree
+    tree.region = region
+    lock = RolloutPool.get_worker_lock()
+    random.seed(seed)
+
+    algorithm.game = game_class(RolloutPool.decode_board(board, num_cols))
+    algorithm.current_player = player
+    algorithm.arena = tree
+    algorithm.root = SharedTree.ROOT
+    algorithm.stats = stats = SearchStats()
+    algorithm.trace = Utils.is_enabled(Globals.VerbosityLevels.VERBOSE, algorithm.logger_source)
+    algorithm.node_count = 0
+    algorithm.tree_budget = tree.get_free()  # Expansions stop once the region of this worker is full
+    algorithm.tree_size = 0
+    algorithm.search_simulations = simulations if simulations > 0 else float('inf')
+    algorithm.deadline = time.perf_counter() + algorithm.time_limit / 1000 if algorithm.time_limit else None
+
+    start_time = time.perf_counter()
+    completed = 0
+    iterations = 0
+    while not algorithm.budget_exhausted(completed, iterations):
+        path = []
+        selection_start = time.perf_counter()
+        node, state = algorithm.select_child(player, path)
+        rollout_start = time.perf_counter()
+        node_path = algorithm.node_path
+        stats.max_depth = max(stats.max_depth, len(node_path) - 1)
+        proven = algorithm.get_proven(node)
+        playouts = 1
+        pending = virtual_loss if proven == algorithm.UNPROVEN else 0  # Virtual losses on the path during the rollout
+        if proven != algorithm.UNPROVEN:
+            outcome = algorithm.get_proven_outcome(proven, path)
+        else:
+            if pending:
+                with lock:
+                    algorithm.apply_virtual_loss(node_path, pending)
+            if algorithm.batch_playout is None:
+                selected = len(path)
+                outcome = algorithm.rollout(state, algorithm.get_leaf_player(path), path)
+                stats.rollouts += 1
+                stats.rollout_moves += len(path) - selected
+            else:
+                playouts = min(algorithm.leaf_playouts, algorithm.search_simulations - completed)
+                outcome = int(sum(algorithm.batch_playout.run_repeated(state, algorithm.get_leaf_player(path), playouts)))
+        backpropagation_start = time.perf_counter()
+        with lock:
+            # Read-modify-writes of the shared arrays, which would lose the concurrent updates of other workers
+            if pending:
+                algorithm.apply_virtual_loss(node_path, -pending)
+            algorithm.backpropagation(node, outcome, node_path, playouts)
+        completed += playouts
+        stats.selection += rollout_start - selection_start
+        stats.rollout += backpropagation_start - rollout_start
+        stats.backpropagation += time.perf_counter() - backpropagation_start
+        for _ in path:
+            state.undo_move()
+        iterations += 1
+
+    stats.simulations = completed
+    stats.nodes = algorithm.node_count
+    stats.time = time.perf_counter() - start_time
+    algorithm.arena = None  # The tree is only valid during the task
+    return completed, stats
+
+class TreeParallel(Base):
+    """
+    Tree parallelization of an MCTS algorithm over a SharedTree.
+
+    Every worker of a shared RolloutPool runs complete iterations of the algorithm (selection, expansion, rollout and
+    backpropagation) on the same tree, kept in shared memory, so the workers build one tree together instead of one
+    each as in RootParallel, and only the position and the per-worker statistics are sent through the pool. The move
+    is chosen from the root of the shared tree by the algorithm's best_move, which plays proven wins.
+    """
+    DEFAULT_CAPACITY = 1 << 19  # Nodes of the tree when the search is bounded by time alone
+
+    def __init__(self, algorithm_class, simulations:int=0, workers:int=0, seed:int=None, virtual_loss:int=1, **options):
+        """
+        Initialize Algorithm
+        Args:
+            algorithm_class: The MCTS class each worker runs.
+            simulations (int, optional): The total number of simulations, split between the workers. Defaults to 0.
+            workers (int, optional): Number of worker processes searching the tree. Defaults to 0 (one per CPU).
+            seed (int, optional): Seed of the generator drawing each worker's seed. Defaults to a random seed.
+            virtual_loss (int, optional): Number of lost visits added along the path of every rollout in progress.
+                Defaults to 1, 0 disables it.
+            **options: Search options passed to algorithm_class. The workers search with the arena tree store.
+
+        Raises:
+            ValueError: If virtual_loss is negative.
+        """
+        super().__init__(simulations, __name__ + "." + self.__class__.__name__ + "." + algorithm_class.__name__)
+        if virtual_loss < 0:
+            raise ValueError(f"Invalid virtual loss: {virtual_loss}")
+        self.algorithm_class = algorithm_class
+        self.virtual_loss = virtual_loss
+        self.solver_threshold = options.get("solver_threshold", EndgameSolver.EMPTY_CELLS)
+        self.solver = EndgameSolver(options.get("solver_nodes", EndgameSolver.MAX_NODES)) if self.solver_threshold > 0 else None
+        options["solver_threshold"] = 0  # The endgame is solved here, once, rather than in every worker
+        book = options.get("opening_book", 0)
+        self.book = OpeningBook.open(OpeningBook.get_path(book)) if book else None
+        options["opening_book"] = 0  # Likewise for the opening book
+        options["tree_store"] = "arena"
+        self.algorithm = algorithm_class(simulations, **options)  # Reads the root of the shared tree to choose the move
+        self.options = tuple(sorted(options.items()))
+        self.pool = RolloutPool.get(workers)
+        self.random = random.Random(seed)
+        self.game: GameInterface = None
+        self.tree: SharedTree = None
+        self.statistics = {}  # {column: (wins, visits)} of the root's children in the shared tree
+        self.completed_simulations = 0  # Simulations run by the last search, summed over the workers
+
+    def get_tree(self, num_cols: int) -> SharedTree:
+        """Gets an empty shared tree large enough for the next search, reusing the block of the last one when it fits."""
+        workers = self.pool.workers
+        if self.simulations > 0:
+            region_size = -(-self.simulations // workers) * num_cols
+        else:
+            region_size = -(-self.DEFAULT_CAPACITY // workers)
+        budget = self.algorithm.get_node_budget(num_cols)
+        if budget:
+            region_size = min(region_size, -(-budget // workers))
+        tree = self.tree
+        if tree is not None and tree.width == num_cols and tree.regions == workers and tree.region_size >= region_size:
+            tree.reset()
+            return tree
+        if tree is not None:
+            tree.close()
+        self.tree = SharedTree(num_cols, region_size, workers)
+        util.Finalize(self, self.tree.close, exitpriority=10)  # Removes the block even when the process exits first
+        return self.tree
+
+    def choose_move(self, game: GameInterface, player):
+        """
+        Chooses a move for the given game state.
+
+        Args:
+            game (GameInterface): The game interface.
+            player (str): The current player.
+
+        Returns:
+            int: The chosen move (column index), or None if no move is possible.
+        """
+        start_time = time.perf_counter()
+        self.game = game
+        self.stats = SearchStats()
+        move = self.book.lookup(game, player) if self.book is not None else None
+        if move is not None and game.is_valid_move(move):
+            self.statistics = {}
+            self.completed_simulations = 0
+            self.run_time = self.stats.time = time.perf_counter() - start_time
+            self.stats.source = SearchStats.BOOK
+            return move
+        if self.solver is not None and EndgameSolver.count_empty_cells(game) <= self.solver_threshold:
+            solved = self.solver.solve(game, player)
+            if solved is not None:
+                self.statistics = {}
+                self.completed_simulations = 0
+                self.run_time = self.stats.time = time.perf_counter() - start_time
+                self.stats.source = SearchStats.SOLVER
+                return solved[0]
+        num_cols = game.get_num_cols()
+        tree = self.get_tree(num_cols)
+        legal_moves = game.legal_moves()
+        tree.region = 0
+        if game.evaluate_board(False) is None and tree.get_free() >= len(legal_moves):
+            # Expanded here, so the workers do not all expand the root at once when they start
+            for column in legal_moves:
+                tree.add_node(column, SharedTree.ROOT)
+            self.stats.nodes += len(legal_moves)
+        board = RolloutPool.encode_board(game.get_board())
+        workers = self.pool.workers
+        tasks = [(self.algorithm_class, self.options, self.random.getrandbits(32), type(game), board, num_cols, player,
+                  tree.name, tree.region_size, workers, index,
+                  self.simulations // workers + (1 if index < self.simulations % workers else 0), self.virtual_loss)
+                 for index in range(workers)]
+
+        self.completed_simulations = 0
+        for simulations, worker_stats in self.pool.map(run_tree_search, tasks):
+            self.completed_simulations += simulations
+            self.stats.add(worker_stats)
+
+        algorithm = self.algorithm
+        algorithm.game = game
+        algorithm.arena = tree
+        algorithm.root = SharedTree.ROOT
+        try:
+            self.statistics = algorithm.get_root_statistics()
+            move = algorithm.best_move()
+        finally:
+            algorithm.arena = None
+        self.stats.set_root(self.statistics, num_cols)
+        self.run_time = self.stats.time = time.perf_counter() - start_time
+        Utils.log_message(f"Tree parallel search: {workers} workers, {self.completed_simulations} simulations, {tree.size} nodes "
+                          f"in {self.run_time:.3f}s", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        return move
+
+    def get_root_statistics(self) -> dict:
+        """Gets the statistics of the root's children in the shared tree as {column: (wins, visits)}."""
+        return self.statistics
@@ -4,8 +4,8 @@ import random
 import math
 
 class UCTDepth(MCTS):
-    def __init__(self, simulations:int=0):
-        super().__init__(simulations, __name__ + "." + self.__class__.__name__)
+    def __init__(self, simulations:int=0, **kwargs):
+        super().__init__(simulations, __name__ + "." + self.__class__.__name__, **kwargs)
 
     def choose_move(self, game: GameInterface, player):
         return super().choose_move(game, player)
@@ -13,11 +13,11 @@ class UCTDepth(MCTS):
     def search(self):
         super().search()
 
-    def backpropagation(self, node: Node, outcome: int) -> None:
-        super().backpropagation(node, outcome)
+    def backpropagation(self, node: Node, outcome: int, node_path: list = None, playouts: int = 1) -> None:
+        super().backpropagation(node, outcome, node_path, playouts)
 
-    def expansion(self, parent: Node, state: GameInterface) -> bool:
-        return super().expansion(parent, state)
+    def expansion(self, parent: Node, state: GameInterface, player: str = None, flipped: bool = False) -> bool:
+        return super().expansion(parent, state, player, flipped)
 
     def best_move(self, root=None):
         return super().best_move(root)
@@ -25,80 +25,57 @@ class UCTDepth(MCTS):
 
     def select_child(self, current_player: str, path: list) -> tuple:
         """Selects a node to expand (using UCT)."""
-        node: Node = self.root
-        state: GameInterface = self.game
-        Utils.log_message(f"select_child: Starting at node ID {id(node)}", Globals.VerbosityLevels.NONE, self.logger_source)
-        
-        while node.children:
-            children = list(node.children.values())
-            best_value = float('-inf')
-            best_child = None
-                        
-            for child in children:
-                if child.visits == 0:
-                    uct_value = float('inf')
-                else:
-                    c = 1
-                    alpha = 0.4
-                    depth_bonus = alpha / (1 + child.depth)
-                    uct_value = (child.wins / child.visits) + c * math.sqrt(math.log(node.visits) / child.visits) + depth_bonus
-
-                if uct_value > best_value:
-                    best_value = uct_value
-                    best_child = child
-                        
-            node = best_child
-            Utils.log_message(f"select_child: Selected child node ID {id(node)}, move: {node.move}, visits: {node.visits}, wins: {node.wins}", Globals.VerbosityLevels.NONE, self.logger_source)
-            Utils.log_message(f"wi: {node.wins}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            Utils.log_message(f"ni: {node.visits}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            Utils.log_message(f"Move selected: {node.move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            try:
-                state.do_move(node.move, current_player)
-                path.append((node.move, current_player))
-            except ValueError:
-                Utils.log_message(f"select_child: ValueError, returning node ID {id(node)}", Globals.VerbosityLevels.NONE, self.logger_source)
-                return node, state
-            
-            current_player = self.game.get_opponent(current_player)  # Update player
-        
-        if self.expansion(node, state):
-            node = random.choice(list(node.children.values()))
-            Utils.log_message(f"select_child: Expanded, selected random child ID {id(node)}, move: {node.move}", Globals.VerbosityLevels.NONE, self.logger_source)
-            
-            try:
-                state.do_move(node.move, current_player)
-                path.append((node.move, current_player))
-            except ValueError:
-                Utils.log_message(f"select_child: ValueError after expansion, returning node ID {id(node)}", Globals.VerbosityLevels.NONE, self.logger_source)
-                return node, state
-        
-        Utils.log_message(f"select_child: Returning node ID {id(node)}", Globals.VerbosityLevels.NONE, self.logger_source)
+        if self.trace:
+            Utils.log_message(f"select_child: Starting at node ID {id(self.root)}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        node, state = super().select_child(current_player, path)
+        if self.trace:
+            Utils.log_message(f"select_child: Returning node ID {id(node)}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
         return node, state
 
+    def pick_child(self, node: Node) -> tuple:
+        """Picks the child with the highest UCT value."""
+        move, child = super().pick_child(node)
+        if self.trace:
+            Utils.log_message(f"select_child: Selected child node ID {id(child)}, move: {move}, visits: {child.visits}, wins: {child.wins}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        return move, child
+
+    def uct_value(self, wins: float, visits: int, parent_visits: int, move: int, depth: int) -> float:
+        """Computes the UCB1 value of a visited child plus a bonus favoring shallow nodes."""
+        c = 1
+        alpha = 0.4
+        depth_bonus = alpha / (1 + depth)
+        return (wins / visits) + c * math.sqrt(math.log(parent_visits) / visits) + depth_bonus
 
     def rollout(self, state: GameInterface, current_player:str, path: list) -> int:
         """Performs a rollout from the given state (randomly)."""
-        Utils.log_message(f"rollout: Starting rollout from state",Globals.VerbosityLevels.NONE, self.logger_source)
+        if self.policy is not None:
+            return self.policy.play(state, current_player, path)
+        trace = self.trace
+        if trace:
+            Utils.log_message(f"rollout: Starting rollout from state",Globals.VerbosityLevels.VERBOSE, self.logger_source)
         
         while state.evaluate_board(False) is None:
-            legal_moves = [move for move in range(state.get_num_cols()) if state.is_valid_move(move)]
+            legal_moves = state.legal_moves()
             if not legal_moves:
-                Utils.log_message(f"rollout: Draw",Globals.VerbosityLevels.NONE, self.logger_source)
+                if trace:
+                    Utils.log_message(f"rollout: Draw",Globals.VerbosityLevels.VERBOSE, self.logger_source)
                 return 0  # Draw
             move = random.choice(legal_moves)
 
-            Utils.log_message(f"Move selected: {move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-
-            Utils.log_message(f"rollout: Selected random move: {move}, player: {current_player}",Globals.VerbosityLevels.NONE, self.logger_source)
+            if trace:
+                Utils.log_message(f"Move selected: {move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                Utils.log_message(f"rollout: Selected random move: {move}, player: {current_player}",Globals.VerbosityLevels.VERBOSE, self.logger_source)
             try:
                 state.do_move(move, current_player)
                 path.append((move, current_player))
             except ValueError:
-                Utils.log_message("rollout: Invalid move in rollout",Globals.VerbosityLevels.NONE, self.logger_source)
+                if trace:
+                    Utils.log_message("rollout: Invalid move in rollout",Globals.VerbosityLevels.VERBOSE, self.logger_source)
                 return 0  # Invalid move
             current_player = state.get_opponent(current_player)  # Update player
 
         result = state.evaluate_board(False)
-        Utils.log_message(f"TERMINAL NODE VALUE: {result}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-        Utils.log_message(f"rollout: Rollout ended with result: {result}",Globals.VerbosityLevels.NONE, self.logger_source)
+        if trace:
+            Utils.log_message(f"TERMINAL NODE VALUE: {result}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+            Utils.log_message(f"rollout: Rollout ended with result: {result}",Globals.VerbosityLevels.VERBOSE, self.logger_source)
         return result
\ No newline at end of file
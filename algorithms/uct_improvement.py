@@ -4,8 +4,8 @@ import random
 import math
 
 class UCTImprovement(MCTS):
-    def __init__(self, simulations:int=0):
-        super().__init__(simulations, __name__ + "." + self.__class__.__name__)
+    def __init__(self, simulations:int=0, **kwargs):
+        super().__init__(simulations, __name__ + "." + self.__class__.__name__, **kwargs)
 
     def choose_move(self, game: GameInterface, player):
         return super().choose_move(game, player)
@@ -13,11 +13,11 @@ class UCTImprovement(MCTS):
     def search(self):
         super().search()
 
-    def backpropagation(self, node: Node, outcome: int) -> None:
-        super().backpropagation(node, outcome)
+    def backpropagation(self, node: Node, outcome: int, node_path: list = None, playouts: int = 1) -> None:
+        super().backpropagation(node, outcome, node_path, playouts)
 
-    def expansion(self, parent: Node, state: GameInterface) -> bool:
-        return super().expansion(parent, state)
+    def expansion(self, parent: Node, state: GameInterface, player: str = None, flipped: bool = False) -> bool:
+        return super().expansion(parent, state, player, flipped)
 
     def best_move(self, root=None):
         return super().best_move(root)
@@ -28,68 +28,26 @@ class UCTImprovement(MCTS):
         center = num_columns // 2
         return 1.0 - (abs(center - col) / center)
     
-    def select_child(self, current_player: str, path: list) -> tuple:
-        """Selects a node to expand (using UCT)."""
-        node: Node = self.root
-        state: GameInterface = self.game
-        
-        while node.children:
-            children = list(node.children.values())
-            best_value = float('-inf')
-            best_child = None
-            child_counter = 1
-                        
-            for child in children:
-                if child.visits == 0:
-                    uct_value = float('inf')
-                else:
-                    c = 1
-                    bias = self.get_column_bias(child.move)
-                    k = 0.5  # 
-                    uct_value = (child.wins / child.visits) + c * math.sqrt(math.log(node.visits) / child.visits) + (k * bias / (child.visits + 1))
-
-                if uct_value > best_value:
-                    best_value = uct_value
-                    best_child = child
-
-                Utils.log_message(f"V{child_counter}: {uct_value:.2f} (wins={child.wins}, visits={child.visits})", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-                child_counter += 1  # Increment the counter
-                        
-            Utils.log_message(f"Best V#: {best_value:.2f}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            node = best_child
-            Utils.log_message(f"wi: {node.wins}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            Utils.log_message(f"ni: {node.visits}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            Utils.log_message(f"Move selected: {node.move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
-            try:
-                state.do_move(node.move, current_player)
-                path.append((node.move, current_player))
-            except ValueError:
-                return node, state
-            
-            current_player = self.game.get_opponent(current_player)  # Update player
-        
-        if self.expansion(node, state):
-            node = random.choice(list(node.children.values()))
-            
-            try:
-                state.do_move(node.move, current_player)
-                path.append((node.move, current_player))
-            except ValueError:
-                return node, state
-        
-        return node, state
-
+    def uct_value(self, wins: float, visits: int, parent_visits: int, move: int, depth: int) -> float:
+        """Computes the UCB1 value of a visited child plus a bias towards the center columns."""
+        c = 1
+        bias = self.get_column_bias(move)
+        k = 0.5  # 
+        return (wins / visits) + c * math.sqrt(math.log(parent_visits) / visits) + (k * bias / (visits + 1))
 
     def rollout(self, state: GameInterface, current_player:str, path: list) -> int:
         """Performs a rollout from the given state (randomly)."""
+        if self.policy is not None:
+            return self.policy.play(state, current_player, path)
         
         while state.evaluate_board(False) is None:
-            legal_moves = [move for move in range(state.get_num_cols()) if state.is_valid_move(move)]
+            legal_moves = state.legal_moves()
             if not legal_moves:
                 return 0  # Draw
             move = random.choice(legal_moves)
 
-            Utils.log_message(f"Move selected: {move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+            if self.trace:
+                Utils.log_message(f"Move selected: {move + 1}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
 
             try:
                 state.do_move(move, current_player)
@@ -99,5 +57,6 @@ class UCTImprovement(MCTS):
             current_player = state.get_opponent(current_player)  # Update player
 
         result = state.evaluate_board(False)
-        Utils.log_message(f"TERMINAL NODE VALUE: {result}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+        if self.trace:
+            Utils.log_message(f"TERMINAL NODE VALUE: {result}", Globals.VerbosityLevels.VERBOSE, self.logger_source)
         return result
\ No newline at end of file
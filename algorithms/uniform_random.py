@@ -18,8 +18,7 @@ class UniformRandom(Base):
         Returns:
             int: The chosen move (column index), or None if no move is possible.
         """
-        num_cols = game.get_num_cols()
-        legal_moves = [col for col in range(num_cols) if game.is_valid_move(col)]
+        legal_moves = game.legal_moves()
         if not legal_moves:
             return None
         move = random.choice(legal_moves)
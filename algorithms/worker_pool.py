@@ -0,0 +1,172 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from multiprocessing import resource_tracker, util
+import multiprocessing
+from common import Globals, LogQueue
+import os, random
+
+_worker_algorithms = {}  # {(algorithm class, rollout policy): instance} kept by each worker process
+_worker_game = None  # (game class, board bytes, game) of the last task a worker ran
+_worker_lock = None  # Lock of the pool the worker belongs to
+
+def _init_worker(lock=None, log_initializer=None, log_initargs: tuple = ()) -> None:
+    """
+    Reseeds the random generator of a new worker, since forked workers inherit the parent's state, keeps the lock of
+    its pool and attaches it to the logging pipeline of the parent when there is one.
+    """
+    global _worker_lock
+    _worker_lock = lock
+    random.seed()
+    if log_initializer is not None:
+        log_initializer(*log_initargs)
+
+def _warm_up(_) -> int:
+    """No-op task used to start every worker before the first search."""
+    return os.getpid()
+
+def run_rollouts(task: tuple) -> tuple:
+    """
+    Runs the rollouts of a chunk of leaves in a worker process.
+
+    Args:
+        task (tuple): (algorithm class, rollout policy, game class, board bytes, number of columns, player, leaf ids,
+            leaf moves) where
+            the board is the root position as one byte per cell, the leaf ids an array('l') and each entry of the leaf
+            moves the columns (as bytes) played from the root to reach the leaf.
+
+    Returns:
+        tuple: The leaf ids and an array('b') with the outcome of each rollout.
+    """
+    global _worker_game
+    algorithm_class, rollout_policy, game_class, board, num_cols, player, leaf_ids, leaf_moves = task
+
+    algorithm = _worker_algorithms.get((algorithm_class, rollout_policy))
+    if algorithm is None:
+        algorithm = _worker_algorithms[(algorithm_class, rollout_policy)] = algorithm_class(rollout_policy=rollout_policy)
+    if _worker_game is None or _worker_game[0] is not game_class or _worker_game[1] != board:
+        _worker_game = (game_class, board, game_class(RolloutPool.decode_board(board, num_cols)))
+    game = _worker_game[2]
+
+    outcomes = array('b')
+    for moves in leaf_moves:
+        current_player = player
+        for column in moves:
+            game.do_move(column, current_player)
+            current_player = game.get_opponent(current_player)
+        path = []
+        outcome = algorithm.rollout(game, current_player, path)
+        outcomes.append(outcome if outcome is not None else 0)
+        for _ in range(len(path) + len(moves)):
+            game.undo_move()
+    return leaf_ids, outcomes
+
+class RolloutPool():
+    """
+    Long-lived pool of worker processes running rollouts (and whole searches) for the parallel MCTS algorithms.
+
+    Pools are shared per number of workers across algorithm instances, moves and games, and every worker is started
+    when the pool is created, so process start-up stays off the critical path of choose_move. A search sends the root
+    position once per chunk as board bytes plus, for each leaf, the columns played to reach it, and gets back arrays
+    of (leaf id, outcome). The bytes of those payloads are counted in ipc_bytes.
+    """
+    _pools = {}  # {workers: RolloutPool}
+
+    def __init__(self, workers: int):
+        """
+        Starts the worker processes.
+
+        Args:
+            workers (int): Number of worker processes.
+        """
+        self.workers = workers
+        if os.name == "posix":
+            # Started before the workers so they inherit it, as the shared memory of a SharedTree needs
+            resource_tracker.ensure_running()
+        # Shared by the workers, which can only receive a lock when they start, to update the statistics of a SharedTree
+        self.lock = multiprocessing.Lock()
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(self.lock, *LogQueue.get_worker_initializer()))
+        list(self.executor.map(_warm_up, range(workers)))
+        self.ipc_bytes = 0
+        # When the pool lives in a worker process (e.g. of a tournament), that process joins its children on exit,
+        # which waits forever unless the pool is shut down first
+        util.Finalize(self, self.executor.shutdown, exitpriority=10)
+
+    @staticmethod
+    def get(workers: int = 0) -> "RolloutPool":
+        """
+        Gets the shared pool with the given number of workers, creating it on first use.
+
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to 0 (one per CPU).
+        """
+        workers = workers if workers > 0 else (os.cpu_count() or 1)
+        pool = RolloutPool._pools.get(workers)
+        if pool is None:
+            pool = RolloutPool._pools[workers] = RolloutPool(workers)
+        return pool
+
+    @staticmethod
+    def encode_board(board: list) -> bytes:
+        """Encodes a board (list of row strings) as one byte per cell."""
+        return "".join(board).encode()
+
+    @staticmethod
+    def decode_board(board: bytes, num_cols: int) -> list:
+        """Decodes a board encoded by encode_board back into a list of row strings."""
+        text = board.decode()
+        return [text[index:index + num_cols] for index in range(0, len(text), num_cols)]
+
+    def map(self, function, tasks: list) -> list:
+        """
+        Runs function on every task in the workers and returns the results in order.
+
+        Every task finishes before the error of a failed one is raised, so none of them is still running on the inputs
+        of the caller (such as a SharedTree) when it goes on.
+        """
+        futures = [self.executor.submit(function, task) for task in tasks]
+        wait(futures)
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def get_worker_lock():
+        """Gets the lock of the pool the calling worker process belongs to, None outside of a pool worker."""
+        return _worker_lock
+
+    def run(self, algorithm_class, game, player: str, leaves: list, rollout_policy: str = "uniform"):
+        """
+        Runs one rollout per leaf, split in one chunk per worker, yielding the outcomes of each chunk as soon as it
+        completes.
+
+        Args:
+            algorithm_class: Class whose rollout the workers run.
+            game (GameInterface): The game positioned at the root.
+            player (str): The player to move at the root. Each rollout starts with the player to move at its leaf.
+            leaves (list[tuple]): (leaf id, moves) pairs, where moves are the columns played from the root.
+            rollout_policy (str, optional): The RolloutPolicy of the rollouts. Defaults to "uniform".
+
+        Yields:
+            tuple: The (leaf id, outcome) pairs, in no particular order.
+        """
+        if not leaves:
+            return
+        board = self.encode_board(game.get_board())
+        num_cols = game.get_num_cols()
+        chunk_size = -(-len(leaves) // self.workers)
+        futures = []
+        for start in range(0, len(leaves), chunk_size):
+            chunk = leaves[start:start + chunk_size]
+            leaf_ids = array('l', [leaf_id for leaf_id, _ in chunk])
+            leaf_moves = [bytes(moves) for _, moves in chunk]
+            self.ipc_bytes += len(board) + leaf_ids.itemsize * len(leaf_ids) + sum(len(moves) for moves in leaf_moves)
+            futures.append(self.executor.submit(run_rollouts, (algorithm_class, rollout_policy, type(game), board, num_cols, player, leaf_ids, leaf_moves)))
+
+        for future in as_completed(futures):
+            leaf_ids, outcomes = future.result()
+            self.ipc_bytes += leaf_ids.itemsize * len(leaf_ids) + outcomes.itemsize * len(outcomes)
+            yield from zip(leaf_ids, outcomes)
+
+    def shutdown(self) -> None:
+        """Stops the worker processes and forgets the pool."""
+        self.executor.shutdown()
+        RolloutPool._pools.pop(self.workers, None)
@@ -0,0 +1,73 @@
+import argparse, random, sys, time, traceback
+from common import EloRatings, Globals, Utils
+from game_factory import GameFactory
+from algorithms import AlgorithmFactory
+
+def play_match(candidate, reference, games: int, game_name: str, seed: int) -> tuple:
+    """
+    Plays games between two algorithms, alternating the player who starts, with the random generator seeded per game.
+
+    Returns:
+        tuple: The score of the candidate (wins plus half the draws) and the average move time of each algorithm in
+            milliseconds.
+    """
+    score = 0.0
+    times = {id(candidate): [0.0, 0], id(reference): [0.0, 0]}
+    for index in range(games):
+        random.seed(seed + index)
+        red, yellow = (candidate, reference) if index % 2 == 0 else (reference, candidate)
+        game = GameFactory.create_game(game_name)
+        player = Globals.Players.R
+        while game.evaluate_board(False) is None:
+            algorithm = red if player == Globals.Players.R else yellow
+            start = time.perf_counter()
+            move = algorithm.choose_move(game, player)
+            times[id(algorithm)][0] += time.perf_counter() - start
+            times[id(algorithm)][1] += 1
+            game.do_move(move, player)
+            player = game.get_opponent(player)
+        outcome = game.evaluate_board(False)  # 1 when Y wins
+        candidate_color = Globals.Players.R if red is candidate else Globals.Players.Y
+        if outcome == 0:
+            score += 0.5
+        elif (outcome == 1) == (candidate_color == Globals.Players.Y):
+            score += 1
+    return score, *(1000 * total / moves if moves else 0.0 for total, moves in (times[id(candidate)], times[id(reference)]))
+
+def main():
+    try:
+        parser = argparse.ArgumentParser(description="Compare RAVE at a fraction of the simulations against the plain algorithm")
+        parser.add_argument("--algorithm", type=str.upper, default=Globals.Algorithms.UCT,
+                            choices=[Globals.Algorithms.UCT, Globals.Algorithms.UCTIMP, Globals.Algorithms.UCTDEP], help="Algorithm compared.")
+        parser.add_argument("--simulations", type=int, default=400, help="Simulations of the reference, without RAVE.")
+        parser.add_argument("--fractions", default="0.5,0.25", help="Comma-separated shares of the simulations given to RAVE.")
+        parser.add_argument("--rave", type=float, default=10, help="RAVE equivalence parameter.")
+        parser.add_argument("--games", type=int, default=100, help="Games of every match.")
+        parser.add_argument("--seed", type=int, default=1, help="Seed of the first game.")
+        parser.add_argument("--solver-threshold", type=int, default=0,
+                            help="Empty cells at which the endgame solver takes over. Defaults to 0, so the searches play the whole game.")
+        parser.add_argument("--game", type=str.upper, default=Globals.Games.BITBOARD,
+                            choices=[Globals.Games.CONNECT4, Globals.Games.BITBOARD], help="Game board implementation.")
+        args = parser.parse_args()
+
+        reference = AlgorithmFactory.create_algorithm(args.algorithm, args.simulations, solver_threshold=args.solver_threshold)
+        reference_label = Utils.get_algorithm_label(args.algorithm, args.simulations)
+        print(f"{args.games} games against {reference_label} per match, alternating the first player\n")
+        print(f"{'Algorithm':<28} {'Score':>7} {'Elo':>6} {'+/-':>5} {'ms/move':>8} {'Reference ms/move':>18}")
+        for fraction in (float(value) for value in args.fractions.split(",")):
+            simulations = max(1, round(args.simulations * fraction))
+            for rave in (args.rave, 0):
+                options = {"rave": rave} if rave else {}
+                candidate = AlgorithmFactory.create_algorithm(args.algorithm, simulations, solver_threshold=args.solver_threshold, **options)
+                score, candidate_time, reference_time = play_match(candidate, reference, args.games, args.game, args.seed)
+                ratings, margins = EloRatings.estimate(2, {(0, 1): (score, args.games)})
+                elo, margin = ratings[0] - ratings[1], 2 * margins[0]  # Both are centered on their mean
+                label = Utils.get_algorithm_label(args.algorithm, simulations, options)
+                print(f"{label:<28} {score / args.games:>7.1%} {elo:>+6.0f} {margin:>5.0f} {candidate_time:>8.1f} {reference_time:>18.1f}", flush=True)
+    except Exception:
+        Utils.log_message(f"Uncaught exception: {traceback.format_exc()}", Globals.VerbosityLevels.ERROR, __name__)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    Utils.init()
+    main()
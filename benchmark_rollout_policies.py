@@ -0,0 +1,127 @@
+import argparse, random, sys, time, traceback
+from common import EloRatings, Globals, Utils
+from game_factory import GameFactory
+from algorithms import EndgameSolver, RolloutPolicy, UCT
+
+def make_positions(game_name: str, count: int, empty_cells: int, seed: int) -> list:
+    """
+    Plays random games to empty_cells empty cells and solves the undecided positions reached.
+
+    Returns:
+        list[tuple]: (game, player to move, exact value for that player) for count positions.
+    """
+    generator = random.Random(seed)
+    solver = EndgameSolver(max_nodes=10000000)
+    positions = []
+    while len(positions) < count:
+        game = GameFactory.create_game(game_name)
+        player = Globals.Players.R
+        while game.evaluate_board(False) is None and EndgameSolver.count_empty_cells(game) > empty_cells:
+            game.do_move(generator.choice(game.legal_moves()), player)
+            player = game.get_opponent(player)
+        if game.evaluate_board(False) is not None:
+            continue
+        solved = solver.solve(game, player)
+        if solved is not None:
+            positions.append((game, player, solved[1]))
+    return positions
+
+def evaluate(policy: str, positions: list, budget: float) -> tuple:
+    """
+    Estimates the value of every position from the playouts of a policy run for budget seconds.
+
+    Returns:
+        tuple: Playouts per second, mean absolute error against the exact values and share of positions whose
+            estimate has the sign of the exact value (an estimate within 1/3 of 0 counting as a draw).
+    """
+    algorithm = UCT(1, rollout_policy=policy)
+    playouts = 0
+    total_error = 0.0
+    correct = 0
+    for game, player, value in positions:
+        sign = 1 if player == Globals.Players.Y else -1  # Outcomes are 1 when Y wins
+        total = 0
+        count = 0
+        deadline = time.perf_counter() + budget
+        while time.perf_counter() < deadline:
+            path = []
+            total += sign * algorithm.rollout(game, player, path)
+            count += 1
+            for _ in path:
+                game.undo_move()
+        estimate = total / count
+        total_error += abs(estimate - value)
+        correct += (0 if abs(estimate) < 1 / 3 else 1 if estimate > 0 else -1) == value
+        playouts += count
+    return playouts / (budget * len(positions)), total_error / len(positions), correct / len(positions)
+
+def play_match(policy: str, games: int, move_time: float, game_name: str, seed: int) -> tuple:
+    """
+    Plays UCT with a rollout policy against UCT with uniform rollouts, both searching move_time milliseconds per move,
+    alternating the player who starts, with the random generator seeded per game.
+
+    Returns:
+        tuple: The score of the policy (wins plus half the draws) and the average simulations per move of each side.
+    """
+    candidate = UCT(0, time_limit=move_time, rollout_policy=policy, solver_threshold=0)
+    reference = UCT(0, time_limit=move_time, solver_threshold=0)
+    score = 0.0
+    simulations = {id(candidate): [0, 0], id(reference): [0, 0]}
+    for index in range(games):
+        random.seed(seed + index)
+        red, yellow = (candidate, reference) if index % 2 == 0 else (reference, candidate)
+        game = GameFactory.create_game(game_name)
+        player = Globals.Players.R
+        while game.evaluate_board(False) is None:
+            algorithm = red if player == Globals.Players.R else yellow
+            game.do_move(algorithm.choose_move(game, player), player)
+            simulations[id(algorithm)][0] += algorithm.completed_simulations
+            simulations[id(algorithm)][1] += 1
+            player = game.get_opponent(player)
+        outcome = game.evaluate_board(False)  # 1 when Y wins
+        if outcome == 0:
+            score += 0.5
+        elif (outcome == 1) == (yellow is candidate):
+            score += 1
+    return score, *(total / moves if moves else 0.0 for total, moves in (simulations[id(candidate)], simulations[id(reference)]))
+
+def main():
+    try:
+        parser = argparse.ArgumentParser(description="Compare the rollout policies at equal CPU time")
+        parser.add_argument("--positions", type=int, default=100, help="Number of solved test positions.")
+        parser.add_argument("--empty-cells", type=int, default=16, help="Empty cells of the test positions.")
+        parser.add_argument("--budget", type=float, default=20, help="Playout time per position in milliseconds.")
+        parser.add_argument("--seed", type=int, default=1, help="Seed of the test positions and of the first game.")
+        parser.add_argument("--games", type=int, default=0,
+                            help="Games of UCT with every other policy against UCT with uniform rollouts. Defaults to 0 (no games).")
+        parser.add_argument("--move-time", type=float, default=50, help="Search time per move of the games in milliseconds.")
+        parser.add_argument("--game", type=str.upper, default=Globals.Games.BITBOARD,
+                            choices=[Globals.Games.CONNECT4, Globals.Games.BITBOARD], help="Game board implementation.")
+        args = parser.parse_args()
+
+        positions = make_positions(args.game, args.positions, args.empty_cells, args.seed)
+        print(f"{len(positions)} solved positions with {args.empty_cells} empty cells, {args.budget:g} ms of playouts each\n")
+        print(f"{'Policy':<12} {'Playouts/s':>12} {'Mean error':>12} {'Sign correct':>14}")
+        for policy in RolloutPolicy.POLICIES:
+            random.seed(args.seed)
+            rate, error, correct = evaluate(policy, positions, args.budget / 1000)
+            print(f"{policy:<12} {rate:>12.0f} {error:>12.3f} {correct:>13.1%}")
+
+        if args.games:
+            print(f"\n{args.games} games of UCT against UCT with {RolloutPolicy.UNIFORM} rollouts per policy, "
+                  f"{args.move_time:g} ms per move, alternating the first player\n")
+            print(f"{'Policy':<12} {'Score':>7} {'Elo':>6} {'+/-':>5} {'Sims/move':>10} {'Uniform sims/move':>18}")
+            for policy in RolloutPolicy.POLICIES:
+                if policy == RolloutPolicy.UNIFORM:
+                    continue
+                score, simulations, reference_simulations = play_match(policy, args.games, args.move_time, args.game, args.seed)
+                ratings, margins = EloRatings.estimate(2, {(0, 1): (score, args.games)})
+                elo, margin = ratings[0] - ratings[1], 2 * margins[0]  # Both are centered on their mean
+                print(f"{policy:<12} {score / args.games:>7.1%} {elo:>+6.0f} {margin:>5.0f} {simulations:>10.0f} {reference_simulations:>18.0f}", flush=True)
+    except Exception:
+        Utils.log_message(f"Uncaught exception: {traceback.format_exc()}", Globals.VerbosityLevels.ERROR, __name__)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    Utils.init()
+    main()
@@ -0,0 +1,2 @@
+from .positions import BenchmarkPositions
+from .suite import Benchmark, BenchmarkSuite
@@ -0,0 +1,56 @@
+import glob, os, random
+from common import Globals, GameInterface, Utils
+from game_factory import GameFactory
+
+class BenchmarkPositions():
+    """
+    The fixed positions the benchmarks run on: the empty board, the boards of the _test/*.txt game settings files
+    and undecided positions reached by seeded random games. The same arguments always give the same positions, so
+    results of different runs measure the same work.
+    """
+    TEST_FILES = os.path.join("_test", "*.txt")
+    RANDOM_PLIES = (8, 16, 24)  # Moves played from the empty board by the random positions
+    SEED = 20240101  # Seed of the random positions
+
+    @staticmethod
+    def load(game_name: str = Globals.Games.CONNECT4, test_files: str = TEST_FILES, seed: int = SEED) -> list:
+        """
+        Builds the positions.
+
+        Args:
+            game_name (str, optional): Game board implementation (see Globals.Games). Defaults to CONNECT4.
+            test_files (str, optional): Glob of the game settings files whose boards are included. Boards appearing
+                in several files are included once. Defaults to _test/*.txt.
+            seed (int, optional): Seed of the random positions. Defaults to SEED.
+
+        Returns:
+            list[tuple]: (name, board, player to move) for every position, boards as lists of rows.
+        """
+        positions = [("empty", None, Globals.Players.R)]
+        seen = set()
+        for path in sorted(glob.glob(test_files)):
+            _, player, board = Utils.load_game_settings(path)
+            key = (player, tuple(map(tuple, board)))
+            if key not in seen:
+                seen.add(key)
+                positions.append((os.path.splitext(os.path.basename(path))[0], board, player))
+
+        generator = random.Random(seed)
+        for plies in BenchmarkPositions.RANDOM_PLIES:
+            while True:
+                game = GameFactory.create_game(game_name)
+                player = Globals.Players.R
+                for _ in range(plies):
+                    game.do_move(generator.choice(game.legal_moves()), player)
+                    player = game.get_opponent(player)
+                    if game.evaluate_board(False) is not None:
+                        break
+                else:
+                    break  # Undecided after plies moves
+            positions.append((f"random{plies}", [list(row) for row in game.get_board()], player))
+        return positions
+
+    @staticmethod
+    def create_game(game_name: str, board) -> GameInterface:
+        """Creates a game set to a copy of a position's board."""
+        return GameFactory.create_game(game_name, [list(row) for row in board] if board is not None else None)
@@ -0,0 +1,272 @@
+import gc, json, math, os, platform, random, statistics, sys, time
+from algorithms import AlgorithmFactory, UCT
+from benchmarks import BenchmarkPositions
+from common import Globals
+
+class Benchmark():
+    """
+    One timed operation.
+
+    setup is called (untimed) before every repeat and returns the function to time, so state the operation changes,
+    such as a search tree, starts every repeat the same. One call of that function performs operations operations,
+    and the reported time is per operation.
+    """
+    def __init__(self, name: str, setup, operations: int):
+        self.name = name
+        self.setup = setup
+        self.operations = operations
+
+class BenchmarkSuite():
+    """
+    Microbenchmarks of the engine hot paths on the fixed BenchmarkPositions, with results saved as JSON and compared
+    against a saved baseline.
+
+    Every benchmark is calibrated to run for at least min_time per repeat and is repeated repeat times, reseeding the
+    random generator before each repeat. The garbage collector is paused while a repeat is timed. The fastest repeat
+    is the result (the least disturbed by the rest of the machine); the median is kept alongside it.
+    """
+    RESULTS_FILE = os.path.join("_results", "benchmarks.json")
+    BASELINE_FILE = os.path.join("_resources", "benchmarks", "baseline.json")
+    ALGORITHMS = (Globals.Algorithms.UR, Globals.Algorithms.PMCGS, Globals.Algorithms.UCT, Globals.Algorithms.UCTIMP,
+                  Globals.Algorithms.UCTDEP)
+
+    def __init__(self, game_names: list = (Globals.Games.CONNECT4, Globals.Games.BITBOARD), simulations: int = 200,
+                 tree_simulations: int = 2000, repeat: int = 5, min_time: float = 0.05, seed: int = 1):
+        """
+        Initializes the suite.
+
+        Args:
+            game_names (list, optional): Game board implementations benchmarked (see Globals.Games). Defaults to both.
+            simulations (int, optional): Simulations of the choose_move benchmarks. Defaults to 200.
+            tree_simulations (int, optional): Simulations of the trees built for select_child and backpropagation.
+                Defaults to 2000.
+            repeat (int, optional): Timed repeats of every benchmark. Defaults to 5.
+            min_time (float, optional): Minimum duration of a repeat in seconds. Defaults to 0.05.
+            seed (int, optional): Seed of the random generator at the start of every repeat. Defaults to 1.
+
+        Raises:
+            ValueError: If a parameter is out of range.
+        """
+        if repeat < 1 or min_time <= 0 or simulations < 1 or tree_simulations < 1:
+            raise ValueError(f"Invalid benchmark parameters: repeat={repeat}, min_time={min_time}, "
+                             f"simulations={simulations}, tree_simulations={tree_simulations}")
+        self.game_names = list(game_names)
+        self.simulations = simulations
+        self.tree_simulations = tree_simulations
+        self.repeat = repeat
+        self.min_time = min_time
+        self.seed = seed
+
+    def get_benchmarks(self, game_name: str) -> list:
+        """Builds the benchmarks of a game board implementation, named <game>.<operation>."""
+        positions = BenchmarkPositions.load(game_name)
+        undecided = [(board, player) for _, board, player in positions
+                     if BenchmarkPositions.create_game(game_name, board).evaluate_board(False) is None]
+
+        def get_games():
+            return [BenchmarkPositions.create_game(game_name, board) for _, board, _ in positions]
+
+        def check_win():
+            games = get_games()
+            def run():
+                for game in games:
+                    game.check_win(Globals.Players.R)
+                    game.check_win(Globals.Players.Y)
+            return run
+
+        def evaluate_board():
+            games = get_games()
+            def run():
+                for game in games:
+                    game.evaluate_board(False)
+            return run
+
+        def do_undo_move():
+            games = [(BenchmarkPositions.create_game(game_name, board), player) for board, player in undecided]
+            moves = [(game, player, game.legal_moves()) for game, player in games]
+            def run():
+                for game, player, legal_moves in moves:
+                    for move in legal_moves:
+                        game.do_move(move, player)
+                        game.undo_move()
+            return run
+
+        def copy_game():
+            games = get_games()
+            def run():
+                for game in games:
+                    game.copy_game()
+            return run
+
+        def rollout():
+            algorithm = UCT(1)
+            games = [(BenchmarkPositions.create_game(game_name, board), player) for board, player in undecided]
+            def run():
+                for game, player in games:
+                    path = []
+                    algorithm.rollout(game, player, path)
+                    for _ in path:
+                        game.undo_move()
+            return run
+
+        def get_trees():
+            """UCT searches left with their tree of tree_simulations on every undecided position."""
+            trees = []
+            for board, player in undecided:
+                algorithm = UCT(self.tree_simulations, solver_threshold=0)
+                algorithm.choose_move(BenchmarkPositions.create_game(game_name, board), player)
+                trees.append(algorithm)
+            return trees
+
+        def select_child():
+            trees = get_trees()
+            def run():
+                for algorithm in trees:
+                    path = []
+                    _, state = algorithm.select_child(algorithm.current_player, path)
+                    for _ in path:
+                        state.undo_move()
+            return run
+
+        def backpropagation():
+            paths = []
+            for algorithm in get_trees():
+                path = []
+                node, state = algorithm.select_child(algorithm.current_player, path)
+                for _ in path:
+                    state.undo_move()
+                paths.append((algorithm, node, algorithm.node_path))
+            def run():
+                for algorithm, node, node_path in paths:
+                    algorithm.backpropagation(node, 1, node_path)
+                    algorithm.backpropagation(node, -1, node_path)
+            return run
+
+        def choose_move(name):
+            def setup():
+                algorithm = AlgorithmFactory.create_algorithm(name, self.simulations)
+                games = [(BenchmarkPositions.create_game(game_name, board), player) for board, player in undecided]
+                def run():
+                    for game, player in games:
+                        algorithm.choose_move(game, player)
+                return run
+            return setup
+
+        num_moves = sum(len(BenchmarkPositions.create_game(game_name, board).legal_moves()) for board, _ in undecided)
+        benchmarks = [
+            Benchmark("check_win", check_win, 2 * len(positions)),
+            Benchmark("evaluate_board", evaluate_board, len(positions)),
+            Benchmark("do_move_undo_move", do_undo_move, num_moves),
+            Benchmark("copy_game", copy_game, len(positions)),
+            Benchmark("rollout", rollout, len(undecided)),
+            Benchmark("select_child", select_child, len(undecided)),
+            Benchmark("backpropagation", backpropagation, 2 * len(undecided)),
+        ]
+        benchmarks += [Benchmark(f"choose_move.{name}", choose_move(name), len(undecided)) for name in self.ALGORITHMS]
+        for benchmark in benchmarks:
+            benchmark.name = f"{game_name}.{benchmark.name}"
+        return benchmarks
+
+    def time_benchmark(self, benchmark: Benchmark) -> dict:
+        """
+        Times a benchmark.
+
+        Returns:
+            dict: The fastest ("time_us") and median ("median_us") time per operation in microseconds, and the calls
+                per repeat ("calls").
+        """
+        calls = None
+        times = []
+        for _ in range(self.repeat):
+            random.seed(self.seed)
+            run = benchmark.setup()
+            if calls is None:
+                start = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - start
+                calls = max(1, math.ceil(self.min_time / elapsed)) if elapsed > 0 else 1000
+                random.seed(self.seed)
+                run = benchmark.setup()
+            gc_enabled = gc.isenabled()
+            gc.disable()  # As timeit does, so collections triggered by earlier allocations do not land in the timing
+            try:
+                start = time.perf_counter()
+                for _ in range(calls):
+                    run()
+                elapsed = time.perf_counter() - start
+            finally:
+                if gc_enabled:
+                    gc.enable()
+            times.append(elapsed / (calls * benchmark.operations) * 1e6)
+        return {"time_us": min(times), "median_us": statistics.median(times), "calls": calls}
+
+    def run(self, pattern: str = None, progress=None) -> dict:
+        """
+        Runs the benchmarks.
+
+        Args:
+            pattern (str, optional): Runs only the benchmarks whose name contains it. Defaults to all.
+            progress (callable, optional): Called with the name and result of every benchmark as it finishes.
+
+        Returns:
+            dict: The results file contents: "environment" and "results" ({name: result}).
+        """
+        results = {}
+        for game_name in self.game_names:
+            for benchmark in self.get_benchmarks(game_name):
+                if pattern and pattern not in benchmark.name:
+                    continue
+                results[benchmark.name] = self.time_benchmark(benchmark)
+                if progress is not None:
+                    progress(benchmark.name, results[benchmark.name])
+        environment = {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "simulations": self.simulations,
+            "tree_simulations": self.tree_simulations,
+            "repeat": self.repeat,
+            "seed": self.seed,
+        }
+        return {"environment": environment, "results": results}
+
+    @staticmethod
+    def compare(results: dict, baseline: dict, threshold: float) -> list:
+        """
+        Compares results against a baseline.
+
+        Args:
+            results (dict): Results file contents.
+            baseline (dict): Baseline file contents.
+            threshold (float): Relative slowdown above which a benchmark is a regression (0.1 for 10%).
+
+        Returns:
+            list[tuple]: (name, baseline time, time, ratio, regressed) for the benchmarks found in both, times in
+                microseconds per operation.
+        """
+        comparison = []
+        for name, result in results["results"].items():
+            reference = baseline["results"].get(name)
+            if reference is None or reference["time_us"] <= 0:
+                continue
+            ratio = result["time_us"] / reference["time_us"]
+            comparison.append((name, reference["time_us"], result["time_us"], ratio, ratio > 1 + threshold))
+        return comparison
+
+    @staticmethod
+    def save(path: str, results: dict) -> None:
+        """Writes results as JSON, creating the directory when needed."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+    @staticmethod
+    def load(path: str) -> dict:
+        """Reads results written by save."""
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
@@ -0,0 +1,102 @@
+import argparse, os, random, sys, time, traceback
+from concurrent.futures import ProcessPoolExecutor
+from common import Globals, Utils
+from game_factory import GameFactory
+from algorithms import AlgorithmFactory, OpeningBook, SearchStats
+
+_worker_algorithm = None  # Algorithm searching the positions in each worker process
+
+def init_worker(algorithm_name: str, simulations: int, options: dict) -> None:
+    """Creates the algorithm of a worker process."""
+    global _worker_algorithm
+    _worker_algorithm = AlgorithmFactory.create_algorithm(algorithm_name, simulations, **options)
+
+def search_position(task: tuple) -> tuple:
+    """
+    Searches a book position in a worker process.
+
+    Args:
+        task (tuple): (game name, moves, first player) where moves are the columns played from the empty board.
+
+    Returns:
+        tuple: The book key, the best move in the orientation of the key and its score.
+    """
+    game_name, moves, first_player = task
+    game = GameFactory.create_game(game_name)
+    player = first_player
+    for column in moves:
+        game.do_move(column, player)
+        player = game.get_opponent(player)
+
+    key, flipped = OpeningBook.get_key(game, player)
+    random.seed(key)  # Rebuilding the book gives the same moves
+    move = _worker_algorithm.choose_move(game, player)
+    stats = _worker_algorithm.stats  # Records how the move was chosen, also for the parallel algorithms
+    statistics = _worker_algorithm.get_root_statistics() if stats is not None and stats.source == SearchStats.SEARCH else {}
+    total_visits = sum(visits for _, visits in statistics.values())
+    score = round(100 * statistics[move][1] / total_visits) if move in statistics and total_visits else 100
+    return key, (game.get_num_cols() - 1 - move if flipped else move), score
+
+def enumerate_positions(game_name: str, plies: int, first_players: list) -> list:
+    """
+    Enumerates the undecided positions reachable in up to plies moves, keeping one of every pair of mirror positions.
+
+    Returns:
+        list[tuple]: (game name, moves, first player) tasks for search_position.
+    """
+    tasks = []
+    seen = set()
+    for first_player in first_players:
+        pending = [[]]
+        while pending:
+            moves = pending.pop()
+            game = GameFactory.create_game(game_name)
+            player = first_player
+            for column in moves:
+                game.do_move(column, player)
+                player = game.get_opponent(player)
+            key, _ = OpeningBook.get_key(game, player)
+            if key in seen or game.evaluate_board(False) is not None:
+                continue
+            seen.add(key)
+            tasks.append((game_name, moves, first_player))
+            if len(moves) < plies:
+                pending.extend(moves + [column] for column in game.legal_moves())
+    return tasks
+
+def main():
+    try:
+        parser = argparse.ArgumentParser(description="Build an opening book")
+        parser.add_argument("--output", default=OpeningBook.DEFAULT_FILE, help="Book file to write.")
+        parser.add_argument("--plies", type=int, default=4, help="Depth of the book in moves from the empty board.")
+        parser.add_argument("--algorithm", default=Globals.Algorithms.UCT, help="Algorithm searching every position.")
+        parser.add_argument("--simulations", type=int, default=20000, help="Simulations of every search.")
+        parser.add_argument("--workers", type=int, default=0, help="Worker processes. Defaults to one per CPU.")
+        parser.add_argument("--game", type=str.upper, default=Globals.Games.BITBOARD,
+                            choices=[Globals.Games.CONNECT4, Globals.Games.BITBOARD], help="Game board implementation.")
+        parser.add_argument("--options", nargs="*", default=[], metavar="OPTION=VALUE", help="Algorithm options.")
+        args = parser.parse_args()
+        options = {}
+        for item in args.options:
+            key, value = item.split('=', 1)
+            options[key.strip().lower()] = Utils.parse_option_value(value.strip())
+        options["opening_book"] = 0
+
+        tasks = enumerate_positions(args.game, args.plies, [Globals.Players.R, Globals.Players.Y])
+        print(f"Searching {len(tasks)} positions up to ply {args.plies} with {Utils.get_algorithm_label(args.algorithm, args.simulations)}...")
+        start_time = time.perf_counter()
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(args.algorithm, args.simulations, options)) as executor:
+            records = {key: (move, score) for key, move, score in executor.map(search_position, tasks, chunksize=8)}
+
+        game = GameFactory.create_game(args.game)
+        output = args.output if os.path.isabs(args.output) else os.path.join(Utils.get_base_dir(), args.output)
+        OpeningBook.write(output, len(game.get_board()), game.get_num_cols(), records)
+        print(f"Wrote {len(records)} positions to {output} in {time.perf_counter() - start_time:.1f}s")
+    except Exception:
+        Utils.log_message(f"Uncaught exception: {traceback.format_exc()}", Globals.VerbosityLevels.ERROR, __name__)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    Utils.init()
+    main()
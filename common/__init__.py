@@ -1,3 +1,7 @@
 from .game_interface import GameInterface
 from .globals import Globals
-from .utils import Utils
\ No newline at end of file
+from .log_queue import LogQueue
+from .rating import EloRatings, SPRT
+from .results_store import ResultsStore
+from .utils import Utils
+from .zobrist import Zobrist
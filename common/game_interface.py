@@ -10,6 +10,11 @@ class GameInterface(ABC):
         """Checks if a move is valid."""
         pass
 
+    @abstractmethod
+    def legal_moves(self):
+        """Returns the moves that are currently valid."""
+        pass
+
     @abstractmethod
     def get_next_board(self, col, player):
         """Returns the next game board state after a move."""
@@ -40,6 +45,11 @@ class GameInterface(ABC):
         """Returns the current game board state."""
         pass
 
+    @abstractmethod
+    def get_hash(self, mirror=False):
+        """Returns the hash of the current board (or of its left-right mirror)."""
+        pass
+
     @abstractmethod
     def get_num_cols(self):
         """Returns the number of columns in the game board."""
@@ -60,6 +70,11 @@ class GameInterface(ABC):
         """Executes a move on the board."""
         pass
 
+    @abstractmethod
+    def get_moves(self):
+        """Returns the moves executed since the board was set, oldest first."""
+        pass
+
     @abstractmethod
     def undo_move(self):
         """Undoes the last move on the board."""
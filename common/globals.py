@@ -12,6 +12,16 @@ class Globals():
         UCT = "UCT"  # Upper Confidence bound for Trees
         UCTIMP = "UCTIMP" #UCT Improvement with column bias 
         UCTDEP = "UCTDEP" #UCT with depth bonus
+
+    class ParallelModes():
+        SERIAL = 0  # Single process
+        ROLLOUT = 1  # Selection in the main process, rollouts in a worker pool
+        ROOT = 2  # Independent trees in a worker pool, merged at the root
+        TREE = 3  # One tree in shared memory, searched by every worker of a pool
+
+    class Games():
+        CONNECT4 = "CONNECT4"  # List based board
+        BITBOARD = "BITBOARD"  # Two 64-bit integers board
         
     class VerbosityLevels():
         VERBOSE = "VERBOSE"
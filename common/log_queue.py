@@ -0,0 +1,128 @@
+import logging, logging.config, logging.handlers
+import multiprocessing, queue
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks: records are dropped, and counted, while the queue is full."""
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0  # Records dropped since the last one that got through
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.dropped:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                    "msg": f"Log queue full: dropped {self.dropped} records"}))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def _listen(log_queue, config_path: str, batch_size: int) -> None:
+    """
+    Writes the records of the queue with the handlers configured in config_path until it receives None.
+
+    Runs in the listener process, the only one writing (and rotating) the log files. Records are taken in batches and
+    the handlers are flushed once per batch instead of once per record.
+    """
+    logging.config.fileConfig(config_path, disable_existing_loggers=False)
+    handlers = logging.getLogger().handlers
+    flushes = [handler.flush for handler in handlers]
+    for handler in handlers:
+        handler.flush = lambda: None  # Deferred to the end of the batch
+
+    running = True
+    while running:
+        batch = [log_queue.get()]
+        while len(batch) < batch_size:
+            try:
+                batch.append(log_queue.get_nowait())
+            except queue.Empty:
+                break
+        for record in batch:
+            if record is None:
+                running = False
+                break
+            for handler in handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+        for flush in flushes:
+            flush()
+
+    for handler in handlers:
+        handler.close()
+
+class LogQueue():
+    """
+    Multiprocess-safe, non-blocking logging pipeline.
+
+    Every process (the main one, the tournament workers and the rollout pools) replaces its log handlers with a
+    DroppingQueueHandler pushing records onto one bounded multiprocessing queue. A single listener process drains the
+    queue and writes the records with the handlers of log.ini, so only it touches the log files. Logging never blocks a
+    search: when the listener falls behind and the queue fills up, new records are dropped and the number dropped is
+    logged once there is room again.
+    """
+    CAPACITY = 10000  # Records buffered before new ones are dropped
+    BATCH_SIZE = 256  # Records written by the listener between two flushes
+
+    _queue = None  # Queue of the pipeline this process logs to
+    _level = logging.NOTSET  # Root logger level of the process that started the pipeline
+    _listener = None  # Listener process, in the process that started the pipeline
+
+    @staticmethod
+    def start(config_path: str, capacity: int = CAPACITY) -> None:
+        """
+        Starts the listener process and routes the logging of this process through the queue.
+
+        Args:
+            config_path (str): The logging configuration (log.ini) whose handlers the listener uses.
+            capacity (int, optional): Number of records buffered before new ones are dropped. Defaults to CAPACITY.
+        """
+        if LogQueue._listener is not None:
+            return
+        log_queue = multiprocessing.Queue(capacity)
+        LogQueue._listener = multiprocessing.Process(target=_listen, args=(log_queue, config_path, LogQueue.BATCH_SIZE), daemon=True)
+        LogQueue._listener.start()
+        LogQueue.attach(log_queue, logging.getLogger().level)
+
+    @staticmethod
+    def attach(log_queue, level: int) -> None:
+        """
+        Routes the logging of this process through the queue. Used as the initializer of worker processes.
+
+        Args:
+            log_queue (multiprocessing.Queue): The queue of the pipeline.
+            level (int): Level of the root logger.
+        """
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(DroppingQueueHandler(log_queue))
+        root.setLevel(level)
+        LogQueue._queue = log_queue
+        LogQueue._level = level
+
+    @staticmethod
+    def get_worker_initializer() -> tuple:
+        """
+        Gets the initializer and its arguments that attach worker processes to the pipeline.
+
+        Returns:
+            tuple: (initializer, initargs) for ProcessPoolExecutor, or (None, ()) when the pipeline is not running.
+        """
+        if LogQueue._queue is None:
+            return None, ()
+        return LogQueue.attach, (LogQueue._queue, LogQueue._level)
+
+    @staticmethod
+    def stop() -> None:
+        """Writes the pending records and stops the listener process."""
+        if LogQueue._listener is None:
+            return
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        LogQueue._queue.put(None)
+        LogQueue._listener.join()
+        LogQueue._listener = None
+        LogQueue._queue = None
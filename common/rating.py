@@ -0,0 +1,132 @@
+import math
+
+class EloRatings():
+    """Elo ratings estimated from the game results of a tournament."""
+    SCALE = math.log(10) / 400  # Natural log-odds per Elo point
+
+    @staticmethod
+    def expected_score(elo: float) -> float:
+        """Expected score of a player rated elo points above the opponent."""
+        return 1 / (1 + 10 ** (-elo / 400))
+
+    @staticmethod
+    def estimate(num_players: int, results: dict, prior_draws: float = 2.0) -> tuple:
+        """
+        Estimates Elo ratings by maximum likelihood under the logistic model, with 95% confidence intervals.
+
+        Each player also gets prior_draws virtual draws against a fixed opponent rated 0. The prior keeps the ratings
+        finite for players that won or lost every game and anchors them; the ratings are then shifted to average 0.
+
+        Args:
+            num_players (int): Number of players.
+            results (dict): {(i, j): (score, games)} with the score of player i (wins plus half the draws) in its games
+                against player j. Each pair needs to appear once.
+            prior_draws (float, optional): Virtual draws of every player against the anchor. Defaults to 2.
+
+        Returns:
+            tuple: The rating and the half-width of its 95% confidence interval for every player, both in Elo.
+        """
+        pairs = [(i, j, score, games) for (i, j), (score, games) in results.items() if games > 0]
+        ratings = [0.0] * num_players  # Natural log-odds units
+        for _ in range(100):
+            gradient = [prior_draws * (0.5 - 1 / (1 + math.exp(-rating))) for rating in ratings]
+            hessian = [[0.0] * num_players for _ in range(num_players)]
+            for i, rating in enumerate(ratings):
+                expected = 1 / (1 + math.exp(-rating))
+                hessian[i][i] = -prior_draws * expected * (1 - expected)
+            for i, j, score, games in pairs:
+                expected = 1 / (1 + math.exp(ratings[j] - ratings[i]))
+                gradient[i] += score - games * expected
+                gradient[j] -= score - games * expected
+                curvature = games * expected * (1 - expected)
+                hessian[i][i] -= curvature
+                hessian[j][j] -= curvature
+                hessian[i][j] += curvature
+                hessian[j][i] += curvature
+            covariance = EloRatings.invert([[-value for value in row] for row in hessian])
+            step = [sum(covariance[i][k] * gradient[k] for k in range(num_players)) for i in range(num_players)]
+            ratings = [rating + max(-1.0, min(1.0, delta)) for rating, delta in zip(ratings, step)]  # Newton step, damped
+            if max((abs(delta) for delta in step), default=0) < 1e-9:
+                break
+
+        if not num_players:
+            return [], []
+        # Centered on the mean rating, whose own uncertainty (the level of the anchor) is taken out of the intervals
+        mean = sum(ratings) / num_players
+        row_means = [sum(row) / num_players for row in covariance]
+        total_mean = sum(row_means) / num_players
+        variances = [covariance[i][i] - 2 * row_means[i] + total_mean for i in range(num_players)]
+        return ([(rating - mean) / EloRatings.SCALE for rating in ratings],
+                [1.96 * math.sqrt(max(variance, 0)) / EloRatings.SCALE for variance in variances])
+
+    @staticmethod
+    def invert(matrix: list) -> list:
+        """Inverts a symmetric positive definite matrix (list of rows) by Gauss-Jordan elimination."""
+        size = len(matrix)
+        rows = [list(row) + [1.0 if column == index else 0.0 for column in range(size)] for index, row in enumerate(matrix)]
+        for column in range(size):
+            pivot = max(range(column, size), key=lambda index: abs(rows[index][column]))
+            rows[column], rows[pivot] = rows[pivot], rows[column]
+            divisor = rows[column][column]
+            rows[column] = [value / divisor for value in rows[column]]
+            for index in range(size):
+                if index != column and rows[index][column]:
+                    factor = rows[index][column]
+                    rows[index] = [value - factor * pivot_value for value, pivot_value in zip(rows[index], rows[column])]
+        return [row[size:] for row in rows]
+
+class SPRT():
+    """
+    Sequential probability ratio test deciding whether one algorithm is stronger than another.
+
+    Two tests run on the wins, draws and losses of the first algorithm: H0 "equal" against H1 "elo_margin stronger",
+    and H0 against H1 "elo_margin weaker". The log-likelihood ratio of each uses the normal approximation of the
+    trinomial game outcome (as in the GSPRT of fishtest), with half a game added to every count so that one-sided
+    results have a variance. A pairing is decided when a test accepts its H1, or when both accept H0.
+    """
+    STRONGER, EQUAL, WEAKER = 1, 0, -1  # Decisions, for the first algorithm
+
+    def __init__(self, elo_margin: float = 50, alpha: float = 0.05, beta: float = 0.05):
+        """
+        Initializes the test.
+
+        Args:
+            elo_margin (float, optional): Elo difference the test tells apart from 0. Defaults to 50.
+            alpha (float, optional): Probability of finding a difference between equal algorithms. Defaults to 0.05.
+            beta (float, optional): Probability of missing a difference of elo_margin. Defaults to 0.05.
+
+        Raises:
+            ValueError: If a parameter is out of range.
+        """
+        if elo_margin <= 0 or not 0 < alpha < 1 or not 0 < beta < 1:
+            raise ValueError(f"Invalid SPRT parameters: elo_margin={elo_margin}, alpha={alpha}, beta={beta}")
+        self.elo_margin = elo_margin
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+
+    @staticmethod
+    def llr(wins: float, draws: float, losses: float, elo0: float, elo1: float) -> float:
+        """Log-likelihood ratio of H1 (elo1) against H0 (elo0) for the given results."""
+        wins, draws, losses = wins + 0.5, draws + 0.5, losses + 0.5
+        games = wins + draws + losses
+        score = (wins + 0.5 * draws) / games
+        variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+        score0, score1 = EloRatings.expected_score(elo0), EloRatings.expected_score(elo1)
+        return (score1 - score0) * (2 * score - score0 - score1) * games / (2 * variance)
+
+    def decide(self, wins: int, draws: int, losses: int):
+        """
+        Decides a pairing from the results of its first algorithm.
+
+        Returns:
+            int: STRONGER, EQUAL or WEAKER, or None while more games are needed.
+        """
+        stronger = self.llr(wins, draws, losses, 0, self.elo_margin)
+        weaker = self.llr(wins, draws, losses, 0, -self.elo_margin)
+        if stronger >= self.upper:
+            return self.STRONGER
+        if weaker >= self.upper:
+            return self.WEAKER
+        if stronger <= self.lower and weaker <= self.lower:
+            return self.EQUAL
+        return None
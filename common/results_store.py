@@ -0,0 +1,58 @@
+import json, os
+
+class ResultsStore():
+    """
+    Append-only store of tournament game records in a JSON Lines file.
+
+    Every record is written as one line and flushed to disk as soon as it is appended, so a crashed or interrupted
+    tournament keeps every game it finished. Loading skips a last line left incomplete by a crash.
+    """
+    def __init__(self, path: str, resume: bool = True):
+        """
+        Opens the store, creating the file and its directory when needed.
+
+        Args:
+            path (str): The results file.
+            resume (bool, optional): Keep the records already in the file. When False, the file is emptied.
+                Defaults to True.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "a" if resume else "w", encoding="utf-8")
+        if self.file.tell() > 0:
+            with open(path, "rb") as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    self.file.write("\n")  # Ends a line cut short by a crash, so the next record starts on its own line
+        self.skipped = 0  # Lines of the file that could not be read by the last load
+
+    def load(self) -> list:
+        """Reads the records of the file, oldest first."""
+        records = []
+        self.skipped = 0
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    self.skipped += 1
+        return records
+
+    def append(self, record: dict) -> None:
+        """Writes a record and flushes it to disk."""
+        self.extend([record])
+
+    def extend(self, records: list) -> None:
+        """Writes records and flushes them to disk at once."""
+        self.file.write("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        """Closes the file."""
+        self.file.close()
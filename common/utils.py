@@ -2,10 +2,15 @@ import argparse
 import os
 import logging
 import logging.config
-from common import Globals
+from common import Globals, LogQueue
 
 class Utils():
     VERBOSITY = Globals.VerbosityLevels.NONE
+    VERBOSITY_RANKS = {Globals.VerbosityLevels.NONE: 0, Globals.VerbosityLevels.BRIEF: 1, Globals.VerbosityLevels.VERBOSE: 2, Globals.VerbosityLevels.ERROR: 3}
+    LOG_LEVELS = {Globals.VerbosityLevels.VERBOSE: logging.DEBUG, Globals.VerbosityLevels.BRIEF: logging.INFO,
+                  Globals.VerbosityLevels.ERROR: logging.ERROR, Globals.VerbosityLevels.NONE: logging.DEBUG}
+    _verbosity_rank = 0  # Rank of VERBOSITY, kept in sync by set_verbosity_level
+    _loggers = {}  # {source: logging.Logger}
 
     @staticmethod
     def get_verbosity_level():
@@ -20,6 +25,7 @@ class Utils():
             verbosity (str): The current verbosity level ("None", "Brief", or "Verbose").
         """
         Utils.VERBOSITY = verbosity.upper()
+        Utils._verbosity_rank = Utils.VERBOSITY_RANKS.get(Utils.VERBOSITY, 0)
 
     @staticmethod
     def get_base_dir():
@@ -35,7 +41,27 @@ class Utils():
         """
         basedir = Utils.get_base_dir()
         os.makedirs(os.path.join(basedir, "_logs"), exist_ok=True)
-        logging.config.fileConfig(os.path.join(basedir, "_resources", "config", 'log.ini'), disable_existing_loggers=False)
+        logging.config.fileConfig(Utils.get_log_config_path(), disable_existing_loggers=False)
+
+    @staticmethod
+    def get_log_config_path():
+        """Gets the path of the logging configuration file."""
+        return os.path.join(Utils.get_base_dir(), "_resources", "config", 'log.ini')
+
+    @staticmethod
+    def start_log_queue(capacity: int = LogQueue.CAPACITY):
+        """
+        Switches logging to the queue-based pipeline (see LogQueue), so worker processes never block on the log files.
+
+        Args:
+            capacity (int, optional): Number of records buffered before new ones are dropped.
+        """
+        LogQueue.start(Utils.get_log_config_path(), capacity)
+
+    @staticmethod
+    def stop_log_queue():
+        """Writes the pending records of the queue-based pipeline and stops it."""
+        LogQueue.stop()
 
     @staticmethod
     def file_exists(path):
@@ -70,11 +96,11 @@ class Utils():
         """
         Validates command-line arguments for the game initialization.
 
-        Parses the input file path, verbosity level, and number of iterations.
+        Parses the input file path, verbosity level, number of iterations, game implementation and algorithm options.
 
         Returns:
             tuple: A tuple containing the validated input file path (str), verbosity level (str),
-                   and number of iterations (int).
+                   number of iterations (int), game implementation name (str) and algorithm options (dict).
 
         Raises:
             argparse.ArgumentTypeError: If the input file does not exist.
@@ -97,35 +123,78 @@ class Utils():
             type=int,
             help="Indicates number of simulations."
         )
+        parser.add_argument(
+            "--game",
+            type=str.upper,
+            default=Globals.Games.CONNECT4,
+            choices=[Globals.Games.CONNECT4, Globals.Games.BITBOARD],
+            help="Game board implementation. Values supported: CONNECT4, BITBOARD"
+        )
+        parser.add_argument(
+            "--options",
+            nargs="*",
+            default=[],
+            metavar="OPTION=VALUE",
+            help="Algorithm options, e.g. reuse_tree=1 transposition_size=100000"
+        )
         args = parser.parse_args()
+        options = {}
+        for item in args.options:
+            if "=" not in item:
+                parser.error(f"Invalid option '{item}', expected OPTION=VALUE")
+            key, value = item.split('=', 1)
+            options[key.strip().lower()] = Utils.parse_option_value(value.strip())
 
-        return args.input_file, args.verbosity, args.iterations
+        return args.input_file, args.verbosity, args.iterations, args.game, options
     
     @staticmethod
-    def log_message(message: str, message_verbosity: str, source: str = None):
+    def get_logger(source: str) -> logging.Logger:
+        """Gets the logger of a source, caching it so repeated lookups skip the logging module's lock."""
+        logger = Utils._loggers.get(source)
+        if logger is None:
+            logger = Utils._loggers[source] = logging.getLogger(source)
+        return logger
+
+    @staticmethod
+    def is_enabled(message_verbosity: str, source: str = None) -> bool:
+        """
+        Checks whether a message of the given verbosity would be printed or logged.
+
+        Hot loops call it once and skip their log_message calls (and the formatting of their messages) when it is False.
+
+        Args:
+            message_verbosity (str): The verbosity level required to log the message.
+            source (str, optional): logging instance from the file/class calling the log_message method
+        """
+        if (message_verbosity != Globals.VerbosityLevels.NONE and
+            Utils._verbosity_rank >= Utils.VERBOSITY_RANKS.get(message_verbosity, 0)):
+            return True
+        return source is not None and Utils.get_logger(source).isEnabledFor(Utils.LOG_LEVELS.get(message_verbosity, logging.ERROR))
+
+    @staticmethod
+    def log_message(message, message_verbosity: str, source: str = None):
         """
         Logs a message based on the current and message verbosity levels.
 
         Args:
-            message (str): The message to log.
+            message (str | callable): The message to log, or a function returning it, which is only called when the
+                message is printed or logged.
             message_verbosity (str): The verbosity level required to log the message.
             source (str): logging instance from the file/class calling the log_message method
         """
-        verbosity_levels = {Globals.VerbosityLevels.NONE: 0, Globals.VerbosityLevels.BRIEF: 1, Globals.VerbosityLevels.VERBOSE: 2, Globals.VerbosityLevels.ERROR: 3}
-        if message_verbosity != Globals.VerbosityLevels.NONE and (verbosity_levels.get(Utils.get_verbosity_level(), 0) >=
-            verbosity_levels.get(message_verbosity, 0)):
+        printed = (message_verbosity != Globals.VerbosityLevels.NONE and
+                   Utils._verbosity_rank >= Utils.VERBOSITY_RANKS.get(message_verbosity, 0))
+        level = Utils.LOG_LEVELS.get(message_verbosity, logging.ERROR)
+        logger = Utils.get_logger(source) if source is not None else None
+        if not printed and (logger is None or not logger.isEnabledFor(level)):
+            return
+
+        if callable(message):
+            message = message()
+        if printed:
             print(message)
-        
-        if source is not None:
-            logger = logging.getLogger(source)
-            log_levels = {
-                Globals.VerbosityLevels.VERBOSE: logger.debug,
-                Globals.VerbosityLevels.BRIEF: logger.info,
-                Globals.VerbosityLevels.ERROR: logger.error,
-                Globals.VerbosityLevels.NONE: logger.debug
-            }
-            log_func = log_levels.get(message_verbosity, logger.error)  
-            log_func(message)
+        if logger is not None:
+            logger.log(level, message)
 
     @staticmethod
     def load_game_settings(path):
@@ -150,26 +219,78 @@ class Utils():
     @staticmethod
     def load_tournament_config():
         """Loads the tournament configuration from a file."""
-        config = []
         with open(Utils.file_exists("_resources/config/tournament_config.txt"), 'r') as file:
             lines = file.readlines()
             max_proc = int(lines[0].strip())  # Read number of processors to run parallel games
             num_games = int(lines[1].strip())  # Read number of games from the first line
             parallel = int(lines[2].strip())  # Read if algorithm parallel processing should be enabled
-            for line in lines[3:]:  # Read algorithm configurations from the rest
-                algorithm, simulations = line.strip().split(',')
-                config.append((algorithm, int(simulations)))
-        return max_proc, num_games, parallel, config
+            config, settings = Utils.parse_config_lines(lines[3:])  # Read algorithm configurations and settings from the rest
+        return max_proc, num_games, parallel, config, settings
     
     @staticmethod
     def load_single_match_config():
         """Loads the single match configuration from a file."""
-        config = []
         with open(Utils.file_exists("_resources/config/single_match_config.txt"), 'r') as file:
             lines = file.readlines()
             verbosity = lines[0].strip()  # Read verbosity level
             num_games = int(lines[1].strip())  # Read number of games from the first line
-            for line in lines[2:4]:  # Read algorithm configurations from the rest
-                algorithm, simulations = line.strip().split(',')
-                config.append((algorithm, int(simulations)))
-        return verbosity, num_games, config
\ No newline at end of file
+            config, settings = Utils.parse_config_lines(lines[2:])  # Read algorithm configurations and settings from the rest
+        return verbosity, num_games, config[:2], settings
+
+    @staticmethod
+    def parse_config_lines(lines):
+        """
+        Parses the algorithm and setting lines of a configuration file.
+
+        Algorithm lines have the form "<algorithm>,<simulations>[,<option>=<value>...]", where the
+        options are passed to the algorithm (e.g. "UCT,10000,transposition_size=100000"). Setting
+        lines have the form "<key>=<value>" (e.g. "game=BITBOARD") and may appear anywhere among them.
+
+        Args:
+            lines (list[str]): The configuration lines to parse.
+
+        Returns:
+            tuple: List of (algorithm, simulations, options) tuples and a dictionary of settings.
+        """
+        config = []
+        settings = {}
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if "=" in line and "," not in line:
+                key, value = line.split('=', 1)
+                settings[key.strip().lower()] = value.strip()
+            else:
+                algorithm, simulations, *option_items = line.split(',')
+                options = {}
+                for item in option_items:
+                    key, value = item.split('=', 1)
+                    options[key.strip().lower()] = Utils.parse_option_value(value.strip())
+                config.append((algorithm.strip(), int(simulations), options))
+        return config, settings
+
+    @staticmethod
+    def parse_option_value(value: str):
+        """Converts a configuration option value to int or float when possible."""
+        for cast in (int, float):
+            try:
+                return cast(value)
+            except ValueError:
+                pass
+        return value
+
+    @staticmethod
+    def get_algorithm_label(name: str, simulations: int, options: dict = None):
+        """
+        Gets the display name of a configured algorithm, e.g. "UCT(500)" or "UCT(500)[mirror=1]".
+
+        Args:
+            name (str): The algorithm name.
+            simulations (int): The number of simulations.
+            options (dict, optional): The algorithm options.
+        """
+        label = f"{name}({simulations})" if simulations else name
+        if options:
+            label += "[" + ",".join(f"{key}={value}" for key, value in options.items()) + "]"
+        return label
\ No newline at end of file
@@ -0,0 +1,34 @@
+import random
+from common import Globals
+
+class Zobrist():
+    """
+    Zobrist keys used to hash game boards incrementally.
+
+    A position hash is the XOR of one 64-bit key per occupied cell, so do_move/undo_move can
+    update it with a single XOR. Keys are indexed by [player][col][height], where height is the
+    row counted from the bottom of the column, which makes the left-right mirror hash a lookup
+    of the key at column num_cols - 1 - col.
+    """
+    SEED = 20240601
+    _tables = {}  # {(num_rows, num_cols): keys}
+
+    @staticmethod
+    def get_keys(num_rows: int, num_cols: int):
+        """
+        Gets the Zobrist keys for a board size, generating them once with a fixed seed.
+
+        Args:
+            num_rows (int): Number of rows of the board.
+            num_cols (int): Number of columns of the board.
+
+        Returns:
+            dict: {player: [[key for height] for col]}
+        """
+        keys = Zobrist._tables.get((num_rows, num_cols))
+        if keys is None:
+            rng = random.Random(Zobrist.SEED)
+            keys = {player: [[rng.getrandbits(64) for _ in range(num_rows)] for _ in range(num_cols)]
+                    for player in (Globals.Players.R, Globals.Players.Y)}
+            Zobrist._tables[(num_rows, num_cols)] = keys
+        return keys
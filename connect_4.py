@@ -1,22 +1,34 @@
-from common import Globals, Utils, GameInterface
+from common import Globals, Utils, GameInterface, Zobrist
+
+# Directions (row step, col step) checked through the last placed disc: horizontal, vertical and both diagonals
+LINE_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
 
 class Connect4(GameInterface):
-    """Implements the Connect Four game logic."""
+    """
+    Implements the Connect Four game logic.
+
+    Column heights, the legal-move mask and the move counter are kept up to date by
+    do_move/undo_move, and the game status (win, draw or ongoing) is decided only from the
+    lines through the last placed disc and cached until the move is undone.
+    """
+    _legal_moves_tables = {}  # {num_cols: legal columns per legal-move mask}
 
     def __init__(self, board=None):
         """Initializes the Connect Four game with the given board."""
         self.logger_source = __name__ + "." + self.__class__.__name__
+        self.print_result = True
         if board is None:
             # Create an empty 6x7 board (6 rows, 7 columns)
-            self.board = [[Globals.Players.O for _ in range(7)] for _ in range(6)]
-        else:
-            self.board = [list(row) for row in board]
-        self.print_result = True
-        self.move_history = []  # Instead of self.last_move
+            board = [[Globals.Players.O for _ in range(7)] for _ in range(6)]
+        self.set_board(board)
     
     def is_valid_move(self, col):
         """Checks if a move is valid (column not full)."""
-        return 0 <= col < 7 and self.board[0][col] == Globals.Players.O
+        return 0 <= col < self.num_cols and self.heights[col] < self.num_rows
+
+    def legal_moves(self):
+        """Returns the columns that are not full, in ascending order."""
+        return self.legal_moves_by_mask[self.legal_mask]
     
     def get_next_board(self, col, player):
         """Returns the next board state after a move."""
@@ -66,36 +78,89 @@ class Connect4(GameInterface):
 
     def check_draw(self):
         """Checks if the game has ended in a draw."""
-        for row in self.board:
-            if Globals.Players.O in row:
-                return False
-        return True
+        return self.move_count == self.num_rows * self.num_cols
+
+    def check_last_move_win(self, row, col):
+        """Checks if the disc at [row, col] completes four in a row along any line through it."""
+        board = self.board
+        player = board[row][col]
+        for row_step, col_step in LINE_DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * row_step, col + sign * col_step
+                while 0 <= r < self.num_rows and 0 <= c < self.num_cols and board[r][c] == player:
+                    count += 1
+                    r += sign * row_step
+                    c += sign * col_step
+            if count >= 4:
+                return True
+        return False
 
     def evaluate_board(self, print_result:bool=True):
-        self.print_result = print_result
         """Evaluates the current board state (win, loss, draw, or None)."""
-        if self.check_win(Globals.Players.Y):
-            return 1
-        elif self.check_win(Globals.Players.R):
-            return -1
-        elif self.check_draw():
-            return 0
-        else:
-            return None
+        self.print_result = print_result
+        if print_result and self.status is not None and self.status != 0:
+            self.check_win(Globals.Players.Y if self.status == 1 else Globals.Players.R)  # Logs where the win is
+        return self.status
+
+    def evaluate_full_board(self):
+        """Evaluates the current board state scanning the whole board (win, loss, draw, or None)."""
+        print_result = self.print_result
+        self.print_result = False
+        try:
+            if self.check_win(Globals.Players.Y):
+                return 1
+            elif self.check_win(Globals.Players.R):
+                return -1
+            elif self.check_draw():
+                return 0
+            else:
+                return None
+        finally:
+            self.print_result = print_result
     
     def set_board(self, new_board):
-        """Sets the board state of the Connect4 object."""
+        """Sets the board state of the Connect4 object and rebuilds the incremental state."""
         self.board = [list(row) for row in new_board]
+        self.num_rows = len(self.board)
+        self.num_cols = len(self.board[0]) if self.board else 0
+        self.heights = [sum(1 for row in self.board if row[col] != Globals.Players.O) for col in range(self.num_cols)]
+        self.move_count = sum(self.heights)
+        self.legal_mask = sum(1 << col for col in range(self.num_cols) if self.heights[col] < self.num_rows)
+        self.legal_moves_by_mask = Connect4.get_legal_moves_table(self.num_cols)
+        self.zobrist_keys = Zobrist.get_keys(self.num_rows, self.num_cols)
+        self.hash = 0
+        self.mirror_hash = 0
+        for row_index, row in enumerate(self.board):
+            for col, cell in enumerate(row):
+                if cell != Globals.Players.O:
+                    height = self.num_rows - 1 - row_index
+                    self.hash ^= self.zobrist_keys[cell][col][height]
+                    self.mirror_hash ^= self.zobrist_keys[cell][self.num_cols - 1 - col][height]
+        self.move_history = []  # (row, col) of each move made since the board was set
+        self.status_history = []  # Status before each move in move_history
+        self.status = self.evaluate_full_board()
+
+    @staticmethod
+    def get_legal_moves_table(num_cols):
+        """Returns the tuple of legal columns for every legal-move mask of a board with num_cols columns."""
+        table = Connect4._legal_moves_tables.get(num_cols)
+        if table is None:
+            table = [tuple(col for col in range(num_cols) if mask >> col & 1) for mask in range(1 << num_cols)]
+            Connect4._legal_moves_tables[num_cols] = table
+        return table
 
     def get_board(self):
         """Returns the current game board state."""
         return ["".join(row) for row in self.board]
 
+    def get_hash(self, mirror=False):
+        """Returns the Zobrist hash of the current board (or of its left-right mirror)."""
+        return self.mirror_hash if mirror else self.hash
+
     def get_num_cols(self):
         """Returns the number of columns in the game board."""
-        if not self.board:  
-            return 0  
-        return len(self.board[0])
+        return self.num_cols
     
     def get_opponent(self, player):
         """Returns the opponent player ('R' or 'Y')."""
@@ -106,21 +171,44 @@ class Connect4(GameInterface):
         return Connect4([row[:] for row in self.board])
     
     def do_move(self, col, player):
-        """Executes a move on the board."""
+        """Executes a move on the board and updates the cached game status."""
         if not self.is_valid_move(col):
             raise ValueError(f"Invalid move: Column {col + 1} is full.")
-        for row in range(5, -1, -1):
-            if self.board[row][col] == Globals.Players.O:
-                self.board[row][col] = player
-                self.move_history.append((row, col)) 
-                return
-        raise Exception("Should not reach here")
+        height = self.heights[col]
+        row = self.num_rows - 1 - height
+        self.board[row][col] = player
+        keys = self.zobrist_keys[player]
+        self.hash ^= keys[col][height]
+        self.mirror_hash ^= keys[self.num_cols - 1 - col][height]
+        self.heights[col] += 1
+        if self.heights[col] == self.num_rows:
+            self.legal_mask &= ~(1 << col)
+        self.move_count += 1
+        self.move_history.append((row, col))
+        self.status_history.append(self.status)
+
+        if self.status is None:  # A finished game keeps its result
+            if self.check_last_move_win(row, col):
+                self.status = 1 if player == Globals.Players.Y else -1
+            elif self.move_count == self.num_rows * self.num_cols:
+                self.status = 0
     
+    def get_moves(self):
+        """Returns the columns played since the board was set, oldest first."""
+        return [col for _, col in self.move_history]
+
     def undo_move(self):
-        """Undoes the most recent move on the board."""
+        """Undoes the most recent move on the board and restores the previous game status."""
         if self.move_history:
             row, col = self.move_history.pop()
+            keys = self.zobrist_keys[self.board[row][col]]
             self.board[row][col] = Globals.Players.O
+            self.heights[col] -= 1
+            self.hash ^= keys[col][self.heights[col]]
+            self.mirror_hash ^= keys[self.num_cols - 1 - col][self.heights[col]]
+            self.legal_mask |= 1 << col
+            self.move_count -= 1
+            self.status = self.status_history.pop()
         else:
             raise ValueError("Cannot undo: No moves to undo.")
         
@@ -0,0 +1,203 @@
+from common import Globals, Utils, GameInterface, Zobrist
+
+ROWS = 6
+COLS = 7
+HEIGHT = ROWS + 1  # Bits per column, including the sentinel
+BOARD_MASK = sum(((1 << ROWS) - 1) << (col * HEIGHT) for col in range(COLS))  # Every playable cell
+TOP_BITS = tuple(col * HEIGHT + ROWS for col in range(COLS))  # Sentinel bit per column, reached when it is full
+LEGAL_MOVES = tuple(tuple(col for col in range(COLS) if mask >> col & 1) for mask in range(1 << COLS))  # Per mask
+ZOBRIST_KEYS = Zobrist.get_keys(ROWS, COLS)
+# Shift per direction: vertical, horizontal, diagonal (\) and diagonal (/)
+DIRECTIONS = ((1, "Vertical"), (HEIGHT, "Horizontal"), (HEIGHT - 1, "Negatively Sloped Diagonal"), (HEIGHT + 1, "Positively Sloped Diagonal"))
+
+class Connect4Bitboard(GameInterface):
+    """
+    Implements the Connect Four game logic on two 64-bit bitboards (one per player).
+
+    Each column takes 7 bits: 6 playable cells counted from the bottom plus an empty
+    sentinel bit on top, so the cell at (row, col) maps to bit col * 7 + row. The sentinel
+    keeps the shift-and-mask win checks from wrapping between columns.
+
+    The legal-move mask and the move counter are kept up to date by do_move/undo_move, and the
+    game status is decided only from the bitboard of the player who moved and cached until the
+    move is undone.
+    """
+    def __init__(self, board=None):
+        """Initializes the Connect Four game with the given board."""
+        self.logger_source = __name__ + "." + self.__class__.__name__
+        self.print_result = True
+        self.set_board(board if board is not None else [Globals.Players.O * COLS for _ in range(ROWS)])
+
+    def is_valid_move(self, col):
+        """Checks if a move is valid (column not full)."""
+        return 0 <= col < COLS and self.heights[col] < TOP_BITS[col]
+
+    def legal_moves(self):
+        """Returns the columns that are not full, in ascending order."""
+        return LEGAL_MOVES[self.legal_mask]
+
+    def get_next_board(self, col, player):
+        """Returns the next board state after a move."""
+        game = self.copy_game()
+        if game.is_valid_move(col):
+            game.do_move(col, player)
+        return game.get_board()
+
+    def check_win(self, player):
+        """Checks if the given player has won the game."""
+        bitboard = self.bitboards[player]
+        for shift, name in DIRECTIONS:
+            pairs = bitboard & (bitboard >> shift)
+            if pairs & (pairs >> (2 * shift)):
+                if self.print_result:
+                    Utils.log_message(f"{name} win", Globals.VerbosityLevels.VERBOSE, self.logger_source)
+                return True
+        return False
+
+    @staticmethod
+    def has_four(bitboard):
+        """Checks if a bitboard has four discs in a row in any direction."""
+        pairs = bitboard & (bitboard >> 1)
+        if pairs & (pairs >> 2):
+            return True
+        pairs = bitboard & (bitboard >> HEIGHT)
+        if pairs & (pairs >> (2 * HEIGHT)):
+            return True
+        pairs = bitboard & (bitboard >> (HEIGHT - 1))
+        if pairs & (pairs >> (2 * (HEIGHT - 1))):
+            return True
+        pairs = bitboard & (bitboard >> (HEIGHT + 1))
+        return bool(pairs & (pairs >> (2 * (HEIGHT + 1))))
+
+    def check_draw(self):
+        """Checks if the game has ended in a draw."""
+        return self.move_count == ROWS * COLS
+
+    def evaluate_board(self, print_result:bool=True):
+        """Evaluates the current board state (win, loss, draw, or None)."""
+        self.print_result = print_result
+        if print_result and self.status is not None and self.status != 0:
+            self.check_win(Globals.Players.Y if self.status == 1 else Globals.Players.R)  # Logs where the win is
+        return self.status
+
+    def evaluate_full_board(self):
+        """Evaluates the current board state from both bitboards (win, loss, draw, or None)."""
+        if Connect4Bitboard.has_four(self.bitboards[Globals.Players.Y]):
+            return 1
+        elif Connect4Bitboard.has_four(self.bitboards[Globals.Players.R]):
+            return -1
+        elif self.check_draw():
+            return 0
+        else:
+            return None
+
+    def set_board(self, new_board):
+        """Sets the board state of the Connect4Bitboard object and rebuilds the incremental state."""
+        self.bitboards = {Globals.Players.R: 0, Globals.Players.Y: 0}
+        self.heights = [col * HEIGHT for col in range(COLS)]  # Next free bit per column
+        self.move_history = []
+        self.hash = 0
+        self.mirror_hash = 0
+        for row_index, row in enumerate(new_board):
+            row_from_bottom = ROWS - 1 - row_index
+            for col, cell in enumerate(row):
+                if cell in self.bitboards:
+                    bit = col * HEIGHT + row_from_bottom
+                    self.bitboards[cell] |= 1 << bit
+                    self.heights[col] = max(self.heights[col], bit + 1)
+                    self.hash ^= ZOBRIST_KEYS[cell][col][row_from_bottom]
+                    self.mirror_hash ^= ZOBRIST_KEYS[cell][COLS - 1 - col][row_from_bottom]
+        self.move_count = bin(self.bitboards[Globals.Players.R] | self.bitboards[Globals.Players.Y]).count("1")
+        self.legal_mask = sum(1 << col for col in range(COLS) if self.heights[col] < TOP_BITS[col])
+        self.status_history = []  # Status before each move in move_history
+        self.status = self.evaluate_full_board()
+
+    def get_board(self):
+        """Returns the current game board state."""
+        red = self.bitboards[Globals.Players.R]
+        yellow = self.bitboards[Globals.Players.Y]
+        board = []
+        for row in range(ROWS - 1, -1, -1):
+            cells = []
+            for col in range(COLS):
+                bit = 1 << (col * HEIGHT + row)
+                cells.append(Globals.Players.R if red & bit else Globals.Players.Y if yellow & bit else Globals.Players.O)
+            board.append("".join(cells))
+        return board
+
+    def get_hash(self, mirror=False):
+        """Returns the Zobrist hash of the current board (or of its left-right mirror)."""
+        return self.mirror_hash if mirror else self.hash
+
+    def get_num_cols(self):
+        """Returns the number of columns in the game board."""
+        return COLS
+
+    def get_opponent(self, player):
+        """Returns the opponent player ('R' or 'Y')."""
+        return Globals.Players.R if player == Globals.Players.Y else Globals.Players.Y
+
+    def copy_game(self):
+        """Clones game by copying the bitboards, column heights, move history and cached status."""
+        game = Connect4Bitboard.__new__(Connect4Bitboard)
+        game.logger_source = self.logger_source
+        game.print_result = self.print_result
+        game.bitboards = dict(self.bitboards)
+        game.heights = self.heights[:]
+        game.move_history = self.move_history[:]
+        game.hash = self.hash
+        game.mirror_hash = self.mirror_hash
+        game.move_count = self.move_count
+        game.legal_mask = self.legal_mask
+        game.status_history = self.status_history[:]
+        game.status = self.status
+        return game
+
+    def do_move(self, col, player):
+        """Executes a move on the board and updates the cached game status."""
+        if not self.is_valid_move(col):
+            raise ValueError(f"Invalid move: Column {col + 1} is full.")
+        bit = self.heights[col]
+        height = bit - col * HEIGHT
+        keys = ZOBRIST_KEYS[player]
+        bitboard = self.bitboards[player] | 1 << bit
+        self.bitboards[player] = bitboard
+        self.hash ^= keys[col][height]
+        self.mirror_hash ^= keys[COLS - 1 - col][height]
+        self.heights[col] = bit + 1
+        if bit + 1 == TOP_BITS[col]:
+            self.legal_mask &= ~(1 << col)
+        self.move_count += 1
+        self.move_history.append((col, player))
+        self.status_history.append(self.status)
+
+        if self.status is None:  # A finished game keeps its result
+            if Connect4Bitboard.has_four(bitboard):
+                self.status = 1 if player == Globals.Players.Y else -1
+            elif self.move_count == ROWS * COLS:
+                self.status = 0
+
+    def get_moves(self):
+        """Returns the columns played since the board was set, oldest first."""
+        return [col for col, _ in self.move_history]
+
+    def undo_move(self):
+        """Undoes the most recent move on the board and restores the previous game status."""
+        if self.move_history:
+            col, player = self.move_history.pop()
+            self.heights[col] -= 1
+            height = self.heights[col] - col * HEIGHT
+            keys = ZOBRIST_KEYS[player]
+            self.bitboards[player] ^= 1 << self.heights[col]
+            self.hash ^= keys[col][height]
+            self.mirror_hash ^= keys[COLS - 1 - col][height]
+            self.legal_mask |= 1 << col
+            self.move_count -= 1
+            self.status = self.status_history.pop()
+        else:
+            raise ValueError("Cannot undo: No moves to undo.")
+
+    def print_board(self):
+        """Prints current board"""
+        for row in self.get_board():
+            Utils.log_message(row, Globals.VerbosityLevels.BRIEF, self.logger_source)
@@ -0,0 +1,30 @@
+from common import Globals
+
+class GameFactory():
+    """
+    A factory class for creating game instances.
+    """
+
+    @staticmethod
+    def create_game(name: str = Globals.Games.CONNECT4, board=None):
+        """
+        Creates a game instance based on the provided name.
+
+        Args:
+            name: The name of the game implementation to create.
+            board (list[str], optional): The initial board. Defaults to an empty board.
+
+        Returns:
+            An instance of the specified GameInterface implementation.
+
+        Raises:
+            ValueError: If the game name is invalid.
+        """
+        if name == Globals.Games.CONNECT4:
+            from connect_4 import Connect4
+            return Connect4(board)
+        elif name == Globals.Games.BITBOARD:
+            from connect_4_bitboard import Connect4Bitboard
+            return Connect4Bitboard(board)
+        else:
+            raise ValueError(f"Invalid game name: {name}")
@@ -1,32 +1,34 @@
 import traceback, sys
 from common import Globals, Utils
-from connect_4 import Connect4
+from game_factory import GameFactory
 from algorithms import AlgorithmFactory
 
 def main():
     try:
-        input_file, verbosity, simulations = Utils.validate_arguments()
+        input_file, verbosity, simulations, game_name, options = Utils.validate_arguments()
         Utils.set_verbosity_level(verbosity)
         algorithm_name, player, board = Utils.load_game_settings(input_file)
         
-        play_game(algorithm_name, player, board, simulations)
+        play_game(algorithm_name, player, board, simulations, game_name, options)
     except:
         Utils.log_message(f"Uncaught exception: {traceback.format_exc()}", Globals.VerbosityLevels.ERROR, __name__)
         sys.exit(1)
 
-def play_game(algorithm_name, initial_player, initial_board, simulations):
+def play_game(algorithm_name, initial_player, initial_board, simulations, game_name=Globals.Games.CONNECT4, options=None):
     """Plays a full game of Connect Four.
     Args:
         algorithm_name (str): The name of the algorithm to use for move selection.
         initial_player (str): The player who makes the first move ('R' or 'Y').
         initial_board (list[str]): The initial state of the Connect Four board.
         simulations (int): The number of simulations to run (used by some algorithms).
+        game_name (str): The game board implementation to play on (see Globals.Games).
+        options (dict): Algorithm options passed to the factory (e.g. reuse_tree).
     """
     try:
-        game = Connect4(initial_board)
+        game = GameFactory.create_game(game_name, initial_board)
         Utils.log_message("Initial Board:", Globals.VerbosityLevels.BRIEF, __name__)
         game.print_board()
-        algorithm = AlgorithmFactory.create_algorithm(algorithm_name, simulations)
+        algorithm = AlgorithmFactory.create_algorithm(algorithm_name, simulations, **(options or {}))
         current_player = initial_player
 
         while True:
@@ -34,7 +36,7 @@ def play_game(algorithm_name, initial_player, initial_board, simulations):
             move = algorithm.choose_move(game, current_player)
             Utils.log_message(f"FINAL Move selected: {move}", Globals.VerbosityLevels.BRIEF, __name__)
             if move is not None:
-                game.set_board(game.get_next_board(move, current_player))
+                game.do_move(move, current_player)
                 Utils.log_message("Current Board:", Globals.VerbosityLevels.BRIEF, __name__)
                 game.print_board()
                 
@@ -0,0 +1,50 @@
+import argparse, os, sys, traceback
+from common import Globals, Utils
+from benchmarks import BenchmarkSuite
+
+def main():
+    try:
+        parser = argparse.ArgumentParser(description="Time the engine hot paths and compare them against a saved baseline")
+        parser.add_argument("--output", default=BenchmarkSuite.RESULTS_FILE, help="Results file.")
+        parser.add_argument("--baseline", default=BenchmarkSuite.BASELINE_FILE, help="Baseline file the results are compared against.")
+        parser.add_argument("--save-baseline", action="store_true", help="Also write the results to the baseline file.")
+        parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown flagged as a regression (0.10 for 10%%).")
+        parser.add_argument("--filter", default=None, help="Runs only the benchmarks whose name contains this text.")
+        parser.add_argument("--game", type=str.upper, action="append", choices=[Globals.Games.CONNECT4, Globals.Games.BITBOARD],
+                            help="Game board implementation, may be repeated. Defaults to both.")
+        parser.add_argument("--simulations", type=int, default=200, help="Simulations of the choose_move benchmarks.")
+        parser.add_argument("--tree-simulations", type=int, default=2000, help="Simulations of the trees used by select_child and backpropagation.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed repeats of every benchmark.")
+        parser.add_argument("--min-time", type=float, default=50, help="Minimum duration of a repeat in milliseconds.")
+        parser.add_argument("--seed", type=int, default=1, help="Seed of the random generator at the start of every repeat.")
+        args = parser.parse_args()
+
+        suite = BenchmarkSuite(args.game or (Globals.Games.CONNECT4, Globals.Games.BITBOARD), args.simulations,
+                               args.tree_simulations, args.repeat, args.min_time / 1000, args.seed)
+        print(f"{'Benchmark':<36} {'us/op':>12} {'median':>12}")
+        results = suite.run(args.filter, lambda name, result: print(f"{name:<36} {result['time_us']:>12.3f} {result['median_us']:>12.3f}", flush=True))
+        BenchmarkSuite.save(args.output, results)
+        print(f"\nResults written to {args.output}")
+
+        regressions = 0
+        if os.path.exists(args.baseline):
+            comparison = BenchmarkSuite.compare(results, BenchmarkSuite.load(args.baseline), args.threshold)
+            print(f"\nComparison with {args.baseline} (regression above +{args.threshold:.0%}):")
+            print(f"{'Benchmark':<36} {'baseline':>12} {'current':>12} {'change':>9}")
+            for name, reference, current, ratio, regressed in comparison:
+                print(f"{name:<36} {reference:>12.3f} {current:>12.3f} {ratio - 1:>+9.1%}{'  REGRESSION' if regressed else ''}")
+                regressions += regressed
+            print(f"\n{regressions} regression(s) in {len(comparison)} benchmarks")
+        elif not args.save_baseline:
+            print(f"No baseline at {args.baseline}; run with --save-baseline to create it")
+        if args.save_baseline:
+            BenchmarkSuite.save(args.baseline, results)
+            print(f"Baseline written to {args.baseline}")
+        sys.exit(1 if regressions else 0)
+    except Exception:
+        Utils.log_message(f"Uncaught exception: {traceback.format_exc()}", Globals.VerbosityLevels.ERROR, __name__)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    Utils.init()
+    main()
@@ -1,14 +1,15 @@
 import traceback, sys, time
 from common import Globals, Utils
-from connect_4 import Connect4
-from algorithms import AlgorithmFactory
+from game_factory import GameFactory
+from algorithms import AlgorithmFactory, SearchStatsTally
 from collections import defaultdict
 
 def main():
     try:
-        verbosity, num_games, algorithms = Utils.load_single_match_config()
+        verbosity, num_games, algorithms, settings = Utils.load_single_match_config()
         Utils.set_verbosity_level(verbosity)
-        algorithm_names = [f"{name}({param})" if param else name for name, param in algorithms]
+        game_name = settings.get("game", Globals.Games.CONNECT4).upper()
+        algorithm_names = [Utils.get_algorithm_label(name, param, options) for name, param, options in algorithms]
         num_algorithms = len(algorithms)
 
         # Timing data per algorithm
@@ -16,6 +17,7 @@ def main():
         total_move_time = [0.0 for _ in range(num_algorithms)]
         total_moves = [0 for _ in range(num_algorithms)]
         games_played = [0 for _ in range(num_algorithms)]
+        search_stats = SearchStatsTally()  # Search statistics per algorithm index
 
         # Initialize results dictionaries
         win_counts = defaultdict(lambda: defaultdict(int))  # wins[row_alg][col_alg]
@@ -38,17 +40,17 @@ def main():
 
                     # Create algorithm instances for each game
                     alg1 = AlgorithmFactory.create_algorithm(
-                        algorithms[first_index][0], simulations=algorithms[first_index][1]
+                        algorithms[first_index][0], simulations=algorithms[first_index][1], **algorithms[first_index][2]
                     )
                     alg2 = AlgorithmFactory.create_algorithm(
-                        algorithms[second_index][0], simulations=algorithms[second_index][1]
+                        algorithms[second_index][0], simulations=algorithms[second_index][1], **algorithms[second_index][2]
                     )
 
                     # Determine initial player for the game (consistent for 'first')
                     initial_player = Globals.Players.R if first_index == i else Globals.Players.R
 
                     winner, game_duration, move_times = play_game(
-                        alg1, alg2, initial_player, first_index, second_index
+                        alg1, alg2, initial_player, first_index, second_index, game_name, search_stats
                     )
 
                     # Track time
@@ -122,6 +124,8 @@ def main():
             avg_move_time = total_move_time[idx] / total_moves[idx] if total_moves[idx] else 0
             avg_game_time = 0.0 if games_played[idx] == 0 else total_game_time[idx] / games_played[idx]
             print(f"{name:<20} {games_played[idx]:<15} {avg_move_time:<20.4f} {avg_game_time:<20.2f}")
+
+        search_stats.print_report(algorithm_names, list(range(num_algorithms)))
     except ValueError as e:
         Utils.log_message(f"Error: {e}", Globals.VerbosityLevels.ERROR, __name__)
         sys.exit(1)
@@ -133,12 +137,12 @@ import traceback
 import sys
 import time
 from common import Globals, Utils
-from connect_4 import Connect4
+from game_factory import GameFactory
 from algorithms import AlgorithmFactory
 from collections import defaultdict
 
 
-def play_game(player1_alg, player2_alg, initial_player, alg1_index, alg2_index):
+def play_game(player1_alg, player2_alg, initial_player, alg1_index, alg2_index, game_name=Globals.Games.CONNECT4, search_stats=None):
     """
     Simulates a full Connect Four game between two algorithms.
 
@@ -148,6 +152,8 @@ def play_game(player1_alg, player2_alg, initial_player, alg1_index, alg2_index):
         initial_player: Globals.Players.R or Globals.Players.Y, who starts the game
         alg1_index: Index of the first algorithm in the `algorithms` list for this game
         alg2_index: Index of the second algorithm in the `algorithms` list for this game
+        game_name: Game board implementation to play on (see Globals.Games)
+        search_stats: SearchStatsTally the statistics of every move are added to, under the algorithm index (optional)
 
     Returns:
         winner: 1 if Player 1 wins, -1 if Player 2 wins, 0 if draw
@@ -160,12 +166,11 @@ def play_game(player1_alg, player2_alg, initial_player, alg1_index, alg2_index):
         game_start = time.time()
         move_counts = {alg1_index: 0, alg2_index: 0}
         move_times = {f"{alg1_index}_time": 0.0, f"{alg2_index}_time": 0.0}
-        game = Connect4()
+        game = GameFactory.create_game(game_name)
         Utils.log_message("Initial Board:", Globals.VerbosityLevels.BRIEF, __name__)
         game.print_board()
         current_player = initial_player
         winner = None
-        last_move_player = None  # Initialize last_move_player
 
         while True:
             Utils.log_message(f"Current player {current_player}", Globals.VerbosityLevels.BRIEF, __name__)
@@ -176,20 +181,23 @@ def play_game(player1_alg, player2_alg, initial_player, alg1_index, alg2_index):
                 move_times[f"{alg1_index}_time"] += duration
                 move_counts[alg1_index] += 1
                 current_alg_name = f"Alg{alg1_index}"
+                if search_stats is not None:
+                    search_stats.add(alg1_index, player1_alg.stats and player1_alg.stats.to_dict())
             else:
                 move = player2_alg.choose_move(game, current_player)
                 duration = time.time() - move_start
                 move_times[f"{alg2_index}_time"] += duration
                 move_counts[alg2_index] += 1
                 current_alg_name = f"Alg{alg2_index}"
+                if search_stats is not None:
+                    search_stats.add(alg2_index, player2_alg.stats and player2_alg.stats.to_dict())
 
             Utils.log_message(f"FINAL Move selected: {move} by {current_alg_name}", Globals.VerbosityLevels.BRIEF, __name__)
 
             if move is not None:
-                game.set_board(game.get_next_board(move, current_player))
+                game.do_move(move, current_player)
                 Utils.log_message("Current Board:", Globals.VerbosityLevels.BRIEF, __name__)
                 game.print_board()
-                last_move_player = current_player  # Track the player who made the move
 
             Utils.log_message(f"Before evaluate_board", Globals.VerbosityLevels.VERBOSE, __name__)
             game_state = game.evaluate_board(False)  # Evaluate the *current* state
@@ -199,11 +207,11 @@ def play_game(player1_alg, player2_alg, initial_player, alg1_index, alg2_index):
                 if game_state == 0:
                     winner = 0
                     Utils.log_message("**** Draw! ****", Globals.VerbosityLevels.BRIEF, __name__)
-                elif game_state == 1:  # Yellow wins
-                    winner = 1 if last_move_player == Globals.Players.Y else -1
+                elif game_state == 1:  # Yellow (player2_alg) wins
+                    winner = -1
                     Utils.log_message(f"**** {Globals.Players.Y} wins! (Winner: {winner}) ****", Globals.VerbosityLevels.BRIEF, __name__)
-                elif game_state == -1:  # Red wins
-                    winner = 1 if last_move_player == Globals.Players.R else -1
+                elif game_state == -1:  # Red (player1_alg) wins
+                    winner = 1
                     Utils.log_message(f"**** {Globals.Players.R} wins! (Winner: {winner}) ****", Globals.VerbosityLevels.BRIEF, __name__)
                 elif move is None:
                     winner = 0
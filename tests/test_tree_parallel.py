@@ -0,0 +1,18 @@
+import pytest
+
+from algorithms import AlgorithmFactory, SharedTree
+from common import Globals
+from game_factory import GameFactory
+
+
+@pytest.mark.parametrize("name", ["UCT", "UCTIMP", "UCTDEP"])
+def test_tree_parallel_keeps_every_visit(name):
+    algorithm = AlgorithmFactory.create_algorithm(name, 2000, Globals.ParallelModes.TREE, workers=4,
+                                                  solver_threshold=0)
+    for _ in range(3):
+        move = algorithm.choose_move(GameFactory.create_game(Globals.Games.BITBOARD), Globals.Players.R)
+        assert move in range(7)
+        tree = algorithm.tree
+        root_visits = tree.visits[SharedTree.ROOT]
+        assert root_visits == sum(tree.visits[child] for _, child in tree.get_children(SharedTree.ROOT))
+        assert root_visits == algorithm.completed_simulations == 2000
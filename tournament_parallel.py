@@ -1,10 +1,11 @@
-import sys
+import sys, os, random
 import traceback
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
 from collections import defaultdict
-from common import Utils, Globals
-from algorithms import AlgorithmFactory
-from connect_4 import Connect4
+from common import Utils, Globals, LogQueue, ResultsStore, EloRatings, SPRT
+from algorithms import AlgorithmFactory, SearchStatsTally
+from game_factory import GameFactory
 
 try:
     from tqdm import tqdm  # Optional for progress bar
@@ -13,16 +14,39 @@ except ImportError:
 
 import time
 
-def play_game(player1_alg, player2_alg, initial_player, alg1_index, alg2_index):
-    from common import Globals
-
-    game = Connect4()
+DEFAULT_RESULTS_FILE = os.path.join("_results", "tournament_results.jsonl")  # Relative to the base directory
+RECORD_VERSION = 2  # Version of the game records; records of other versions are not resumed
+CHUNKS_PER_WORKER = 2  # Chunks submitted per worker before waiting for one to finish
+
+_worker_config = None  # (algorithms, parallel, game name) of the tournament, set once per worker process
+_worker_algorithms = {}  # {algorithm index: instance} reused by the games of a worker process
+
+def init_worker(algorithms, parallel, game_name, log_initializer=None, log_initargs=()):
+    """Keeps the tournament configuration in a worker process, so jobs only carry their pairing and seed."""
+    global _worker_config
+    _worker_config = (algorithms, parallel, game_name)
+    if log_initializer is not None:
+        log_initializer(*log_initargs)
+
+def get_worker_algorithm(index):
+    """Gets the instance of a configured algorithm in this worker process, creating it on first use."""
+    algorithm = _worker_algorithms.get(index)
+    if algorithm is None:
+        algorithms, parallel, _ = _worker_config
+        name, simulations, options = algorithms[index]
+        algorithm = _worker_algorithms[index] = AlgorithmFactory.create_algorithm(name, simulations=simulations, parallel=parallel, **options)
+    return algorithm
+
+def play_game(player1_alg, player2_alg, initial_player, alg1_index, alg2_index, game_name=Globals.Games.CONNECT4):
+    game = GameFactory.create_game(game_name)
     current_player = initial_player
     winner = None
-    last_move_player = None  # Initialize last_move_player
 
     move_times = {alg1_index: 0.0, alg2_index: 0.0}
     move_counts = {alg1_index: 0, alg2_index: 0}
+    moves = []  # Columns played, in order
+    times = []  # Time taken by each move, in seconds
+    search_stats = {alg1_index: SearchStatsTally.new_totals(), alg2_index: SearchStatsTally.new_totals()}
 
     start_time = time.time()
 
@@ -34,26 +58,28 @@ def play_game(player1_alg, player2_alg, initial_player, alg1_index, alg2_index):
             duration = time.time() - move_start
             move_times[alg1_index] += duration
             move_counts[alg1_index] += 1
-            last_move_player = Globals.Players.R  # Track last move
+            SearchStatsTally.accumulate(search_stats[alg1_index], player1_alg.stats and player1_alg.stats.to_dict())
         else:
             move = player2_alg.choose_move(game, current_player)
             duration = time.time() - move_start
             move_times[alg2_index] += duration
             move_counts[alg2_index] += 1
-            last_move_player = Globals.Players.Y  # Track last move
+            SearchStatsTally.accumulate(search_stats[alg2_index], player2_alg.stats and player2_alg.stats.to_dict())
 
+        times.append(duration)
         if move is not None:
-            game.set_board(game.get_next_board(move, current_player))
+            game.do_move(move, current_player)
+            moves.append(move)
 
         game_state = game.evaluate_board(False)
 
         if game_state is not None or move is None:
             if game_state == 0:
                 winner = 0  # Draw
-            elif game_state == 1:  # Yellow wins
-                winner = 1 if last_move_player == Globals.Players.Y else -1
-            elif game_state == -1:  # Red wins
-                winner = 1 if last_move_player == Globals.Players.R else -1
+            elif game_state == 1:  # Yellow (player2_alg) wins
+                winner = -1
+            elif game_state == -1:  # Red (player1_alg) wins
+                winner = 1
             elif move is None:
                 winner = 0  # No valid moves
             break
@@ -62,110 +88,212 @@ def play_game(player1_alg, player2_alg, initial_player, alg1_index, alg2_index):
 
     total_time = time.time() - start_time
 
-    return winner, total_time, move_times, move_counts
+    return winner, total_time, move_times, move_counts, moves, times, search_stats
 
 def run_single_match(args):
-    i, j, game_index, algorithms, parallel = args
+    i, j, game_index, seed = args
+    algorithms, parallel, game_name = _worker_config
 
     first_index, second_index = (i, j) if game_index % 2 == 0 else (j, i)
+    random.seed(seed)
 
-    alg1 = AlgorithmFactory.create_algorithm(
-        algorithms[first_index][0], simulations=algorithms[first_index][1], parallel=parallel
-    )
-    alg2 = AlgorithmFactory.create_algorithm(
-        algorithms[second_index][0], simulations=algorithms[second_index][1], parallel=parallel
-    )
+    alg1 = get_worker_algorithm(first_index)
+    alg2 = get_worker_algorithm(second_index)
 
     initial_player = Globals.Players.R  # Consistent initial player for the 'first' algorithm
 
-    winner, game_duration, move_times, move_counts = play_game(
-        alg1, alg2, initial_player, first_index, second_index
+    winner, game_duration, _, _, moves, times, search_stats = play_game(
+        alg1, alg2, initial_player, first_index, second_index, game_name
     )
 
+    # Compact record of the game, as written to the results store
     return {
+        "version": RECORD_VERSION,
         "row": i,
         "col": j,
-        "winner": winner,
+        "game": game_index,
         "first": first_index,
         "second": second_index,
-        "game_time": game_duration,
-        "move_times": move_times,
-        "move_counts": move_counts,
+        "labels": [Utils.get_algorithm_label(*algorithms[first_index]), Utils.get_algorithm_label(*algorithms[second_index])],
+        "board": game_name,
+        "parallel": parallel,
+        "winner": winner,
+        "moves": moves,
+        "times": [round(duration, 6) for duration in times],
+        "game_time": round(game_duration, 6),
+        "stats": [{name: round(value, 6) if isinstance(value, float) else value for name, value in search_stats[index].items()}
+                  for index in (first_index, second_index)],
+        "seed": seed,
     }
 
+def run_match_chunk(chunk):
+    """Plays a chunk of games in a worker process, returning their records."""
+    return [run_single_match(job) for job in chunk]
+
+class TournamentTally():
+    """Win, draw and timing totals of a tournament, updated one game record at a time."""
+    def __init__(self, algorithm_names: list):
+        self.algorithm_names = algorithm_names
+        num_algorithms = len(algorithm_names)
+        self.total_game_time = [0.0] * num_algorithms
+        self.total_move_time = [0.0] * num_algorithms
+        self.total_moves = [0] * num_algorithms
+        self.games_played = [0] * num_algorithms
+        self.win_counts = defaultdict(lambda: defaultdict(int))  # wins[row_alg][col_alg]
+        self.draw_counts = defaultdict(lambda: defaultdict(int))  # draws[alg1][alg2]
+        self.pairings = defaultdict(lambda: [0, 0, 0])  # {(i, j) with i < j: [wins, draws, losses] of i}
+        self.search_stats = SearchStatsTally()  # Search statistics per algorithm name
+
+    def add(self, result: dict) -> None:
+        """Adds a game record (see run_single_match)."""
+        i = result["row"]
+        j = result["col"]
+        winner = result["winner"]
+        first = result["first"]
+        second = result["second"]
+
+        times = result["times"]
+        self.total_game_time[first] += result["game_time"]
+        self.total_game_time[second] += result["game_time"]
+        self.games_played[first] += 1
+        self.games_played[second] += 1
+        self.total_move_time[first] += sum(times[0::2])  # The first algorithm makes the even moves
+        self.total_move_time[second] += sum(times[1::2])
+        self.total_moves[first] += len(times[0::2])
+        self.total_moves[second] += len(times[1::2])
+        for index, totals in zip((first, second), result.get("stats", ())):
+            self.search_stats.merge(self.algorithm_names[index], totals)
+
+        row_name = self.algorithm_names[i]
+        col_name = self.algorithm_names[j]
+        if i != j:  # Skip self-matches
+            if winner == 1:  # Player 1 (algorithms[first]) won
+                if first == i:
+                    self.win_counts[row_name][col_name] += 1
+                else:
+                    self.win_counts[col_name][row_name] += 1
+            elif winner == -1:  # Player 2 (algorithms[second]) won
+                if second == i:
+                    self.win_counts[row_name][col_name] += 1
+                else:
+                    self.win_counts[col_name][row_name] += 1
+            else:
+                self.draw_counts[row_name][col_name] += 1
+                self.draw_counts[col_name][row_name] += 1
+
+            # Results of the pairing for its lower index algorithm
+            low = min(first, second)
+            outcome = 1 if winner == 0 else 0 if (winner == 1) == (first == low) else 2
+            self.pairings[(low, max(first, second))][outcome] += 1
+
+    def get_elo_ratings(self) -> tuple:
+        """Estimates the Elo ratings of the algorithms, with 95% confidence intervals, from every game added."""
+        results = {pairing: (wins + 0.5 * draws, wins + draws + losses) for pairing, (wins, draws, losses) in self.pairings.items()}
+        return EloRatings.estimate(len(self.algorithm_names), results)
+
+def is_recorded_job(record: dict, algorithm_names: list, num_games: int, game_name: str, parallel: int) -> bool:
+    """Checks that a stored record is a game of the configured tournament, so a changed configuration is not resumed."""
+    try:
+        num_algorithms = len(algorithm_names)
+        i, j, first, second = record["row"], record["col"], record["first"], record["second"]
+        return (record.get("version") == RECORD_VERSION and 0 <= i < num_algorithms and 0 <= j < num_algorithms and i != j and 0 <= record["game"] < num_games
+                and (first, second) == ((i, j) if record["game"] % 2 == 0 else (j, i))
+                and record["labels"] == [algorithm_names[first], algorithm_names[second]] and record["board"] == game_name
+                and record["parallel"] == parallel)
+    except (KeyError, TypeError):
+        return False
+
 def main():
     try:
-        max_proc, num_games, parallel, algorithms = Utils.load_tournament_config()
+        max_proc, num_games, parallel, algorithms, settings = Utils.load_tournament_config()
         Utils.set_verbosity_level(Globals.VerbosityLevels.NONE)
-        algorithm_names = [f"{name}({param})" if param else name for name, param in algorithms]
+        if int(settings.get("log_queue", 0)):
+            Utils.start_log_queue()
+        game_name = settings.get("game", Globals.Games.CONNECT4).upper()
+        algorithm_names = [Utils.get_algorithm_label(name, param, options) for name, param, options in algorithms]
         num_algorithms = len(algorithms)
-        total_game_time = [0.0] * num_algorithms
-        total_move_time = [0.0] * num_algorithms
-        total_moves = [0] * num_algorithms
-        games_played = [0] * num_algorithms
-
-        win_counts = defaultdict(lambda: defaultdict(int))
-        draw_counts = defaultdict(lambda: defaultdict(int))
-        results = defaultdict(dict)
-
-        # Prepare all jobs
-        jobs = []
-        for i in range(num_algorithms):
-            for j in range(num_algorithms):
-                for game_index in range(num_games):
-                    jobs.append((i, j, game_index, algorithms, parallel))
-
-        game_results = []
-        print(f"\nRunning {len(jobs)} games in parallel...\n")
-
-        with ProcessPoolExecutor(max_workers=max_proc) as executor:
-            futures = [executor.submit(run_single_match, job) for job in jobs]
-
-            progress_iter = as_completed(futures)
-            if tqdm:
-                progress_iter = tqdm(progress_iter, total=len(futures))
-
-            for future in progress_iter:
-                result = future.result()
-                game_results.append(result)
-
-                first = result["first"]
-                second = result["second"]
-
-                total_game_time[first] += result["game_time"]
-                total_game_time[second] += result["game_time"]
-                games_played[first] += 1
-                games_played[second] += 1
-                total_move_time[first] += result["move_times"].get(first, 0)
-                total_move_time[second] += result["move_times"].get(second, 0)
-                total_moves[first] += result["move_counts"].get(first, 0)
-                total_moves[second] += result["move_counts"].get(second, 0)
-
-        # Aggregate results and track wins for row vs. column
-        for result in game_results:
-            i = result["row"]
-            j = result["col"]
-            winner = result["winner"]
-            first = result["first"]
-            second = result["second"]
-
-            row_name = algorithm_names[i]
-            col_name = algorithm_names[j]
-
-            if i != j:  # Add this condition to skip self-matches
-                if winner == 1:  # Player 1 (algorithms[first]) won
-                    if first == i:
-                        win_counts[row_name][col_name] += 1
-                    else:
-                        win_counts[col_name][row_name] += 1
-                elif winner == -1:  # Player 2 (algorithms[second]) won
-                    if second == i:
-                        win_counts[row_name][col_name] += 1
-                    else:
-                        win_counts[col_name][row_name] += 1
-                else:
-                    draw_counts[row_name][col_name] += 1
-                    draw_counts[col_name][row_name] += 1
+        tally = TournamentTally(algorithm_names)
+        win_counts = tally.win_counts
+        draw_counts = tally.draw_counts
+
+        # Games already recorded by an earlier run of the same tournament are counted, not replayed
+        results_path = settings.get("results", DEFAULT_RESULTS_FILE)
+        if not os.path.isabs(results_path):
+            results_path = os.path.join(Utils.get_base_dir(), results_path)
+        store = ResultsStore(results_path, bool(int(settings.get("resume", 1))))
+        recorded = set()
+        for record in store.load():
+            key = (record.get("row"), record.get("col"), record.get("game"))
+            if key not in recorded and is_recorded_job(record, algorithm_names, num_games, game_name, parallel):
+                recorded.add(key)
+                tally.add(record)
+        if store.skipped:
+            Utils.log_message(f"Skipped {store.skipped} unreadable lines of {results_path}", Globals.VerbosityLevels.ERROR, __name__)
+
+        # Adaptive mode: a pairing stops being scheduled once its sequential test is decided
+        sprt = None
+        decisions = {}  # {(i, j) with i < j: SPRT decision for i}
+        if int(settings.get("sprt", 0)):
+            sprt = SPRT(float(settings.get("sprt_elo", 50)), float(settings.get("sprt_alpha", 0.05)), float(settings.get("sprt_beta", 0.05)))
+            for pairing, results in tally.pairings.items():
+                decision = sprt.decide(*results)
+                if decision is not None:
+                    decisions[pairing] = decision
+
+        # Jobs not recorded yet, each with its own seed, generated as they are submitted. Games are interleaved across
+        # pairings, so capacity freed by decided pairings goes to the others. Self-matches are not played.
+        base_seed = int(settings["seed"]) if "seed" in settings else random.getrandbits(32)
+        def generate_jobs():
+            for game_index in range(num_games):
+                for i in range(num_algorithms):
+                    for j in range(num_algorithms):
+                        if i != j and (i, j, game_index) not in recorded and (min(i, j), max(i, j)) not in decisions:
+                            job_number = (i * num_algorithms + j) * num_games + game_index
+                            yield (i, j, game_index, (base_seed + job_number * 0x9E3779B1) % (1 << 32))
+        num_jobs = num_algorithms * (num_algorithms - 1) * num_games - len(recorded)
+        chunk_size = int(settings.get("chunk_size", 0)) or max(1, min(16, num_jobs // (max_proc * 8)))
+
+        if recorded:
+            print(f"\nResuming: {len(recorded)} games already recorded in {results_path}")
+        print(f"\nRunning {'up to ' if sprt else ''}{num_jobs} games in parallel...\n")
+
+        log_initializer, log_initargs = LogQueue.get_worker_initializer()
+        progress = tqdm(total=num_jobs) if tqdm else None
+        try:
+            with ProcessPoolExecutor(max_workers=max_proc, initializer=init_worker,
+                                     initargs=(algorithms, parallel, game_name, log_initializer, log_initargs)) as executor:
+                # At most CHUNKS_PER_WORKER chunks per worker are in flight, so memory stays flat however many games
+                jobs = generate_jobs()
+                pending = set()
+                while True:
+                    while len(pending) < max_proc * CHUNKS_PER_WORKER:
+                        chunk = list(islice(jobs, chunk_size))
+                        if not chunk:
+                            break
+                        pending.add(executor.submit(run_match_chunk, chunk))
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results = future.result()
+                        store.extend(results)
+                        for result in results:
+                            tally.add(result)
+                            pairing = (min(result["first"], result["second"]), max(result["first"], result["second"]))
+                            if sprt is not None and pairing not in decisions:
+                                decision = sprt.decide(*tally.pairings[pairing])
+                                if decision is not None:
+                                    decisions[pairing] = decision
+                        if progress is not None:
+                            progress.update(len(results))
+        finally:
+            store.close()
+            if progress is not None:
+                progress.close()
+        total_game_time = tally.total_game_time
+        total_move_time = tally.total_move_time
+        total_moves = tally.total_moves
+        games_played = tally.games_played
 
         # Compute percentages (Win Rate)
         print("\nWin Rate Matrix (%):")
@@ -178,9 +306,8 @@ def main():
                 wins = win_counts[row_name].get(col_name, 0)
                 losses = win_counts[col_name].get(row_name, 0)  # Wins for the opponent
                 total_played = wins + losses  # Corrected: Do not include draws!
-                total_games_per_matchup = num_games if i != j else num_games * 2  # Account for self-play
 
-                win_rate = (wins / total_played * 100) if total_played > 0 else 50.00 if i == j else 0.00
+                win_rate = (wins / total_played * 100) if total_played > 0 else 50.00 if row_name == col_name else 0.00
                 row += f"{win_rate:.2f}%{'':<1}|"
             print(row)
         print("-" * (14 + 14 * num_algorithms))
@@ -220,9 +347,30 @@ def main():
             avg_game = 0.0 if games_played[idx] == 0 else total_game_time[idx] / games_played[idx]
             print(f"{name:<20} {games_played[idx]:<15} {avg_move:<20.4f} {avg_game:<20.2f}")
 
+        tally.search_stats.print_report(algorithm_names)
+
+        ratings, intervals = tally.get_elo_ratings()
+        print("\nElo Ratings (95% confidence, average 0):")
+        print("-" * 80)
+        print(f"{'Algorithm':<20} {'Elo':>8} {'+/-':>8}")
+        print("-" * 80)
+        for idx in sorted(range(num_algorithms), key=lambda idx: -ratings[idx]):
+            print(f"{algorithm_names[idx]:<20} {ratings[idx]:>8.0f} {intervals[idx]:>8.0f}")
+
+        if sprt is not None:
+            print(f"\nSequential Tests (+/-{sprt.elo_margin:g} Elo):")
+            print("-" * 80)
+            print(f"{'Pairing':<42} {'W-D-L':<16} {'Result':<20}")
+            print("-" * 80)
+            labels = {SPRT.STRONGER: "stronger", SPRT.EQUAL: "equal", SPRT.WEAKER: "weaker", None: "undecided"}
+            for (i, j), (wins, draws, losses) in sorted(tally.pairings.items()):
+                print(f"{algorithm_names[i] + ' vs ' + algorithm_names[j]:<42} {f'{wins}-{draws}-{losses}':<16} {labels[decisions.get((i, j))]:<20}")
+
     except Exception:
         Utils.log_message(f"Uncaught exception: {traceback.format_exc()}", Globals.VerbosityLevels.ERROR, __name__)
         sys.exit(1)
+    finally:
+        Utils.stop_log_queue()
 
 if __name__ == "__main__":
     Utils.init()